@@ -0,0 +1,177 @@
+"""Decoded audio shared by transcription and audio analysis.
+
+The audio of a source is decoded once with ffmpeg into 16 kHz mono
+``float32`` PCM (the format Whisper works on) and kept as a raw
+little-endian file in ``.cache/audio``. ``load_pcm`` opens it with
+``numpy.memmap``, so transcription, silence detection, levels and the
+waveform view all read the same buffer without decoding the video
+again, and only the pages actually touched are loaded into memory. A
+three hour recording takes about 690 MB on disk.
+"""
+import os
+import threading
+
+import numpy as np
+
+from ffmpeg_runner import run_ffmpeg
+from media_cache import cache_dir, file_key
+from media_probe import probe
+
+SAMPLE_RATE = 16000
+
+# Samples analysed per block, so long recordings are never fully in memory.
+_BLOCK = SAMPLE_RATE * 60
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _pcm_file(path: str):
+    return cache_dir("audio") / f"{file_key(path)}.f32"
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def extract_pcm(path: str, on_progress=None, cancel_event=None) -> str:
+    """Decode the audio of ``path`` once and return the cached PCM file.
+
+    Concurrent calls for the same source wait for a single decode.
+    ``on_progress`` and ``cancel_event`` are passed to ``run_ffmpeg``.
+    """
+    target = _pcm_file(path)
+    with _lock_for(target.name):
+        if target.exists():
+            return str(target)
+        tmp = target.with_name(f"{target.stem}.{threading.get_ident()}.tmp")
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-i", path,
+            "-vn",
+            "-ac", "1",
+            "-ar", str(SAMPLE_RATE),
+            "-f", "f32le",
+            str(tmp),
+        ]
+        try:
+            run_ffmpeg(cmd, probe(path).duration, on_progress, cancel_event)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        os.replace(tmp, target)
+    return str(target)
+
+
+def load_pcm(path: str, on_progress=None, cancel_event=None) -> np.memmap:
+    """Return the 16 kHz mono samples of ``path`` as a ``float32`` memmap.
+
+    The map is copy-on-write: callers may modify it (Whisper pads it in
+    place) without touching the cached file.
+    """
+    return open_pcm(extract_pcm(path, on_progress, cancel_event))
+
+
+def open_pcm(pcm: str) -> np.memmap:
+    """Map a PCM file written by ``extract_pcm`` (copy-on-write)."""
+    if os.path.getsize(pcm) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(pcm, dtype=np.float32, mode="c")
+
+
+def duration(audio) -> float:
+    return len(audio) / SAMPLE_RATE
+
+
+def levels(audio, window: float = 0.1) -> np.ndarray:
+    """Return the RMS level (dBFS) of each ``window`` seconds of ``audio``."""
+    frame = max(1, int(window * SAMPLE_RATE))
+    count = len(audio) // frame
+    out = np.empty(count, dtype=np.float32)
+    step = max(1, _BLOCK // frame)
+    for first in range(0, count, step):
+        last = min(count, first + step)
+        block = np.asarray(audio[first * frame:last * frame], dtype=np.float32).reshape(-1, frame)
+        out[first:last] = np.sqrt(np.mean(np.square(block), axis=1))
+    return 20 * np.log10(np.maximum(out, 1e-10))
+
+
+def loudness(audio) -> float:
+    """Return the RMS level (dBFS) of the whole ``audio``."""
+    total = 0.0
+    for start in range(0, len(audio), _BLOCK):
+        block = np.asarray(audio[start:start + _BLOCK], dtype=np.float64)
+        total += float(np.dot(block, block))
+    if not len(audio):
+        return -200.0
+    return float(10 * np.log10(max(total / len(audio), 1e-20)))
+
+
+def detect_silences(audio, threshold_db: float = -40.0, min_duration: float = 0.5, window: float = 0.02) -> list:
+    """Return the ``(start, end)`` seconds where ``audio`` stays below
+    ``threshold_db`` for at least ``min_duration`` seconds."""
+    quiet = levels(audio, window) < threshold_db
+    if not quiet.any():
+        return []
+    # Indices where the quiet/loud state changes delimit the runs.
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], quiet, [False])).astype(np.int8)))
+    silences = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if (end - start) * window >= min_duration:
+            silences.append((float(start * window), float(end * window)))
+    return silences
+
+
+def chunk_bounds(audio, chunk_seconds: float, silences=None) -> list:
+    """Split ``audio`` into ``(start, end)`` sample ranges of about
+    ``chunk_seconds`` each.
+
+    Each cut is moved to the middle of the silence closest to the target
+    time (within a quarter of a chunk), so words are not split between
+    chunks. ``silences`` defaults to ``detect_silences(audio)``.
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    if chunk <= 0 or total <= chunk * 1.5:
+        return [(0, total)]
+    if silences is None:
+        silences = detect_silences(audio)
+    middles = np.array([(start + end) / 2 for start, end in silences]) * SAMPLE_RATE
+    bounds = []
+    position = 0
+    while total - position > chunk * 1.5:
+        target = position + chunk
+        cut = target
+        if len(middles):
+            nearest = middles[np.argmin(np.abs(middles - target))]
+            if abs(nearest - target) <= chunk / 4:
+                cut = int(nearest)
+        bounds.append((position, cut))
+        position = cut
+    bounds.append((position, total))
+    return bounds
+
+
+def waveform(audio, points: int = 1000) -> np.ndarray:
+    """Return the peak amplitude (0-1) of ``points`` equal slices of ``audio``."""
+    if not len(audio) or points < 1:
+        return np.zeros(0, dtype=np.float32)
+    edges = np.linspace(0, len(audio), points + 1).astype(np.int64)
+    peaks = np.zeros(points, dtype=np.float32)
+    for i in range(points):
+        if edges[i + 1] > edges[i]:
+            peaks[i] = np.abs(audio[edges[i]:edges[i + 1]]).max()
+    return np.minimum(peaks, 1.0)
+
+
+def remove_pcm(path: str) -> None:
+    """Delete the cached PCM of ``path``."""
+    try:
+        os.remove(_pcm_file(path))
+    except OSError:
+        pass
@@ -0,0 +1,96 @@
+"""Measure the cold import time of the app and fail over a budget.
+
+Each run starts a fresh interpreter with ``-X importtime`` and imports
+the module (``video_menu`` by default). The script reports the median
+total import time, the slowest modules and any module from ``--forbid``
+that got imported at startup. It exits with status 1 when the median is
+over ``--budget`` seconds or a forbidden module was imported, so it can
+run in CI.
+
+Usage::
+
+    python -m benchmarks.import_time --budget 1.5
+    python -m benchmarks.import_time --module video_cli --budget 0.3
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported on first use.
+FORBIDDEN = ("yt_dlp", "whisper", "torch", "openai", "instaloader", "moviepy", "instagrapi")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def measure(module: str) -> dict:
+    """Import ``module`` in a new interpreter and parse ``-X importtime``.
+
+    Returns ``total`` (seconds spent importing ``module`` and everything
+    it imports) and ``modules`` (``{name: cumulative seconds}``).
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1", PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} falhou:\n{result.stderr[-2000:]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match.group(3)] = int(match.group(2)) / 1e6
+    return {"total": modules.get(module, 0.0), "modules": modules}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="video_menu", help="módulo importado")
+    parser.add_argument(
+        "--budget", type=float, default=float(os.getenv("IMPORT_BUDGET", "2.0")),
+        help="tempo máximo em segundos (padrão: IMPORT_BUDGET ou 2.0)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="execuções; usa a mediana")
+    parser.add_argument("--top", type=int, default=15, help="módulos mais lentos listados")
+    parser.add_argument(
+        "--forbid", nargs="*", default=list(FORBIDDEN),
+        help="módulos que não podem ser importados na inicialização",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    except RuntimeError as exc:
+        print(exc)
+        return 2
+    median = statistics.median(run["total"] for run in runs)
+    modules = runs[-1]["modules"]
+
+    print(f"import {args.module}: mediana {median:.3f}s em {len(runs)} execução(ões)")
+    for name, seconds in sorted(modules.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {seconds:7.3f}s  {name}")
+
+    failed = False
+    forbidden = sorted(
+        name for name in modules if name.split(".")[0] in args.forbid and "." not in name
+    )
+    if forbidden:
+        print("importados na inicialização:", ", ".join(forbidden))
+        failed = True
+    if median > args.budget:
+        print(f"acima do orçamento: {median:.3f}s > {args.budget:.3f}s")
+        failed = True
+    if not failed:
+        print(f"ok (orçamento {args.budget:.3f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
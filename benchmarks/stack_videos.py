@@ -0,0 +1,98 @@
+"""Compare the MoviePy and ffmpeg engines used to stack TikTok videos.
+
+Both engines receive the same inputs (the first ``--seconds`` of each
+video) and the same encoding profile. The script reports wall time and
+encode speed of each engine and the SSIM/PSNR between the two outputs.
+An SSIM close to 1.0 means the outputs are visually the same.
+
+Usage::
+
+    python -m benchmarks.stack_videos top.mp4 bottom.mp4 --seconds 15
+"""
+import argparse
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+from criarVideoUmDebaixoDoOutro import (
+    TARGET_HEIGHT,
+    TARGET_WIDTH,
+    create_tiktok_video_moviepy,
+)
+from media_probe import probe
+from video_cut_utils import stack_videos
+
+
+def _trim(path, seconds, output):
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", "-i", path, "-t", str(seconds), "-c", "copy", output],
+        check=True,
+    )
+
+
+def _compare(a, b, metric):
+    """Return the average ``ssim``/``psnr`` between the videos ``a`` and ``b``."""
+    result = subprocess.run(
+        ["ffmpeg", "-i", a, "-i", b, "-lavfi", f"[0:v][1:v]{metric}", "-f", "null", "-"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    pattern = r"All:([\d.]+)" if metric == "ssim" else r"average:([\d.]+|inf)"
+    match = re.findall(pattern, result.stderr)
+    return float(match[-1]) if match else None
+
+
+def _timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("top")
+    parser.add_argument("bottom")
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--profile", default=None, help="perfil de codificação")
+    parser.add_argument("--audio-bottom", action="store_true", help="usa o áudio do vídeo de baixo")
+    args = parser.parse_args(argv)
+    audio_from_top = not args.audio_bottom
+
+    with tempfile.TemporaryDirectory() as tmp:
+        top = os.path.join(tmp, "top" + os.path.splitext(args.top)[1])
+        bottom = os.path.join(tmp, "bottom" + os.path.splitext(args.bottom)[1])
+        _trim(args.top, args.seconds, top)
+        _trim(args.bottom, args.seconds, bottom)
+        duration = probe(top if audio_from_top else bottom).duration
+
+        moviepy_out = os.path.join(tmp, "moviepy.mp4")
+        ffmpeg_out = os.path.join(tmp, "ffmpeg.mp4")
+        moviepy_time = _timed(
+            create_tiktok_video_moviepy, top, bottom, moviepy_out, audio_from_top, profile=args.profile
+        )
+        ffmpeg_time = _timed(
+            stack_videos,
+            top,
+            bottom,
+            ffmpeg_out,
+            audio_from_top,
+            width=TARGET_WIDTH,
+            height=TARGET_HEIGHT,
+            profile=args.profile,
+        )
+        ssim = _compare(moviepy_out, ffmpeg_out, "ssim")
+        psnr = _compare(moviepy_out, ffmpeg_out, "psnr")
+
+    print(f"duração de saída: {duration:.1f}s")
+    for name, elapsed in (("moviepy", moviepy_time), ("ffmpeg", ffmpeg_time)):
+        print(f"{name:8} {elapsed:8.2f}s  {duration / elapsed:6.2f}x tempo real")
+    print(f"ganho:   {moviepy_time / ffmpeg_time:.1f}x")
+    print(f"SSIM:    {ssim}")
+    print(f"PSNR:    {psnr} dB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure the speedup of chunked transcription against the worker count.
+
+The audio is extracted once before timing, so every run measures only
+Whisper. One worker is the plain single-stream transcription and is the
+baseline of the speedup column; the other counts use the chunked mode
+of ``transcription`` (model loading in the workers included). The cache
+is bypassed on every run.
+
+Usage::
+
+    python -m benchmarks.transcribe_workers video.mp4 --workers 1 2 4
+    python -m benchmarks.transcribe_workers video.mp4 --model small --chunk-minutes 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import audio_pcm
+from transcription import default_chunk_minutes, transcribe
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="vídeo ou áudio transcrito")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="quantidades de processos")
+    parser.add_argument("--chunk-minutes", type=float, default=None, help="minutos por trecho")
+    parser.add_argument("--model", default=None, help="modelo do Whisper (padrão: WHISPER_MODEL ou base)")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    chunk_minutes = args.chunk_minutes or default_chunk_minutes()
+    audio = audio_pcm.load_pcm(args.input)
+    chunks = len(audio_pcm.chunk_bounds(audio, chunk_minutes * 60))
+
+    rows = []
+    for workers in sorted(set(max(1, w) for w in args.workers)):
+        started = time.perf_counter()
+        segments = transcribe(
+            args.input, args.model, use_cache=False, workers=workers, chunk_minutes=chunk_minutes
+        )
+        rows.append(
+            {"workers": workers, "seconds": round(time.perf_counter() - started, 2), "segments": len(segments)}
+        )
+    base = rows[0]["seconds"]
+    for row in rows:
+        row["speedup"] = round(base / row["seconds"], 2) if row["seconds"] else None
+
+    if args.json:
+        print(json.dumps({
+            "input": args.input,
+            "audio_seconds": round(audio_pcm.duration(audio), 1),
+            "chunk_minutes": chunk_minutes,
+            "chunks": chunks,
+            "cpus": os.cpu_count(),
+            "runs": rows,
+        }, indent=2))
+        return 0
+    print(
+        f"{args.input}: {audio_pcm.duration(audio) / 60:.1f} min de áudio, "
+        f"{chunks} trecho(s) de ~{chunk_minutes:g} min, {os.cpu_count()} CPUs"
+    )
+    print(f"{'processos':>9}  {'tempo':>9}  {'speedup':>7}  {'segmentos':>9}")
+    for row in rows:
+        print(f"{row['workers']:>9}  {row['seconds']:>8.1f}s  {row['speedup']:>6.2f}x  {row['segments']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
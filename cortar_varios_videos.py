@@ -1,10 +1,12 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import os
+import threading
 
+from ffmpeg_runner import FFmpegCancelled, format_progress
 from video_cut_utils import (
     parse_time,
-    cut_video,
+    cut_many,
 )
 
 def escolher_video():
@@ -28,22 +30,84 @@ def cortar_videos():
     if not pasta_saida:
         return
 
+    segmentos = []
+    falhas = []
+    for i, intervalo in enumerate(intervalos, start=1):
+        try:
+            inicio, fim = intervalo.split(" até ")
+            segmentos.append(
+                {
+                    "start": parse_time(inicio.strip()),
+                    "end": parse_time(fim.strip()),
+                    "output": os.path.join(pasta_saida, f"corte_{i}.mp4"),
+                }
+            )
+        except Exception as e:
+            falhas.append(f"'{intervalo}': {e}")
+
+    global cancel_event
+    cancel_event = threading.Event()
+    cut_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    progress_bar["value"] = 0
+    status_label.config(text="Processando...")
+    # Roda o ffmpeg fora do loop do Tk para a janela continuar respondendo
+    threading.Thread(
+        target=executar_cortes,
+        args=(input_file, segmentos, pasta_saida, falhas, cancel_event),
+        daemon=True,
+    ).start()
+
+def executar_cortes(input_file, segmentos, pasta_saida, falhas, evento):
     try:
-        for i, intervalo in enumerate(intervalos, start=1):
-            try:
-                inicio, fim = intervalo.split(" até ")
-                start_time = parse_time(inicio.strip())
-                end_time = parse_time(fim.strip())
-
-                output_file = os.path.join(pasta_saida, f"corte_{i}.mp4")
-                cut_video(input_file, output_file, start_time, end_time)
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao processar o intervalo '{intervalo}': {e}")
-                continue
-
-        messagebox.showinfo("Sucesso", f"Todos os vídeos foram cortados e salvos na pasta: {pasta_saida}")
+        resultados = cut_many(
+            input_file, segmentos, pasta_saida, on_progress=receber_progresso, cancel_event=evento
+        )
+    except FFmpegCancelled:
+        root.after(0, finalizar, "Cortes cancelados")
+        return
     except Exception as e:
-        messagebox.showerror("Erro", f"Erro ao cortar os vídeos: {e}")
+        root.after(0, finalizar, "", ("Erro", f"Erro ao cortar os vídeos: {e}"))
+        return
+
+    for resultado in resultados:
+        if not resultado["ok"]:
+            nome = os.path.basename(resultado["output"])
+            falhas.append(f"{nome}: {resultado['error']}")
+
+    sucesso = sum(1 for r in resultados if r["ok"])
+    if falhas:
+        mensagem = (
+            "Concluído com erros",
+            f"{sucesso} corte(s) salvos em {pasta_saida}.\n\nFalhas:\n" + "\n".join(falhas),
+        )
+    else:
+        mensagem = ("Sucesso", f"Todos os vídeos foram cortados e salvos na pasta: {pasta_saida}")
+    root.after(0, finalizar, "Concluído", mensagem)
+
+def receber_progresso(info):
+    root.after(0, mostrar_progresso, info)
+
+def mostrar_progresso(info):
+    if info["percent"] is not None:
+        progress_bar["value"] = info["percent"]
+    status_label.config(text=format_progress(info))
+
+def finalizar(status, mensagem=None):
+    cut_button.config(state=tk.NORMAL)
+    cancel_button.config(state=tk.DISABLED)
+    status_label.config(text=status)
+    if mensagem:
+        titulo, texto = mensagem
+        if titulo == "Erro":
+            messagebox.showerror(titulo, texto)
+        elif titulo == "Sucesso":
+            messagebox.showinfo(titulo, texto)
+        else:
+            messagebox.showwarning(titulo, texto)
+
+def cancelar():
+    cancel_event.set()
 
 # Configuração da interface gráfica
 root = tk.Tk()
@@ -59,6 +123,15 @@ tk.Label(root, text="Lista de Intervalos (ex.: HH:MM:SS até HH:MM:SS):").grid(r
 lista_intervalos = tk.Text(root, width=60, height=15)
 lista_intervalos.grid(row=2, column=0, columnspan=3, padx=10, pady=10)
 
-tk.Button(root, text="Cortar Vídeos", command=cortar_videos).grid(row=3, column=0, columnspan=3, pady=20)
+cut_button = tk.Button(root, text="Cortar Vídeos", command=cortar_videos)
+cut_button.grid(row=3, column=0, columnspan=3, pady=20)
+
+cancel_event = threading.Event()
+progress_bar = ttk.Progressbar(root, length=300, mode="determinate", maximum=100)
+progress_bar.grid(row=4, column=0, columnspan=3, padx=10, pady=5)
+status_label = tk.Label(root, text="")
+status_label.grid(row=5, column=0, columnspan=3, padx=10, pady=5)
+cancel_button = tk.Button(root, text="Cancelar", command=cancelar, state=tk.DISABLED)
+cancel_button.grid(row=6, column=0, columnspan=3, pady=10)
 
 root.mainloop()
\ No newline at end of file
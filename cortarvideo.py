@@ -1,7 +1,9 @@
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from moviepy.editor import VideoFileClip
+from tkinter import filedialog, messagebox, ttk
 
+from ffmpeg_runner import FFmpegCancelled, format_progress
+from media_probe import probe
 from video_cut_utils import (
     format_seconds,
     parse_time,
@@ -12,13 +14,13 @@ def escolher_video():
     input_file = filedialog.askopenfilename(title="Selecione o arquivo de vídeo")
     if input_file:
         input_file_path.set(input_file)
-        video = VideoFileClip(input_file)
-        video_duration.set(int(video.duration))
-        end_time.set(int(video.duration))
-        start_slider.config(to=int(video.duration))
-        end_slider.config(to=int(video.duration))
+        duration = int(probe(input_file).duration)
+        video_duration.set(duration)
+        end_time.set(duration)
+        start_slider.config(to=duration)
+        end_slider.config(to=duration)
         start_slider.set(0)
-        end_slider.set(int(video.duration))
+        end_slider.set(duration)
         atualizar_inputs()
 
 
@@ -62,11 +64,49 @@ def cortar_video():
     if not output_file:
         return
 
+    global cancel_event
+    cancel_event = threading.Event()
+    cut_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    progress_bar["value"] = 0
+    status_label.config(text="Processando...")
+    # Roda o ffmpeg fora do loop do Tk para a janela continuar respondendo
+    threading.Thread(
+        target=executar_corte,
+        args=(input_file, output_file, start_time, end_time, cancel_event),
+        daemon=True,
+    ).start()
+
+def executar_corte(input_file, output_file, start, end, evento):
     try:
-        cut_video(input_file, output_file, start_time, end_time)
-        messagebox.showinfo("Sucesso", f"Vídeo cortado salvo como {output_file}")
+        cut_video(input_file, output_file, start, end, on_progress=receber_progresso, cancel_event=evento)
+    except FFmpegCancelled:
+        root.after(0, finalizar, "Corte cancelado")
+        return
     except Exception as e:
-        messagebox.showerror("Erro", f"Erro ao cortar o vídeo: {e}")
+        root.after(0, finalizar, "", f"Erro ao cortar o vídeo: {e}")
+        return
+    root.after(0, finalizar, "Concluído", None, f"Vídeo cortado salvo como {output_file}")
+
+def receber_progresso(info):
+    root.after(0, mostrar_progresso, info)
+
+def mostrar_progresso(info):
+    if info["percent"] is not None:
+        progress_bar["value"] = info["percent"]
+    status_label.config(text=format_progress(info))
+
+def finalizar(status, erro=None, sucesso=None):
+    cut_button.config(state=tk.NORMAL)
+    cancel_button.config(state=tk.DISABLED)
+    status_label.config(text=status)
+    if erro:
+        messagebox.showerror("Erro", erro)
+    elif sucesso:
+        messagebox.showinfo("Sucesso", sucesso)
+
+def cancelar():
+    cancel_event.set()
 
 # Configuração da interface gráfica
 root = tk.Tk()
@@ -109,4 +149,12 @@ end_slider.grid(row=5, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
 cut_button = tk.Button(root, text="Cortar Vídeo", command=cortar_video)
 cut_button.grid(row=6, column=0, columnspan=3, pady=20)
 
+cancel_event = threading.Event()
+progress_bar = ttk.Progressbar(root, length=300, mode="determinate", maximum=100)
+progress_bar.grid(row=7, column=0, columnspan=3, padx=10, pady=5)
+status_label = tk.Label(root, text="")
+status_label.grid(row=8, column=0, columnspan=3, padx=10, pady=5)
+cancel_button = tk.Button(root, text="Cancelar", command=cancelar, state=tk.DISABLED)
+cancel_button.grid(row=9, column=0, columnspan=3, pady=10)
+
 root.mainloop()
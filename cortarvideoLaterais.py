@@ -1,7 +1,9 @@
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-from moviepy.editor import VideoFileClip
+from ffmpeg_runner import FFmpegCancelled, format_progress
+from media_probe import probe
 from video_cut_utils import crop_sides
 
 class VideoCropperApp:
@@ -24,8 +26,12 @@ class VideoCropperApp:
         self.save_button = tk.Button(root, text="Salvar Vídeo Cortado", command=self.save_video_file, state=tk.DISABLED)
         self.save_button.pack(pady=5)
 
+        self.cancel_button = tk.Button(root, text="Cancelar", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(pady=5)
+
         self.input_video_path = ""
         self.output_video_path = ""
+        self.cancel_event = threading.Event()
 
     def select_video_file(self):
         self.input_video_path = filedialog.askopenfilename(title="Selecione o vídeo", filetypes=[("MP4 files", "*.mp4"), ("All files", "*.*")])
@@ -39,23 +45,55 @@ class VideoCropperApp:
         self.output_video_path = filedialog.asksaveasfilename(defaultextension=".mp4", filetypes=[("MP4 files", "*.mp4"), ("All files", "*.*")])
         if self.output_video_path:
             self.progress_label.config(text="Processando...")
-            self.root.update_idletasks()
-            self.crop_video()
+            self.progress_bar['maximum'] = 100
+            self.progress_bar['value'] = 0
+            self.save_button.config(state=tk.DISABLED)
+            self.cancel_button.config(state=tk.NORMAL)
+            self.cancel_event = threading.Event()
+            # Roda o ffmpeg fora do loop do Tk para a janela continuar respondendo
+            threading.Thread(target=self.crop_video, daemon=True).start()
+
+    def cancel(self):
+        self.cancel_event.set()
 
     def crop_video(self):
-        video = VideoFileClip(self.input_video_path)
-        width, _ = video.size
-        left = 200
-        right = width - 200
-        video.close()
-
-        self.progress_bar['maximum'] = 100
-        crop_sides(self.input_video_path, self.output_video_path, left, right)
-        self.progress_bar['value'] = 100
-
-        messagebox.showinfo("Concluído", "O vídeo foi cortado e salvo com sucesso!")
-        self.progress_label.config(text="Processo concluído!")
+        try:
+            width, _ = probe(self.input_video_path).size
+            left = 200
+            right = width - 200
+            crop_sides(
+                self.input_video_path,
+                self.output_video_path,
+                left,
+                right,
+                on_progress=self.on_progress,
+                cancel_event=self.cancel_event,
+            )
+        except FFmpegCancelled:
+            self.root.after(0, self.finish, "Processo cancelado.", None)
+            return
+        except Exception as e:
+            self.root.after(0, self.finish, "", f"Erro ao cortar o vídeo: {e}")
+            return
+        self.root.after(0, self.finish, "Processo concluído!", None)
+
+    def on_progress(self, info):
+        self.root.after(0, self.show_progress, info)
+
+    def show_progress(self, info):
+        if info["percent"] is not None:
+            self.progress_bar['value'] = info["percent"]
+        self.progress_label.config(text=format_progress(info))
+
+    def finish(self, status, error):
+        self.save_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
         self.progress_bar['value'] = 0
+        if error:
+            messagebox.showerror("Erro", error)
+        elif status == "Processo concluído!":
+            messagebox.showinfo("Concluído", "O vídeo foi cortado e salvo com sucesso!")
+        self.progress_label.config(text=status)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,5 +1,8 @@
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
+
+from ffmpeg_runner import FFmpegCancelled, format_progress
 from video_cut_utils import cut_vertical_halves
 
 def escolher_video():
@@ -14,23 +17,72 @@ def cortar_verticalmente():
         messagebox.showerror("Erro", "Nenhum arquivo de vídeo selecionado")
         return
 
+    output_file_esquerda = filedialog.asksaveasfilename(
+        defaultextension=".mp4", title="Salvar parte esquerda como"
+    )
+    if not output_file_esquerda:
+        return
+    output_file_direita = filedialog.asksaveasfilename(
+        defaultextension=".mp4", title="Salvar parte direita como"
+    )
+    if not output_file_direita:
+        return
+
+    global cancel_event
+    cancel_event = threading.Event()
+    cut_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    progress_bar["value"] = 0
+    status_label.config(text="Processando...")
+    # Roda o ffmpeg fora do loop do Tk para a janela continuar respondendo
+    threading.Thread(
+        target=executar_corte,
+        args=(input_file, output_file_esquerda, output_file_direita, cancel_event),
+        daemon=True,
+    ).start()
+
+def executar_corte(input_file, output_file_esquerda, output_file_direita, evento):
     try:
-        output_file_esquerda = filedialog.asksaveasfilename(
-            defaultextension=".mp4", title="Salvar parte esquerda como"
-        )
-        if not output_file_esquerda:
-            return
-        output_file_direita = filedialog.asksaveasfilename(
-            defaultextension=".mp4", title="Salvar parte direita como"
+        cut_vertical_halves(
+            input_file,
+            output_file_esquerda,
+            output_file_direita,
+            on_progress=receber_progresso,
+            cancel_event=evento,
         )
-        if not output_file_direita:
-            return
+    except FFmpegCancelled:
+        root.after(0, finalizar, "Corte cancelado")
+        return
+    except Exception as e:
+        root.after(0, finalizar, "", f"Erro ao cortar o vídeo: {e}")
+        return
+    root.after(
+        0,
+        finalizar,
+        "Concluído",
+        None,
+        f"Vídeos cortados salvos como {output_file_esquerda} e {output_file_direita}",
+    )
 
-        cut_vertical_halves(input_file, output_file_esquerda, output_file_direita)
+def receber_progresso(info):
+    root.after(0, mostrar_progresso, info)
 
-        messagebox.showinfo("Sucesso", f"Vídeos cortados salvos como {output_file_esquerda} e {output_file_direita}")
-    except Exception as e:
-        messagebox.showerror("Erro", f"Erro ao cortar o vídeo: {e}")
+def mostrar_progresso(info):
+    if info["percent"] is not None:
+        progress_bar["value"] = info["percent"]
+    status_label.config(text=format_progress(info))
+
+def finalizar(status, erro=None, sucesso=None):
+    cut_button.config(state=tk.NORMAL)
+    cancel_button.config(state=tk.DISABLED)
+    status_label.config(text=status)
+    if erro:
+        messagebox.showerror("Erro", erro)
+    elif sucesso:
+        messagebox.showinfo("Sucesso", sucesso)
+
+def cancelar():
+    cancel_event.set()
 
 # Configuração da interface gráfica
 root = tk.Tk()
@@ -45,4 +97,12 @@ tk.Button(root, text="Escolher Vídeo", command=escolher_video).grid(row=0, colu
 cut_button = tk.Button(root, text="Cortar Vídeo ao Meio", command=cortar_verticalmente)
 cut_button.grid(row=1, column=0, columnspan=3, pady=20)
 
+cancel_event = threading.Event()
+progress_bar = ttk.Progressbar(root, length=300, mode="determinate", maximum=100)
+progress_bar.grid(row=2, column=0, columnspan=3, padx=10, pady=5)
+status_label = tk.Label(root, text="")
+status_label.grid(row=3, column=0, columnspan=3, padx=10, pady=5)
+cancel_button = tk.Button(root, text="Cancelar", command=cancelar, state=tk.DISABLED)
+cancel_button.grid(row=4, column=0, columnspan=3, pady=10)
+
 root.mainloop()
@@ -4,71 +4,99 @@ from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 import threading
 import numpy as np
-import os
 
-VIDEO_CODEC = "h264_nvenc" if os.getenv("VIDEO_HWACCEL") else "libx264"
+from encoding_profiles import moviepy_kwargs
+from ffmpeg_runner import FFmpegCancelled, format_progress
+from moviepy_compat import apply_patches
+from video_cut_utils import stack_videos
+
+# Resolução sugerida pelo TikTok para cada vídeo empilhado
+TARGET_WIDTH = 720
+TARGET_HEIGHT = 640  # Metade da altura de 1280 px para empilhamento vertical
 
 def resize_with_lanczos(image, new_size):
     pil_image = Image.fromarray(image)
-    resized_image = pil_image.resize(new_size[::-1], Image.LANCZOS)
+    # ``new_size`` é (largura, altura), mesma ordem esperada pelo PIL
+    resized_image = pil_image.resize(new_size, Image.LANCZOS)
     return np.array(resized_image)
 
-def create_tiktok_video(video_top_path, video_bottom_path, output_path, audio_from_top, progress_var, on_complete):
-    # Atualiza a barra de progresso
-    def update_progress(progress):
-        progress_var.set(progress)
-        root.update_idletasks()
+def create_tiktok_video_moviepy(video_top_path, video_bottom_path, output_path, audio_from_top, update_progress=None, profile=None):
+    """Versão original em MoviePy, mantida para comparação (ver benchmarks)."""
+    if update_progress is None:
+        update_progress = lambda progress: None
+    apply_patches()
 
-    try:
-        # Resolução sugerida pelo TikTok para cada vídeo empilhado
-        target_width = 720
-        target_height = 640  # Metade da altura de 1280 px para empilhamento vertical
+    # Carregar os vídeos
+    video_top = VideoFileClip(video_top_path)
+    video_bottom = VideoFileClip(video_bottom_path)
 
-        # Carregar os vídeos
-        video_top = VideoFileClip(video_top_path)
-        video_bottom = VideoFileClip(video_bottom_path)
+    update_progress(20)
 
-        update_progress(20)
+    # Ajustar a duração dos vídeos para que o mais curto se repita
+    if audio_from_top:
+        video_bottom = video_bottom.loop(duration=video_top.duration)
+    else:
+        video_top = video_top.loop(duration=video_bottom.duration)
 
-        # Ajustar a duração dos vídeos para que o mais curto se repita
-        if audio_from_top:
-            video_bottom = video_bottom.loop(duration=video_top.duration)
-        else:
-            video_top = video_top.loop(duration=video_bottom.duration)
+    update_progress(40)
 
-        update_progress(40)
+    # Redimensionar vídeos para a resolução alvo
+    video_top = video_top.fl_image(lambda image: resize_with_lanczos(image, (TARGET_WIDTH, TARGET_HEIGHT)))
+    video_bottom = video_bottom.fl_image(lambda image: resize_with_lanczos(image, (TARGET_WIDTH, TARGET_HEIGHT)))
 
-        # Redimensionar vídeos para a resolução alvo
-        video_top = video_top.fl_image(lambda image: resize_with_lanczos(image, (target_width, target_height)))
-        video_bottom = video_bottom.fl_image(lambda image: resize_with_lanczos(image, (target_width, target_height)))
+    update_progress(60)
 
-        update_progress(60)
+    # Combinar vídeos verticalmente
+    final_clip = CompositeVideoClip([
+        video_top.set_position(("center", "top")),
+        video_bottom.set_position(("center", video_top.h))
+    ], size=(TARGET_WIDTH, TARGET_HEIGHT * 2))
 
-        # Combinar vídeos verticalmente
-        final_clip = CompositeVideoClip([
-            video_top.set_position(("center", "top")),
-            video_bottom.set_position(("center", video_top.h))
-        ], size=(target_width, target_height * 2))
+    update_progress(80)
 
-        update_progress(80)
+    # Selecionar áudio
+    if audio_from_top:
+        final_clip = final_clip.set_audio(video_top.audio)
+    else:
+        final_clip = final_clip.set_audio(video_bottom.audio)
 
-        # Selecionar áudio
-        if audio_from_top:
-            final_clip = final_clip.set_audio(video_top.audio)
-        else:
-            final_clip = final_clip.set_audio(video_bottom.audio)
+    # Exportar vídeo final
+    final_clip.write_videofile(output_path, **moviepy_kwargs(profile))
+    final_clip.close()
+    video_top.close()
+    video_bottom.close()
+
+    update_progress(100)
 
-        # Exportar vídeo final
-        final_clip.write_videofile(output_path, codec=VIDEO_CODEC, audio_codec="aac")
-        final_clip.close()
-        video_top.close()
-        video_bottom.close()
+def create_tiktok_video(video_top_path, video_bottom_path, output_path, audio_from_top, progress_var, on_complete, status_var=None, cancel_event=None):
+    # Roda numa thread: toda atualização de widget volta ao loop do Tk via root.after
+    def show_progress(info):
+        if info["percent"] is not None:
+            progress_var.set(info["percent"])
+        if status_var is not None:
+            status_var.set(format_progress(info))
 
-        update_progress(100)
+    def update_progress(info):
+        root.after(0, show_progress, info)
+
+    try:
+        # Redimensiona, empilha e repete o vídeo mais curto num único ffmpeg
+        stack_videos(
+            video_top_path,
+            video_bottom_path,
+            output_path,
+            audio_from_top,
+            width=TARGET_WIDTH,
+            height=TARGET_HEIGHT,
+            on_progress=update_progress,
+            cancel_event=cancel_event,
+        )
+    except FFmpegCancelled:
+        root.after(0, on_complete, "cancelled")
     except Exception as e:
-        messagebox.showerror("Erro", f"Erro ao criar vídeo: {str(e)}")
-    finally:
-        on_complete()
+        root.after(0, on_complete, "error", f"Erro ao criar vídeo: {str(e)}")
+    else:
+        root.after(0, on_complete, "done")
 
 class VideoEditorApp:
     def __init__(self, root):
@@ -126,6 +154,14 @@ class VideoEditorApp:
         self.progress_bar = tk.Scale(second_frame, variable=self.progress_var, from_=0, to=100, orient="horizontal", length=400, label="Progresso")
         self.progress_bar.pack()
 
+        self.status_var = tk.StringVar()
+        self.status_label = tk.Label(second_frame, textvariable=self.status_var)
+        self.status_label.pack()
+
+        self.cancel_event = threading.Event()
+        self.cancel_button = tk.Button(second_frame, text="Cancelar", command=self.cancel_event.set, state=tk.DISABLED)
+        self.cancel_button.pack()
+
     def choose_top_video(self):
         self.video_top_path = filedialog.askopenfilename(title="Escolha o vídeo de cima")
         if self.video_top_path:
@@ -147,8 +183,18 @@ class VideoEditorApp:
         label.config(image=photo)
         label.image = photo  # Manter referência para evitar garbage collection
 
-    def on_video_creation_complete(self):
-        messagebox.showinfo("Sucesso", "Vídeo criado com sucesso!")
+    def on_video_creation_complete(self, status, error=None):
+        self.create_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if status == "done":
+            self.progress_var.set(100)
+            self.status_var.set("Concluído")
+            messagebox.showinfo("Sucesso", "Vídeo criado com sucesso!")
+        elif status == "cancelled":
+            self.status_var.set("Cancelado")
+        else:
+            self.status_var.set("")
+            messagebox.showerror("Erro", error)
 
     def create_video(self):
         if not self.video_top_path or not self.video_bottom_path:
@@ -158,7 +204,17 @@ class VideoEditorApp:
         output_path = filedialog.asksaveasfilename(defaultextension=".mp4", title="Salvar vídeo como")
         if output_path:
             audio_from_top = self.audio_option.get()
-            threading.Thread(target=create_tiktok_video, args=(self.video_top_path, self.video_bottom_path, output_path, audio_from_top, self.progress_var, self.on_video_creation_complete)).start()
+            self.cancel_event.clear()
+            self.create_button.config(state=tk.DISABLED)
+            self.cancel_button.config(state=tk.NORMAL)
+            self.progress_var.set(0)
+            self.status_var.set("Processando...")
+            threading.Thread(
+                target=create_tiktok_video,
+                args=(self.video_top_path, self.video_bottom_path, output_path, audio_from_top, self.progress_var, self.on_video_creation_complete),
+                kwargs={"status_var": self.status_var, "cancel_event": self.cancel_event},
+                daemon=True,
+            ).start()
 
 if __name__ == "__main__":
     root = tk.Tk()
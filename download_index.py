@@ -0,0 +1,158 @@
+"""Persistent index of downloaded videos.
+
+Maps a canonical video ID (``youtube:<id>``, ``tiktok:<id>``,
+``instagram:<shortcode>``) to the stored file and its content hash, so a
+URL that was already fetched on another day returns the existing file
+without any network request. The ID is parsed from the URL itself; URLs
+it cannot be parsed from (e.g. ``vm.tiktok.com`` short links) are
+remembered by their exact text instead.
+
+The index is a JSON file at ``videos/downloads.json`` (override with
+``DOWNLOAD_INDEX``).
+"""
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from media_cache import fast_file_hash
+
+INDEX_PATH = Path(os.getenv("DOWNLOAD_INDEX", os.path.join("videos", "downloads.json")))
+
+_YOUTUBE_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_PATHS = ("shorts", "embed", "live", "v")
+_INSTAGRAM_PATHS = ("p", "reel", "reels", "tv")
+
+_lock = threading.Lock()
+_entries = None
+
+
+def canonical_id(url: str):
+    """Return the platform scoped video ID of ``url``, or ``None``."""
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www.") or host.startswith("m."):
+        host = host.split(".", 1)[1]
+    parts = [p for p in parsed.path.split("/") if p]
+
+    video_id = None
+    if host == "youtu.be" and parts:
+        video_id = parts[0]
+    elif host.endswith("youtube.com"):
+        if parts[:1] == ["watch"]:
+            video_id = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(parts) >= 2 and parts[0] in _YOUTUBE_PATHS:
+            video_id = parts[1]
+    if video_id is not None:
+        return f"youtube:{video_id}" if _YOUTUBE_ID.match(video_id) else None
+
+    if host.endswith("tiktok.com"):
+        match = re.search(r"/video/(\d+)", parsed.path)
+        return f"tiktok:{match.group(1)}" if match else None
+
+    if host.endswith("instagram.com"):
+        if len(parts) >= 2 and parts[0] in _INSTAGRAM_PATHS:
+            return f"instagram:{parts[1]}"
+        # /<user>/p/<shortcode>/ and /<user>/reel/<shortcode>/
+        if len(parts) >= 3 and parts[1] in _INSTAGRAM_PATHS:
+            return f"instagram:{parts[2]}"
+    return None
+
+
+def _key(url: str) -> str:
+    return canonical_id(url) or f"url:{url.strip()}"
+
+
+def _load() -> dict:
+    global _entries
+    if _entries is None:
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                _entries = json.load(f)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+
+def _save() -> None:
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_PATH.with_suffix(f".{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_entries, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, INDEX_PATH)
+
+
+def _valid(entry: dict) -> bool:
+    path = entry.get("path")
+    return bool(path) and os.path.isfile(path) and os.path.getsize(path) == entry.get("size")
+
+
+def lookup(url: str):
+    """Return the stored file for ``url`` if it is still on disk.
+
+    Entries whose file was deleted or changed size are dropped.
+    """
+    key = _key(url)
+    with _lock:
+        entries = _load()
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if _valid(entry):
+            return entry["path"]
+        del entries[key]
+        _save()
+    return None
+
+
+def find_by_hash(content_hash: str, exclude: str = None):
+    """Return the stored file with ``content_hash`` other than ``exclude``."""
+    exclude = os.path.realpath(exclude) if exclude else None
+    with _lock:
+        for entry in _load().values():
+            if (
+                entry.get("hash") == content_hash
+                and os.path.realpath(entry.get("path") or "") != exclude
+                and _valid(entry)
+            ):
+                return entry["path"]
+    return None
+
+
+def record(url: str, path: str) -> str:
+    """Remember that ``url`` was downloaded to ``path``.
+
+    When the same content is already stored under another ID (the same
+    video reached through a different link) the new copy is deleted and
+    the existing path is recorded and returned instead. Paths are stored
+    and returned absolute.
+    """
+    if not os.path.isfile(path):
+        return path
+    path = os.path.abspath(path)
+    content_hash = fast_file_hash(path)
+    existing = find_by_hash(content_hash, exclude=path)
+    # Never delete the file being recorded, whatever path it was reached by.
+    if existing is not None and os.path.realpath(existing) != os.path.realpath(path):
+        os.remove(path)
+        path = existing
+    with _lock:
+        _load()[_key(url)] = {
+            "url": url,
+            "path": path,
+            "size": os.path.getsize(path),
+            "hash": content_hash,
+            "downloaded": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        _save()
+    return path
+
+
+def forget(url: str) -> None:
+    """Remove ``url`` from the index so the next request downloads again."""
+    with _lock:
+        if _load().pop(_key(url), None) is not None:
+            _save()
@@ -0,0 +1,241 @@
+"""Throughput settings for yt-dlp downloads.
+
+=================  =======================  =================================
+Setting            Variable                 Meaning
+=================  =======================  =================================
+``fragments``      ``DOWNLOAD_FRAGMENTS``   DASH/HLS fragments fetched at once
+``chunk_size``     ``DOWNLOAD_CHUNK_SIZE``  HTTP range size (``10M``; 0 = off)
+``retries``        ``DOWNLOAD_RETRIES``     retries per request and fragment
+``backoff``        ``DOWNLOAD_BACKOFF``     first retry wait (s), doubles
+``resume``         ``DOWNLOAD_RESUME``      continue ``.part`` files (1/0)
+=================  =======================  =================================
+
+Values come from ``DEFAULTS``, then the tuned values written by
+``python download_settings.py benchmark <url>`` to
+``.cache/downloads/tuned.json``, then the environment (``.env``), then
+explicit overrides such as command line flags.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from media_cache import cache_dir
+
+DEFAULTS = {
+    "fragments": 4,
+    "chunk_size": 10 * 1024 * 1024,
+    "retries": 10,
+    "backoff": 1.0,
+    "resume": True,
+}
+
+ENV_VARS = {
+    "fragments": "DOWNLOAD_FRAGMENTS",
+    "chunk_size": "DOWNLOAD_CHUNK_SIZE",
+    "retries": "DOWNLOAD_RETRIES",
+    "backoff": "DOWNLOAD_BACKOFF",
+    "resume": "DOWNLOAD_RESUME",
+}
+
+# Longest wait between two retries, in seconds.
+MAX_BACKOFF = 60
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(value) -> int:
+    """Convert ``"10M"``, ``"512K"`` or ``1048576`` to a number of bytes."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*", str(value), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Tamanho inválido: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(value: int) -> str:
+    for unit in ("G", "M", "K"):
+        if value and value % _SIZE_UNITS[unit] == 0:
+            return f"{value // _SIZE_UNITS[unit]}{unit}"
+    return str(value)
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("0", "false", "no", "nao", "não", "off", "")
+
+
+_PARSERS = {
+    "fragments": lambda v: max(1, int(v)),
+    "chunk_size": parse_size,
+    "retries": lambda v: max(0, int(v)),
+    "backoff": lambda v: max(0.0, float(v)),
+    "resume": _parse_bool,
+}
+
+
+def _tuned_path():
+    return cache_dir("downloads") / "tuned.json"
+
+
+def tuned_settings() -> dict:
+    """Return the settings chosen by the last benchmark, if any."""
+    try:
+        with open(_tuned_path(), "r", encoding="utf-8") as f:
+            return json.load(f).get("settings", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def load_settings(**overrides) -> dict:
+    """Return the effective settings; ``None`` overrides are ignored."""
+    settings = dict(DEFAULTS)
+    settings.update({k: v for k, v in tuned_settings().items() if k in DEFAULTS})
+    for name, var in ENV_VARS.items():
+        value = os.getenv(var)
+        if value:
+            settings[name] = value
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    return {name: _PARSERS[name](value) for name, value in settings.items()}
+
+
+def ytdlp_options(settings: dict = None) -> dict:
+    """Return the yt-dlp options for ``settings`` (``load_settings()`` by default)."""
+    if settings is None:
+        settings = load_settings()
+    backoff = settings["backoff"]
+
+    # yt-dlp calls it as ``func(n=<retry number, from 0>)``.
+    def sleep(n):
+        return min(backoff * 2 ** n, MAX_BACKOFF)
+
+    opts = {
+        "concurrent_fragment_downloads": settings["fragments"],
+        "retries": settings["retries"],
+        "fragment_retries": settings["retries"],
+        "retry_sleep_functions": {"http": sleep, "fragment": sleep},
+        "continuedl": settings["resume"],
+        # Keep the partial download in a .part file so a crash can resume it.
+        "nopart": False,
+    }
+    if settings["chunk_size"]:
+        opts["http_chunk_size"] = settings["chunk_size"]
+    return opts
+
+
+def add_arguments(parser) -> None:
+    """Add ``--fragments``/``--chunk-size``/... flags to an argparse parser."""
+    group = parser.add_argument_group("desempenho do download")
+    group.add_argument("--fragments", type=int, help="fragmentos baixados em paralelo")
+    group.add_argument("--chunk-size", help="tamanho de cada requisição HTTP (ex.: 10M, 0 desliga)")
+    group.add_argument("--retries", type=int, help="tentativas por requisição/fragmento")
+    group.add_argument("--backoff", type=float, help="espera inicial entre tentativas (s)")
+    group.add_argument(
+        "--no-resume", dest="resume", action="store_false", default=None,
+        help="não continua arquivos .part incompletos",
+    )
+
+
+def settings_from_args(args) -> dict:
+    return load_settings(
+        fragments=args.fragments,
+        chunk_size=args.chunk_size,
+        retries=args.retries,
+        backoff=args.backoff,
+        resume=args.resume,
+    )
+
+
+def benchmark(url: str, fragments=(1, 4, 8, 16), chunk_sizes=("0", "1M", "10M")) -> dict:
+    """Download ``url`` with each combination and store the fastest one.
+
+    Every run starts from an empty directory so nothing is resumed. The
+    measurements and the winning settings are written to
+    ``.cache/downloads/tuned.json``, which ``load_settings`` reads.
+    """
+    import yt_dlp
+
+    runs = []
+    base = load_settings()
+    for frag in fragments:
+        for chunk in chunk_sizes:
+            settings = dict(base, fragments=frag, chunk_size=parse_size(chunk), resume=False)
+            tmp = tempfile.mkdtemp()
+            opts = {
+                "format": "bestvideo+bestaudio/best",
+                "outtmpl": os.path.join(tmp, "%(id)s.%(ext)s"),
+                "quiet": True,
+                "no_warnings": True,
+                "cachedir": False,
+            }
+            opts.update(ytdlp_options(settings))
+            started = time.perf_counter()
+            try:
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    ydl.download([url])
+                elapsed = time.perf_counter() - started
+                size = sum(
+                    os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)
+                )
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+            runs.append(
+                {
+                    "fragments": frag,
+                    "chunk_size": settings["chunk_size"],
+                    "seconds": round(elapsed, 2),
+                    "mb_per_s": round(size / elapsed / 1024 ** 2, 2),
+                }
+            )
+            print(
+                f"fragments={frag:<3} chunk={format_size(settings['chunk_size']):>4}  "
+                f"{runs[-1]['seconds']:7.2f}s  {runs[-1]['mb_per_s']:6.2f} MB/s",
+                flush=True,
+            )
+
+    best = max(runs, key=lambda r: r["mb_per_s"])
+    report = {
+        "url": url,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "runs": runs,
+        "settings": {"fragments": best["fragments"], "chunk_size": best["chunk_size"]},
+    }
+    with open(_tuned_path(), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Configuração de desempenho dos downloads")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="mostra a configuração efetiva")
+    add_arguments(show)
+    bench = sub.add_parser("benchmark", help="mede a vazão e grava os melhores valores")
+    bench.add_argument("url", help="vídeo usado na medição")
+    bench.add_argument("--fragments", type=int, nargs="+", default=[1, 4, 8, 16])
+    bench.add_argument("--chunk-sizes", nargs="+", default=["0", "1M", "10M"])
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        settings = settings_from_args(args)
+        for name, value in settings.items():
+            if name == "chunk_size":
+                value = format_size(value)
+            print(f"{name:11} {value}  ({ENV_VARS[name]})")
+    else:
+        report = benchmark(args.url, args.fragments, args.chunk_sizes)
+        best = report["settings"]
+        print(
+            f"melhor: fragments={best['fragments']} chunk={format_size(best['chunk_size'])} "
+            f"-> {_tuned_path()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,646 @@
+"""Headless video downloads for YouTube, TikTok and Instagram.
+
+Files are stored in ``videos/<data>/<plataforma>``. ``download`` fetches
+one URL and returns the saved path; ``download_batch`` fetches many URLs
+in parallel while limiting how many downloads run at once per platform
+(``PLATFORM_LIMITS``), so a long list does not hammer a single site.
+
+Run ``python downloader.py URL [URL ...]`` or ``python downloader.py -f
+urls.txt`` to download without the Kivy app.
+
+yt-dlp takes a noticeable time to import, so it is imported inside the
+functions that use it rather than with this module.
+"""
+import argparse
+import copy
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+
+import download_index
+import instagram_loader
+import metadata_cache
+from download_settings import add_arguments, settings_from_args, ytdlp_options
+from format_policies import BEST, POLICIES, default_policy, select_format
+from progress_aggregator import get_aggregator
+
+# Maximum simultaneous downloads per platform.
+PLATFORM_LIMITS = {
+    "youtube": 3,
+    "tiktok": 2,
+    "instagram": 1,
+}
+
+_semaphores = {name: threading.BoundedSemaphore(n) for name, n in PLATFORM_LIMITS.items()}
+
+
+class DownloadError(Exception):
+    """Raised with a user facing message when a download fails."""
+
+
+class DownloadCancelled(DownloadError):
+    """Raised when a download is cancelled through its cancel event."""
+
+
+class MyLogger:
+    def debug(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        print(msg)
+
+
+def _get_platform_dir(platform: str) -> str:
+    """Return directory for the current date and platform."""
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    path = os.path.join("videos", date_str, platform)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def extract_instagram_shortcode(url: str) -> str:
+    """Return the shortcode from an Instagram URL.
+
+    Raises ``ValueError`` if no shortcode can be determined.
+    """
+    parsed = urlparse(url)
+    path = parsed.path.strip("/")
+    if not path:
+        raise ValueError("URL inválida")
+    shortcode = path.split("/")[-1]
+    if not shortcode or shortcode.startswith("?"):
+        raise ValueError("URL inválida")
+    # remove any possible trailing parameters
+    shortcode = re.split(r"[/?#]", shortcode)[0]
+    if not shortcode:
+        raise ValueError("URL inválida")
+    return shortcode
+
+
+def detect_platform(url: str):
+    """Return ``"youtube"``, ``"tiktok"``, ``"instagram"`` or ``None``."""
+    host = urlparse(url).netloc.lower() or url.lower()
+    if "youtube" in host or "youtu.be" in host:
+        return "youtube"
+    if "tiktok" in host:
+        return "tiktok"
+    if "instagram" in host:
+        return "instagram"
+    return None
+
+
+def hook_percent(d: dict):
+    """Return the completion percentage of a yt-dlp progress dict."""
+    if d.get("status") == "finished":
+        return 100.0
+    total = d.get("total_bytes") or d.get("total_bytes_estimate")
+    if total:
+        return d.get("downloaded_bytes", 0) / total * 100
+    percent_str = re.sub(r"\x1b\[[0-9;]*m", "", d.get("_percent_str", ""))
+    try:
+        return float(percent_str.replace("%", "").strip())
+    except ValueError:
+        return None
+
+
+def _progress_hooks(on_progress, cancel_event, key=None):
+    """Return the yt-dlp hooks of one download.
+
+    Besides calling ``on_progress(percent)``, every event is fed to the
+    shared ``progress_aggregator`` under ``key``.
+    """
+    aggregator = get_aggregator() if key is not None else None
+
+    def hook(d):
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled("Download cancelado")
+        if aggregator is not None:
+            aggregator.feed(key, d)
+        if on_progress is not None and d.get("status") in ("downloading", "finished"):
+            percent = hook_percent(d)
+            if percent is not None:
+                on_progress(percent)
+
+    return [hook]
+
+
+def fetch_info(url: str, refresh: bool = False) -> dict:
+    """Return the extractor output for a YouTube/TikTok ``url`` without downloading.
+
+    The result is cached by ``metadata_cache`` and reused by the download.
+    """
+    platform = detect_platform(url)
+    if platform not in ("youtube", "tiktok"):
+        raise DownloadError("Informações disponíveis apenas para YouTube e TikTok")
+    opts = {"logger": MyLogger()}
+    if platform == "tiktok":
+        opts.update(_tiktok_cookie_opts())
+    return metadata_cache.get_info(url, opts, refresh=refresh)
+
+
+def _downloaded_path(ydl, info: dict) -> str:
+    for item in info.get("requested_downloads") or ():
+        if item.get("filepath"):
+            return item["filepath"]
+    return ydl.prepare_filename(info)
+
+
+def _policy_opts(policy: str = None) -> dict:
+    """Return the yt-dlp options that depend on the format policy."""
+    policy = policy or default_policy()
+    if policy == "archive":
+        return {}
+    # Policies pick H.264 + AAC streams, which merge into MP4 by remuxing.
+    return {"merge_output_format": "mp4"}
+
+
+def _run_ytdlp(url: str, opts: dict, cancel_event=None, policy: str = None) -> str:
+    """Extract ``url`` (or reuse ``metadata_cache``), choose the format
+    for ``policy`` and download it."""
+    import yt_dlp
+
+    try:
+        info = metadata_cache.get_info(url, opts)
+        opts = dict(opts, format=select_format(info.get("formats") or [], policy))
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            # yt-dlp edits the dict in place; the cached one is shared.
+            result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+            return _downloaded_path(ydl, result)
+    except Exception:
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled("Download cancelado")
+        raise
+
+
+def download_youtube(url: str, on_progress=None, cancel_event=None, settings=None, policy=None) -> str:
+    """Download a YouTube video and return the saved file path.
+
+    ``settings`` are the throughput settings from
+    ``download_settings.load_settings`` (the configured ones by default)
+    and ``policy`` a ``format_policies`` name (default policy if ``None``).
+    """
+    path = _get_platform_dir("youtube")
+    opts = {
+        "format": BEST,
+        "outtmpl": os.path.join(path, "%(title)s.%(ext)s"),
+        "quiet": True,
+        "no_warnings": True,
+        "logger": MyLogger(),
+        "progress_hooks": _progress_hooks(on_progress, cancel_event, key=url),
+    }
+    opts.update(ytdlp_options(settings))
+    opts.update(_policy_opts(policy))
+    return _run_ytdlp(url, opts, cancel_event, policy)
+
+
+def _tiktok_cookie_opts() -> dict:
+    cookie_file = os.getenv("TIKTOK_COOKIES_FILE")
+    cookie_browser = os.getenv("TIKTOK_COOKIES_BROWSER")
+    if not cookie_file and not cookie_browser:
+        raise DownloadError(
+            "TikTok requer autenticação. Defina TIKTOK_COOKIES_FILE ou TIKTOK_COOKIES_BROWSER no .env"
+        )
+    if cookie_file:
+        if not os.path.exists(cookie_file):
+            raise DownloadError(f"Arquivo de cookies não encontrado: {cookie_file}")
+        return {"cookiefile": cookie_file}
+    return {"cookiesfrombrowser": cookie_browser}
+
+
+def download_tiktok(url: str, on_progress=None, cancel_event=None, settings=None, policy=None) -> str:
+    """Download a TikTok video and return the saved file path.
+
+    TikTok needs cookies from ``TIKTOK_COOKIES_FILE`` or
+    ``TIKTOK_COOKIES_BROWSER``; ``DownloadError`` explains what is missing.
+    """
+    path = _get_platform_dir("tiktok")
+    opts = {
+        "format": BEST,
+        "outtmpl": os.path.join(path, "%(title)s.%(ext)s"),
+        "merge_output_format": "mp4",
+        "quiet": True,
+        "no_warnings": True,
+        "logger": MyLogger(),
+        "progress_hooks": _progress_hooks(on_progress, cancel_event, key=url),
+    }
+    opts.update(ytdlp_options(settings))
+    opts.update(_tiktok_cookie_opts())
+    import yt_dlp
+
+    try:
+        return _run_ytdlp(url, opts, cancel_event, policy)
+    except yt_dlp.utils.DownloadError as exc:
+        msg = str(exc)
+        if "login" in msg.lower():
+            msg += "\nDefina TIKTOK_COOKIES_FILE ou TIKTOK_COOKIES_BROWSER no .env"
+        raise DownloadError(msg) from exc
+
+
+def download_instagram(url: str, on_progress=None, cancel_event=None, settings=None, policy=None) -> str:
+    """Download an Instagram post and return the video path.
+
+    Instaloader does not report byte progress, so ``on_progress`` only
+    receives 100 when the post is saved. Posts go through the shared
+    session of ``instagram_loader``, which fetches only the video.
+    ``settings`` and ``policy`` are accepted for a uniform signature;
+    Instagram serves a single rendition.
+    """
+    path = _get_platform_dir("instagram")
+    try:
+        shortcode = extract_instagram_shortcode(url)
+    except ValueError as exc:
+        raise DownloadError(str(exc)) from exc
+    if cancel_event is not None and cancel_event.is_set():
+        raise DownloadCancelled("Download cancelado")
+    try:
+        paths = instagram_loader.download_video(shortcode, path)
+    except instagram_loader.InstagramError as exc:
+        raise DownloadError(str(exc)) from exc
+    if on_progress is not None:
+        on_progress(100.0)
+    return paths[0]
+
+
+DOWNLOADERS = {
+    "youtube": download_youtube,
+    "tiktok": download_tiktok,
+    "instagram": download_instagram,
+}
+
+
+def download(
+    url: str, on_progress=None, cancel_event=None, use_index: bool = True, settings=None, policy=None
+) -> str:
+    """Download ``url`` with the matching platform downloader.
+
+    A URL already in ``download_index`` returns the stored file right
+    away, without any network access; pass ``use_index=False`` to fetch
+    it again. Waits while ``PLATFORM_LIMITS`` downloads of the same
+    platform are already running. Returns the saved file path.
+    """
+    platform = detect_platform(url)
+    if platform is None:
+        raise DownloadError("Plataforma não reconhecida")
+    if use_index:
+        existing = download_index.lookup(url)
+        if existing is not None:
+            if on_progress is not None:
+                on_progress(100.0)
+            return existing
+    with _semaphores[platform]:
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled("Download cancelado")
+        aggregator = get_aggregator()
+        aggregator.start(url)
+        try:
+            path = DOWNLOADERS[platform](
+                url, on_progress=on_progress, cancel_event=cancel_event, settings=settings, policy=policy
+            )
+        finally:
+            aggregator.finish(url)
+    return download_index.record(url, path)
+
+
+def _parse_clock(value: str) -> float:
+    parts = value.strip().split(":")
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f"Tempo inválido: {value}")
+    try:
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise ValueError(f"Tempo inválido: {value}")
+    return seconds
+
+
+def parse_ranges(text: str) -> list:
+    """Parse ``HH:MM:SS-HH:MM:SS`` ranges (one per line or comma separated)."""
+    ranges = []
+    for chunk in re.split(r"[\n,;]+", text):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        start, sep, end = chunk.partition("-")
+        if not sep:
+            raise ValueError(f"Intervalo inválido: {chunk}")
+        start, end = _parse_clock(start), _parse_clock(end)
+        if start >= end:
+            raise ValueError(f"Intervalo inválido: {chunk}")
+        ranges.append((start, end))
+    return ranges
+
+
+def _clip_name(source_name: str, start: float, end: float) -> str:
+    stem = os.path.splitext(source_name)[0]
+    return os.path.join(_get_platform_dir("gpt"), f"clip_{stem}_{int(start)}-{int(end)}.mp4")
+
+
+def download_clips(
+    url: str,
+    ranges,
+    name_fn=None,
+    on_update=None,
+    cancel_event=None,
+    settings=None,
+    precise: bool = False,
+    policy=None,
+) -> list:
+    """Download only the ``(start, end)`` ranges of ``url`` (in seconds).
+
+    yt-dlp seeks in the remote stream with ffmpeg, so a 60 s clip of a
+    three hour VOD transfers about 60 s of media. ``name_fn(source_name,
+    start, end)`` returns the output path of each clip, where
+    ``source_name`` is ``"<title>.mp4"``. Like ``cut_video`` the clip
+    starts on the keyframe before ``start``; ``precise`` re-encodes
+    around the cut points instead.
+
+    Returns one dict per range with ``start``, ``end``, ``output``,
+    ``ok`` and ``error``, like ``video_cut_utils.cut_many``.
+    ``on_update(index, item)`` also receives ``percent`` updates.
+    """
+    import yt_dlp
+
+    platform = detect_platform(url)
+    if platform not in ("youtube", "tiktok"):
+        raise DownloadError("Corte por URL disponível apenas para YouTube e TikTok")
+    name_fn = name_fn or _clip_name
+    base = {
+        "format": BEST,
+        "merge_output_format": "mp4",
+        "quiet": True,
+        "no_warnings": True,
+        "logger": MyLogger(),
+    }
+    base.update(ytdlp_options(settings))
+    if platform == "tiktok":
+        base.update(_tiktok_cookie_opts())
+
+    with _semaphores[platform]:
+        info = metadata_cache.get_info(url, base)
+        base["format"] = select_format(info.get("formats") or [], policy)
+        source_name = yt_dlp.utils.sanitize_filename(info.get("title") or info["id"]) + ".mp4"
+
+        results = []
+        for index, (start, end) in enumerate(ranges):
+            item = {"start": start, "end": end, "output": name_fn(source_name, start, end),
+                    "ok": False, "error": None, "percent": 0.0}
+            results.append(item)
+
+            def on_progress(percent, index=index, item=item):
+                item["percent"] = percent
+                if on_update is not None:
+                    on_update(index, item)
+
+            if cancel_event is not None and cancel_event.is_set():
+                item["error"] = "Download cancelado"
+                continue
+            opts = dict(base)
+            opts.update(
+                {
+                    "outtmpl": os.path.splitext(item["output"])[0] + ".%(ext)s",
+                    "download_ranges": yt_dlp.utils.download_range_func(None, [(start, end)]),
+                    "force_keyframes_at_cuts": precise,
+                    "progress_hooks": _progress_hooks(
+                        on_progress, cancel_event, key=f"{url}#{index}"
+                    ),
+                    "postprocessors": [{"key": "FFmpegVideoRemuxer", "preferedformat": "mp4"}],
+                }
+            )
+            try:
+                with yt_dlp.YoutubeDL(opts) as ydl:
+                    # Reuse the extracted info instead of querying the site again.
+                    result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+                    if not os.path.exists(item["output"]):
+                        item["output"] = _downloaded_path(ydl, result)
+            except Exception as exc:
+                if cancel_event is not None and cancel_event.is_set():
+                    item["error"] = "Download cancelado"
+                else:
+                    item["error"] = str(exc)
+            else:
+                item["ok"] = True
+                item["percent"] = 100.0
+            finally:
+                get_aggregator().finish(f"{url}#{index}")
+            if on_update is not None:
+                on_update(index, item)
+    return results
+
+
+def read_url_file(path: str) -> list:
+    """Return the URLs listed in ``path``, one per line (``#`` comments)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_urls(f.read())
+
+
+def parse_urls(text: str) -> list:
+    """Split ``text`` into URLs, skipping blank lines, comments and repeats."""
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and line not in urls:
+            urls.append(line)
+    return urls
+
+
+def download_batch(
+    urls, on_update=None, cancel_event=None, max_workers=None, use_index=True, settings=None,
+    policy=None,
+) -> list:
+    """Download ``urls`` in parallel and return one result dict per URL.
+
+    Each dict has ``url``, ``platform``, ``status`` (``pending``,
+    ``downloading``, ``done``, ``failed`` or ``cancelled``), ``percent``,
+    ``path``, ``error`` and ``cached`` (already in the download index).
+    ``on_update(index, item)`` is called from the worker threads every
+    time an item changes.
+    """
+    items = [
+        {
+            "url": url,
+            "platform": detect_platform(url),
+            "status": "pending",
+            "percent": 0.0,
+            "path": None,
+            "error": None,
+            "cached": False,
+        }
+        for url in urls
+    ]
+
+    def update(index, **changes):
+        items[index].update(changes)
+        if on_update is not None:
+            on_update(index, items[index])
+
+    def worker(index):
+        item = items[index]
+        if cancel_event is not None and cancel_event.is_set():
+            update(index, status="cancelled")
+            return
+        existing = download_index.lookup(item["url"]) if use_index else None
+        if existing is not None:
+            update(index, status="done", percent=100.0, path=existing, cached=True)
+            return
+        update(index, status="downloading")
+        try:
+            path = download(
+                item["url"],
+                on_progress=lambda p: update(index, percent=p),
+                cancel_event=cancel_event,
+                use_index=use_index,
+                settings=settings,
+                policy=policy,
+            )
+        except DownloadCancelled:
+            update(index, status="cancelled")
+        except Exception as exc:
+            update(index, status="failed", error=str(exc))
+        else:
+            update(index, status="done", percent=100.0, path=path)
+
+    if max_workers is None:
+        max_workers = sum(PLATFORM_LIMITS.values())
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(worker, range(len(items))))
+    return items
+
+
+def batch_percent(items) -> float:
+    """Return the overall completion of a batch (0-100)."""
+    if not items:
+        return 100.0
+    total = 0.0
+    for item in items:
+        if item["status"] in ("done", "failed", "cancelled"):
+            total += 100.0
+        else:
+            total += item["percent"] or 0.0
+    return total / len(items)
+
+
+def format_summary(items) -> str:
+    """Return a short report with the successes and failures of a batch."""
+    done = [i for i in items if i["status"] == "done"]
+    failed = [i for i in items if i["status"] == "failed"]
+    cancelled = [i for i in items if i["status"] == "cancelled"]
+    lines = [f"{len(done)} de {len(items)} download(s) concluídos"]
+    cached = sum(1 for i in done if i.get("cached"))
+    if cached:
+        lines.append(f"{cached} já estava(m) baixado(s)")
+    if cancelled:
+        lines.append(f"{len(cancelled)} cancelado(s)")
+    for item in failed:
+        lines.append(f"Falha: {item['url']}: {item['error']}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Baixa vídeos em lote sem abrir o app.")
+    parser.add_argument("urls", nargs="*", help="URLs dos vídeos")
+    parser.add_argument("-f", "--file", help="arquivo com uma URL por linha")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="downloads simultâneos no total")
+    parser.add_argument(
+        "--force", action="store_true", help="baixa de novo mesmo se a URL já estiver no índice"
+    )
+    parser.add_argument(
+        "--clip", action="append", metavar="INICIO-FIM",
+        help="baixa só este trecho (HH:MM:SS-HH:MM:SS); pode repetir",
+    )
+    parser.add_argument("--precise", action="store_true", help="reencoda as bordas do --clip")
+    parser.add_argument("--info", action="store_true", help="só mostra título, duração e formatos")
+    parser.add_argument(
+        "--format-policy", choices=sorted(POLICIES), default=None,
+        help="formato baixado conforme o destino (padrão: DOWNLOAD_FORMAT_POLICY ou archive)",
+    )
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.info:
+        return _info_main(args)
+    if args.clip:
+        return _clip_main(parser, args)
+
+    urls = list(args.urls)
+    if args.file:
+        urls.extend(u for u in read_url_file(args.file) if u not in urls)
+    if not urls:
+        parser.error("informe URLs ou --file")
+
+    lock = threading.Lock()
+    percents = [0.0] * len(urls)
+    last_print = [0.0]
+
+    def on_update(index, item):
+        with lock:
+            percents[index] = 100.0 if item["status"] != "downloading" else item["percent"] or 0.0
+            if item["status"] != "downloading":
+                print(f"[{index + 1}/{len(urls)}] {item['status']}: {item['url']}", flush=True)
+            elif time.monotonic() - last_print[0] >= 2:
+                last_print[0] = time.monotonic()
+                print(f"Total: {sum(percents) / len(urls):.0f}%", flush=True)
+
+    items = download_batch(
+        urls,
+        on_update=on_update,
+        max_workers=args.jobs,
+        use_index=not args.force,
+        settings=settings_from_args(args),
+        policy=args.format_policy,
+    )
+    print(format_summary(items))
+    return 0 if all(i["status"] == "done" for i in items) else 1
+
+
+def _info_main(args) -> int:
+    status = 0
+    for url in args.urls:
+        try:
+            info = fetch_info(url)
+        except Exception as exc:
+            print(f"{url}: {exc}")
+            status = 1
+            continue
+        meta = metadata_cache.summary(info)
+        duration = meta["duration"]
+        print(meta["title"])
+        if duration:
+            print(f"  duração: {int(duration) // 3600:02d}:{int(duration) % 3600 // 60:02d}:{int(duration) % 60:02d}")
+        print(f"  resoluções: {', '.join(f'{h}p' for h in meta['heights'])}")
+        print(f"  formato escolhido: {select_format(info.get('formats') or [], args.format_policy)}")
+        if meta["thumbnail"]:
+            print(f"  miniatura: {meta['thumbnail']}")
+    return status
+
+
+def _clip_main(parser, args) -> int:
+    if len(args.urls) != 1:
+        parser.error("--clip exige exatamente uma URL")
+    try:
+        ranges = parse_ranges(",".join(args.clip))
+    except ValueError as exc:
+        parser.error(str(exc))
+    results = download_clips(
+        args.urls[0],
+        ranges,
+        settings=settings_from_args(args),
+        precise=args.precise,
+        policy=args.format_policy,
+    )
+    for r in results:
+        status = r["output"] if r["ok"] else f"falhou: {r['error']}"
+        print(f"{r['start']:.0f}-{r['end']:.0f}s: {status}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
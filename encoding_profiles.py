@@ -0,0 +1,235 @@
+"""Named encoding profiles shared by every re-encoding path.
+
+``draft`` is meant for quick checks, ``social`` for clips posted to
+TikTok/Instagram/YouTube and ``archive`` for masters. The default comes
+from ``VIDEO_PROFILE`` (``social`` if unset).
+
+The encoder is picked from what the installed ffmpeg reports in
+``ffmpeg -encoders``. With ``VIDEO_HWACCEL`` set, a hardware H.264 encoder
+is preferred when one is available, otherwise ``libx264`` is used.
+
+``python encoding_profiles.py calibrate <video>`` measures encode fps and
+output size of each profile on this machine.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache
+
+from media_cache import cache_dir
+
+PROFILES = {
+    "draft": {
+        "preset": "veryfast",
+        "crf": 28,
+        "nvenc_preset": "p1",
+        "vt_quality": 45,
+        "audio_bitrate": "96k",
+    },
+    "social": {
+        "preset": "medium",
+        "crf": 21,
+        "nvenc_preset": "p4",
+        "vt_quality": 60,
+        "audio_bitrate": "128k",
+    },
+    "archive": {
+        "preset": "veryslow",
+        "crf": 18,
+        "nvenc_preset": "p7",
+        "vt_quality": 75,
+        "audio_bitrate": "192k",
+    },
+}
+
+# Candidate encoders per codec, in order of preference.
+HW_ENCODERS = {
+    "h264": ["h264_nvenc", "h264_qsv", "h264_videotoolbox"],
+    "hevc": ["hevc_nvenc", "hevc_qsv", "hevc_videotoolbox"],
+}
+SW_ENCODERS = {
+    "h264": ["libx264", "libopenh264"],
+    "hevc": ["libx265"],
+}
+
+
+def default_profile() -> str:
+    """Return the profile configured in ``VIDEO_PROFILE``."""
+    name = os.getenv("VIDEO_PROFILE", "social")
+    return name if name in PROFILES else "social"
+
+
+def get_profile(name: str = None) -> dict:
+    """Return the settings of profile ``name`` (default profile if ``None``)."""
+    name = name or default_profile()
+    if name not in PROFILES:
+        raise ValueError(f"Perfil de codificação desconhecido: {name}")
+    return PROFILES[name]
+
+
+@lru_cache(maxsize=None)
+def available_encoders() -> frozenset:
+    """Return the encoder names supported by the installed ffmpeg."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    names = set()
+    started = False
+    for line in result.stdout.splitlines():
+        if line.strip().startswith("------"):
+            started = True
+            continue
+        parts = line.split()
+        if started and len(parts) >= 2:
+            names.add(parts[1])
+    return frozenset(names)
+
+
+def select_encoder(codec: str = "h264", hwaccel: bool = None) -> str:
+    """Return the best available encoder for ``codec``.
+
+    Hardware encoders are considered only when ``hwaccel`` is true (by
+    default, when ``VIDEO_HWACCEL`` is set).
+    """
+    if hwaccel is None:
+        hwaccel = bool(os.getenv("VIDEO_HWACCEL"))
+    candidates = list(SW_ENCODERS.get(codec, []))
+    if hwaccel:
+        candidates = HW_ENCODERS.get(codec, []) + candidates
+    if not candidates:
+        raise ValueError(f"Codec sem encoder conhecido: {codec}")
+    supported = available_encoders()
+    if not supported:
+        # ffmpeg não pôde ser consultado; usa o encoder de software padrão.
+        return SW_ENCODERS[codec][0]
+    for encoder in candidates:
+        if encoder in supported:
+            return encoder
+    raise RuntimeError(f"Nenhum encoder {codec} disponível no ffmpeg instalado")
+
+
+def _quality_args(encoder: str, settings: dict) -> list:
+    """Encoder specific options implementing the profile's quality target."""
+    if encoder.endswith("_nvenc"):
+        return ["-preset", settings["nvenc_preset"], "-rc", "vbr", "-cq", str(settings["crf"]), "-b:v", "0"]
+    if encoder.endswith("_qsv"):
+        return ["-preset", settings["preset"], "-global_quality", str(settings["crf"])]
+    if encoder.endswith("_videotoolbox"):
+        return ["-q:v", str(settings["vt_quality"])]
+    if encoder == "libopenh264":
+        return []
+    return ["-preset", settings["preset"], "-crf", str(settings["crf"])]
+
+
+def video_args(profile: str = None, codec: str = "h264", hwaccel: bool = None) -> list:
+    """Return ffmpeg ``-c:v`` and quality arguments for ``profile``."""
+    settings = get_profile(profile)
+    encoder = select_encoder(codec, hwaccel)
+    return ["-c:v", encoder] + _quality_args(encoder, settings)
+
+
+def audio_args(profile: str = None) -> list:
+    """Return ffmpeg AAC arguments for ``profile``."""
+    return ["-c:a", "aac", "-b:a", get_profile(profile)["audio_bitrate"]]
+
+
+def moviepy_kwargs(profile: str = None) -> dict:
+    """Return ``write_videofile`` keyword arguments for ``profile``."""
+    settings = get_profile(profile)
+    encoder = select_encoder()
+    params = _quality_args(encoder, settings)
+    preset = settings["preset"]
+    if "-preset" in params:
+        idx = params.index("-preset")
+        preset = params[idx + 1]
+        params = params[:idx] + params[idx + 2:]
+    return {
+        "codec": encoder,
+        "preset": preset,
+        "ffmpeg_params": params,
+        "audio_codec": "aac",
+        "audio_bitrate": settings["audio_bitrate"],
+    }
+
+
+def calibrate(sample: str, seconds: float = 20, profiles=None) -> dict:
+    """Encode ``seconds`` of ``sample`` with each profile and record the results.
+
+    Results (encoder, encode fps, realtime speed and output size per
+    profile) are stored in ``.cache/encoding/calibration.json``.
+    """
+    from media_probe import probe
+
+    info = probe(sample)
+    length = min(seconds, info.duration) if info.duration else seconds
+    frames = length * info.fps if info.fps else 0
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in profiles or PROFILES:
+            output = os.path.join(tmp, f"{name}.mp4")
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-v", "error",
+                "-i", sample,
+                "-t", str(length),
+            ] + video_args(name) + audio_args(name) + [output]
+            started = time.perf_counter()
+            subprocess.run(cmd, check=True)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                "encoder": select_encoder(),
+                "seconds": round(elapsed, 2),
+                "fps": round(frames / elapsed, 1) if frames else None,
+                "speed": round(length / elapsed, 2),
+                "size_bytes": os.path.getsize(output),
+            }
+
+    report = {
+        "machine": platform.node(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "sample": os.path.abspath(sample),
+        "sample_seconds": length,
+        "profiles": results,
+    }
+    with open(cache_dir("encoding") / "calibration.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfis de codificação de vídeo")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="mostra os perfis e o encoder selecionado")
+    cal = sub.add_parser("calibrate", help="mede fps e tamanho de cada perfil")
+    cal.add_argument("sample", help="vídeo usado na medição")
+    cal.add_argument("--seconds", type=float, default=20, help="trecho codificado (s)")
+    cal.add_argument("--profile", action="append", choices=sorted(PROFILES), help="perfil a medir")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print(f"encoder: {select_encoder()} (padrão: {default_profile()})")
+        for name in PROFILES:
+            print(f"{name:8} {' '.join(video_args(name)[2:])}")
+        return
+    report = calibrate(args.sample, args.seconds, args.profile)
+    print(f"{'perfil':8} {'encoder':18} {'fps':>8} {'speed':>7} {'MB':>8}")
+    for name, row in report["profiles"].items():
+        fps = "-" if row["fps"] is None else f"{row['fps']:.1f}"
+        size = row["size_bytes"] / 1_000_000
+        print(f"{name:8} {row['encoder']:18} {fps:>8} {row['speed']:>6.2f}x {size:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
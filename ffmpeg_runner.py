@@ -0,0 +1,123 @@
+"""Run ffmpeg with live progress, throughput reporting and cancellation.
+
+``run_ffmpeg`` adds ``-progress pipe:1`` to the command and parses the
+key/value blocks ffmpeg writes there. Each block is turned into a dict
+passed to ``on_progress``:
+
+``percent``  completion (0-100), or ``None`` without a known duration
+``fps``      encode frames per second
+``speed``    multiple of real time (``1.0`` means as fast as playback)
+``eta``      estimated seconds left, or ``None``
+``out_time`` seconds of output written so far
+
+Setting ``cancel_event`` (a ``threading.Event``) terminates ffmpeg and
+raises ``FFmpegCancelled``.
+"""
+import subprocess
+import threading
+from collections import deque
+
+
+class FFmpegCancelled(Exception):
+    """Raised when an ffmpeg run is cancelled through its cancel event."""
+
+
+def _parse_float(value):
+    try:
+        return float(str(value).rstrip("x"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _progress_info(block: dict, duration: float = None) -> dict:
+    out_time = None
+    if block.get("out_time_us", "N/A") != "N/A":
+        out_time = int(block["out_time_us"]) / 1_000_000
+    elif block.get("out_time_ms", "N/A") != "N/A":
+        # Apesar do nome, ffmpeg informa out_time_ms em microssegundos.
+        out_time = int(block["out_time_ms"]) / 1_000_000
+    fps = _parse_float(block.get("fps"))
+    speed = _parse_float(block.get("speed"))
+    percent = None
+    eta = None
+    if duration and out_time is not None:
+        percent = max(0.0, min(100.0, out_time / duration * 100))
+        if speed:
+            eta = max(0.0, (duration - out_time) / speed)
+    if block.get("progress") == "end":
+        percent = 100.0
+        eta = 0.0
+    return {
+        "percent": percent,
+        "fps": fps,
+        "speed": speed,
+        "eta": eta,
+        "out_time": out_time,
+    }
+
+
+def format_progress(info: dict) -> str:
+    """Return a short status line such as ``42% · 95 fps · 1.8x · ETA 00:01:12``."""
+    parts = []
+    if info.get("percent") is not None:
+        parts.append(f"{info['percent']:.0f}%")
+    if info.get("fps"):
+        parts.append(f"{info['fps']:.0f} fps")
+    if info.get("speed") is not None:
+        parts.append(f"{info['speed']:.2f}x")
+    if info.get("eta") is not None:
+        total = int(info["eta"])
+        parts.append(f"ETA {total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}")
+    return " · ".join(parts)
+
+
+def run_ffmpeg(cmd: list, duration: float = None, on_progress=None, cancel_event=None):
+    """Run the ffmpeg command ``cmd`` reporting progress.
+
+    Behaves like ``subprocess.run(cmd, check=True)``: a non-zero exit
+    raises ``CalledProcessError`` (with the tail of stderr in ``stderr``).
+    Returns a ``CompletedProcess`` whose ``stderr`` holds that tail.
+    """
+    full_cmd = [cmd[0], "-nostdin", "-progress", "pipe:1", "-nostats"] + list(cmd[1:])
+    proc = subprocess.Popen(
+        full_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+
+    stderr_tail = deque(maxlen=200)
+    reader = threading.Thread(target=lambda: stderr_tail.extend(proc.stderr), daemon=True)
+    reader.start()
+
+    cancelled = threading.Event()
+    if cancel_event is not None:
+        def watch():
+            while proc.poll() is None:
+                if cancel_event.wait(0.2):
+                    cancelled.set()
+                    proc.terminate()
+                    return
+
+        threading.Thread(target=watch, daemon=True).start()
+
+    block = {}
+    for line in proc.stdout:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        block[key] = value
+        if key == "progress":
+            if on_progress is not None:
+                on_progress(_progress_info(block, duration))
+            block = {}
+
+    returncode = proc.wait()
+    reader.join()
+    stderr = "".join(stderr_tail)
+    if cancelled.is_set():
+        raise FFmpegCancelled("Operação cancelada")
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, full_cmd, stderr=stderr)
+    return subprocess.CompletedProcess(full_cmd, returncode, stderr=stderr)
@@ -0,0 +1,107 @@
+"""Format selection policies for yt-dlp downloads.
+
+A policy names the output the download is meant for and picks the
+smallest stream that still covers it, instead of always fetching
+``bestvideo+bestaudio`` (often 4K VP9 plus a separate audio track):
+
+``vertical-short``  TikTok/Reels/Shorts cuts (720x1280) and 1280x720
+                    YouTube cuts: shorter side of at least 720 px
+``stories``         Instagram Stories (1080x1920): shorter side >= 1080
+``archive``         the best available streams (previous behaviour)
+
+Within a policy, formats that already contain H.264 video and AAC audio
+are preferred, since ``cut_video`` can stream-copy them and yt-dlp does
+not need to merge anything. Next come H.264 video plus M4A audio, which
+merge into MP4 by remuxing alone. The default policy comes from
+``DOWNLOAD_FORMAT_POLICY`` (``archive`` if unset).
+"""
+import os
+
+POLICIES = {
+    "vertical-short": {"min_side": 720},
+    "stories": {"min_side": 1080},
+    "archive": {"min_side": None},
+}
+
+# yt-dlp selector used by ``archive`` and whenever no format reaches the target.
+BEST = "bestvideo+bestaudio/best"
+
+_H264 = ("avc1", "h264")
+_AAC = ("mp4a", "aac")
+
+
+def default_policy() -> str:
+    """Return the policy configured in ``DOWNLOAD_FORMAT_POLICY``."""
+    name = os.getenv("DOWNLOAD_FORMAT_POLICY", "archive")
+    return name if name in POLICIES else "archive"
+
+
+def get_policy(name: str = None) -> dict:
+    """Return the settings of policy ``name`` (default policy if ``None``)."""
+    name = name or default_policy()
+    if name not in POLICIES:
+        raise ValueError(f"Política de formato desconhecida: {name}")
+    return POLICIES[name]
+
+
+def _has_video(f: dict) -> bool:
+    return f.get("vcodec") not in (None, "none") and bool(f.get("width")) and bool(f.get("height"))
+
+
+def _has_audio(f: dict) -> bool:
+    return f.get("acodec") not in (None, "none")
+
+
+def _is(codec, prefixes) -> bool:
+    return bool(codec) and codec.lower().startswith(prefixes)
+
+
+def _size(f: dict) -> float:
+    """Return the (estimated) size used to rank formats."""
+    return f.get("filesize") or f.get("filesize_approx") or f.get("tbr") or float("inf")
+
+
+def _smallest(formats):
+    return min(formats, key=lambda f: (min(f["width"], f["height"]), _size(f)), default=None)
+
+
+def _best_audio(formats, prefer_aac: bool):
+    audio = [f for f in formats if _has_audio(f) and f.get("vcodec") == "none"]
+    if prefer_aac:
+        audio = [f for f in audio if _is(f.get("acodec"), _AAC)] or audio
+    return max(audio, key=lambda f: f.get("abr") or f.get("tbr") or 0, default=None)
+
+
+def select_format(formats, policy: str = None) -> str:
+    """Return the yt-dlp format spec to download for ``policy``.
+
+    ``formats`` is the ``formats`` list of a yt-dlp info dict.
+    """
+    min_side = get_policy(policy)["min_side"]
+    if min_side is None or not formats:
+        return BEST
+
+    video = [
+        f for f in formats if _has_video(f) and min(f["width"], f["height"]) >= min_side
+    ]
+    muxed_h264 = [
+        f for f in video
+        if _has_audio(f) and _is(f.get("vcodec"), _H264) and _is(f.get("acodec"), _AAC)
+    ]
+    choice = _smallest(muxed_h264)
+    if choice is not None:
+        return choice["format_id"]
+
+    video_only = [f for f in video if not _has_audio(f)]
+    h264 = [f for f in video_only if _is(f.get("vcodec"), _H264)]
+    for candidates, prefer_aac in ((h264, True), (video_only, False)):
+        choice = _smallest(candidates)
+        audio = _best_audio(formats, prefer_aac)
+        if choice is not None and audio is not None:
+            return f"{choice['format_id']}+{audio['format_id']}"
+
+    choice = _smallest([f for f in video if _has_audio(f)])
+    if choice is not None:
+        return choice["format_id"]
+    # Nothing reaches the target: take the best the site has.
+    return BEST
@@ -0,0 +1,199 @@
+"""Shared, lean Instaloader session for Instagram downloads.
+
+One ``Instaloader`` is created for the whole process and reused, so the
+session (cookies, rate controller) survives between downloads. Only the
+video stream of a post is fetched; metadata JSON, comments, thumbnails
+and pictures are skipped.
+
+With ``INSTAGRAM_USER`` set, the session saved by
+``python instagram_loader.py login`` (``.cache/instagram/session-<user>``)
+is loaded; otherwise the loader stays anonymous. Consecutive posts are
+spaced by at least ``INSTAGRAM_MIN_INTERVAL`` seconds (default 2).
+``instaloader`` is imported when the first loader is created.
+"""
+import argparse
+import getpass
+import glob
+import os
+import sys
+import threading
+import time
+
+from media_cache import cache_dir
+
+DEFAULT_MIN_INTERVAL = 2.0
+
+_loader = None
+_loader_lock = threading.Lock()
+_rate_lock = threading.Lock()
+# Instaloader's context is not thread safe; posts are fetched one at a time.
+_session_lock = threading.Lock()
+_last_request = 0.0
+
+
+class InstagramError(Exception):
+    """Raised with a user facing message when a post cannot be fetched."""
+
+
+def _session_file(user: str) -> str:
+    return str(cache_dir("instagram") / f"session-{user}")
+
+
+def _new_loader():
+    import instaloader
+
+    return instaloader.Instaloader(
+        quiet=True,
+        download_pictures=False,
+        download_videos=True,
+        download_video_thumbnails=False,
+        download_geotags=False,
+        download_comments=False,
+        save_metadata=False,
+        compress_json=False,
+        post_metadata_txt_pattern="",
+        max_connection_attempts=3,
+    )
+
+
+def get_loader():
+    """Return the process wide ``Instaloader``, loading a saved session once."""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            loader = _new_loader()
+            user = os.getenv("INSTAGRAM_USER")
+            if user and os.path.exists(_session_file(user)):
+                try:
+                    loader.load_session_from_file(user, _session_file(user))
+                except Exception as exc:
+                    print("Sessão do Instagram ignorada:", exc)
+            _loader = loader
+        return _loader
+
+
+def login(user: str, password: str) -> str:
+    """Log in, save the session file and make it the shared session."""
+    global _loader
+    loader = _new_loader()
+    loader.login(user, password)
+    path = _session_file(user)
+    loader.save_session_to_file(path)
+    with _loader_lock:
+        _loader = loader
+    return path
+
+
+def _min_interval() -> float:
+    try:
+        return float(os.getenv("INSTAGRAM_MIN_INTERVAL", DEFAULT_MIN_INTERVAL))
+    except ValueError:
+        return DEFAULT_MIN_INTERVAL
+
+
+def _wait_turn() -> None:
+    """Block until ``INSTAGRAM_MIN_INTERVAL`` passed since the last post."""
+    global _last_request
+    with _rate_lock:
+        delay = _last_request + _min_interval() - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _last_request = time.monotonic()
+
+
+def download_video(shortcode: str, target_dir: str) -> list:
+    """Save the video(s) of post ``shortcode`` in ``target_dir``.
+
+    Files are named ``<shortcode>.<ext>`` (``<shortcode>_<n>.<ext>`` for
+    the extra videos of a carousel, usually ``.mp4``). Only video posts
+    and carousel items are saved. Returns the saved paths; raises
+    ``InstagramError`` if the post has no video or cannot be read.
+    """
+    loader = get_loader()
+    with _session_lock:
+        _wait_turn()
+        return _download_video(loader, shortcode, target_dir)
+
+
+def _download_video(loader, shortcode: str, target_dir: str) -> list:
+    import instaloader
+
+    try:
+        post = instaloader.Post.from_shortcode(loader.context, shortcode)
+        if post.typename == "GraphSidecar":
+            urls = [node.video_url for node in post.get_sidecar_nodes() if node.is_video]
+        elif post.is_video:
+            urls = [post.video_url]
+        else:
+            urls = []
+    except Exception as exc:
+        raise InstagramError(f"Falha no download: {exc}") from exc
+    if not urls:
+        raise InstagramError("A publicação não contém vídeo")
+
+    paths = []
+    for index, url in enumerate(urls, start=1):
+        name = shortcode if index == 1 else f"{shortcode}_{index}"
+        filename = os.path.join(target_dir, name)
+        try:
+            loader.download_pic(filename, url, post.date_utc)
+        except Exception as exc:
+            raise InstagramError(f"Falha no download: {exc}") from exc
+        # download_pic appends the extension taken from the URL, which is
+        # not always ``.mp4``; report the file it actually wrote.
+        written = sorted(glob.glob(glob.escape(filename) + ".*"), key=os.path.getmtime)
+        if not written:
+            raise InstagramError(f"Falha no download: {name} não foi salvo")
+        paths.append(written[-1])
+    return paths
+
+
+def download_shortcodes(shortcodes, target_dir: str, on_update=None, cancel_event=None) -> list:
+    """Download many posts with the shared session, one at a time.
+
+    Returns ``{"shortcode", "ok", "paths", "error"}`` per shortcode;
+    ``on_update(index, item)`` is called after each one.
+    """
+    results = []
+    for index, shortcode in enumerate(shortcodes):
+        item = {"shortcode": shortcode, "ok": False, "paths": [], "error": None}
+        if cancel_event is not None and cancel_event.is_set():
+            item["error"] = "Download cancelado"
+        else:
+            try:
+                item["paths"] = download_video(shortcode, target_dir)
+                item["ok"] = True
+            except InstagramError as exc:
+                item["error"] = str(exc)
+        results.append(item)
+        if on_update is not None:
+            on_update(index, item)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Downloads do Instagram com sessão reaproveitada")
+    sub = parser.add_subparsers(dest="command", required=True)
+    log = sub.add_parser("login", help="entra na conta e salva a sessão")
+    log.add_argument("user", nargs="?", default=os.getenv("INSTAGRAM_USER"))
+    get = sub.add_parser("download", help="baixa só o vídeo das publicações")
+    get.add_argument("shortcodes", nargs="+")
+    get.add_argument("-o", "--output", default=".", help="pasta de destino")
+    args = parser.parse_args(argv)
+
+    if args.command == "login":
+        if not args.user:
+            parser.error("informe o usuário ou defina INSTAGRAM_USER")
+        password = os.getenv("INSTAGRAM_PASSWORD") or getpass.getpass("Senha: ")
+        print("Sessão salva em", login(args.user, password))
+        return 0
+
+    os.makedirs(args.output, exist_ok=True)
+    results = download_shortcodes(args.shortcodes, args.output)
+    for item in results:
+        print(f"{item['shortcode']}: {', '.join(item['paths']) if item['ok'] else item['error']}")
+    return 0 if all(item["ok"] for item in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
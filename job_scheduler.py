@@ -0,0 +1,314 @@
+"""Bounded background job scheduler.
+
+Long running work (downloads, ffmpeg encodes, transcription, uploads) is
+submitted to a named pool instead of starting a thread per click. Each
+pool runs at most a fixed number of jobs at once; the rest wait in a
+priority queue. Pool sizes default to ``POOL_SIZES`` and can be changed
+with ``JOBS_<POOL>`` environment variables (e.g. ``JOBS_ENCODE=2``).
+
+Every ``Job`` carries a ``cancel_event`` that the job function passes on
+to ``run_ffmpeg``/``cut_video``. Job functions can call
+``report_progress`` from their worker thread; observers registered with
+``JobScheduler.subscribe`` are notified on every state or progress change
+(from the worker thread, so UI code must marshal to its own thread).
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+
+# Maximum number of jobs running at once in each pool.
+POOL_SIZES = {
+    "metadata": 2,
+    "download": 3,
+    "encode": 1,
+    "transcribe": 1,
+    "upload": 2,
+    "api": 2,
+}
+
+PRIORITY_LOW = -10
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# Finished jobs kept for the jobs screen.
+HISTORY_SIZE = 100
+
+_local = threading.local()
+
+
+class Job:
+    """A unit of work queued in one of the scheduler pools."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, scheduler, pool, fn, args, name, priority, cancel_event, on_cancelled):
+        self.id = next(self._ids)
+        self.pool = pool
+        self.name = name or getattr(fn, "__name__", "job")
+        self.priority = priority
+        self.cancel_event = cancel_event or threading.Event()
+        self.state = QUEUED
+        self.progress = None
+        self.status = ""
+        self.error = None
+        self.result = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._fn = fn
+        self._args = args
+        self._on_cancelled = on_cancelled
+        self._scheduler = scheduler
+        self._finished = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.state not in FINISHED_STATES
+
+    def cancel(self) -> bool:
+        """Request cancellation.
+
+        A queued job is dropped immediately and ``True`` is returned. A
+        running job only has its ``cancel_event`` set; it stops when the
+        job function notices it.
+        """
+        self.cancel_event.set()
+        return self._scheduler._drop_queued(self)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job finishes; return ``False`` on timeout."""
+        return self._finished.wait(timeout)
+
+    def report(self, percent=None, status=None) -> None:
+        """Update the progress shown for this job and notify observers."""
+        if percent is not None:
+            self.progress = max(0.0, min(100.0, float(percent)))
+        if status is not None:
+            self.status = status
+        self._scheduler._notify(self)
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.pool}:{self.name} {self.state}>"
+
+
+class _Pool:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = max(1, size)
+        self.queue = []
+        self.workers = []
+        self.running = 0
+
+
+class JobScheduler:
+    """Run jobs in bounded, prioritised pools."""
+
+    def __init__(self, sizes=None):
+        sizes = dict(POOL_SIZES if sizes is None else sizes)
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._pools = {name: _Pool(name, size) for name, size in sizes.items()}
+        self._order = itertools.count()
+        self._jobs = []
+        self._subscribers = []
+
+    # Submission --------------------------------------------------------
+    def submit(
+        self,
+        pool: str,
+        fn,
+        *args,
+        name: str = None,
+        priority: int = PRIORITY_NORMAL,
+        cancel_event: threading.Event = None,
+        on_cancelled=None,
+    ) -> Job:
+        """Queue ``fn(*args)`` in ``pool`` and return its ``Job``.
+
+        Higher ``priority`` runs first; equal priorities run in submission
+        order. ``on_cancelled(job)`` is called when the job is cancelled
+        before it starts, so the caller can undo any UI it opened.
+        """
+        if pool not in self._pools:
+            raise ValueError(f"Unknown pool: {pool}")
+        job = Job(self, pool, fn, args, name, priority, cancel_event, on_cancelled)
+        with self._cond:
+            p = self._pools[pool]
+            ahead = sum(
+                1 for _, _, other in p.queue if other.state == QUEUED and other.priority >= priority
+            )
+            job.status = f"Na fila ({ahead} à frente)" if ahead else "Na fila"
+            heapq.heappush(p.queue, (-priority, next(self._order), job))
+            self._jobs.append(job)
+            self._prune()
+            waiting = sum(1 for _, _, queued in p.queue if queued.state == QUEUED)
+            idle = len(p.workers) - p.running
+            if len(p.workers) < p.size and idle < waiting:
+                worker = threading.Thread(
+                    target=self._worker, args=(p,), name=f"jobs-{pool}", daemon=True
+                )
+                p.workers.append(worker)
+                worker.start()
+            self._cond.notify_all()
+        self._notify(job)
+        return job
+
+    def jobs(self) -> list:
+        """Return a snapshot of known jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs)
+
+    def clear_finished(self) -> None:
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job.active]
+        self._notify(None)
+
+    def pool_sizes(self) -> dict:
+        return {name: p.size for name, p in self._pools.items()}
+
+    # Observers ---------------------------------------------------------
+    def subscribe(self, callback) -> None:
+        """Call ``callback(job)`` whenever a job changes."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self, job) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(job)
+            except Exception:
+                logging.exception("Job observer failed")
+
+    # Internals ---------------------------------------------------------
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs if not job.active]
+        extra = len(finished) - HISTORY_SIZE
+        if extra > 0:
+            drop = set(id(job) for job in finished[:extra])
+            self._jobs = [job for job in self._jobs if id(job) not in drop]
+
+    def _drop_queued(self, job) -> bool:
+        with self._cond:
+            if job.state != QUEUED:
+                return False
+            job.state = CANCELLED
+            job.status = "Cancelado"
+            job.finished = time.time()
+            job._finished.set()
+            self._cond.notify_all()
+        self._notify(job)
+        if job._on_cancelled is not None:
+            job._on_cancelled(job)
+        return True
+
+    def _worker(self, pool: _Pool) -> None:
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    while not pool.queue:
+                        self._cond.wait()
+                    _, _, candidate = heapq.heappop(pool.queue)
+                    # Jobs cancelled while queued stay in the heap until popped.
+                    if candidate.state == QUEUED:
+                        job = candidate
+                if job.cancel_event.is_set():
+                    job.state = CANCELLED
+                    job.status = "Cancelado"
+                    job.finished = time.time()
+                    job._finished.set()
+                else:
+                    job.state = RUNNING
+                    job.status = ""
+                    job.started = time.time()
+                    pool.running += 1
+            self._notify(job)
+            if job.state == CANCELLED:
+                if job._on_cancelled is not None:
+                    job._on_cancelled(job)
+                continue
+            self._run(job)
+            with self._cond:
+                pool.running -= 1
+
+    def _run(self, job: Job) -> None:
+        _local.job = job
+        try:
+            job.result = job._fn(*job._args)
+        except Exception as exc:
+            if job.cancel_event.is_set():
+                job.state = CANCELLED
+                job.status = "Cancelado"
+            else:
+                logging.exception("Job %s failed", job.name)
+                job.state = FAILED
+                job.error = str(exc)
+                job.status = str(exc)
+        else:
+            if job.cancel_event.is_set():
+                job.state = CANCELLED
+                job.status = "Cancelado"
+            else:
+                job.state = DONE
+                job.progress = 100.0
+                job.status = ""
+        finally:
+            _local.job = None
+            job.finished = time.time()
+            job._finished.set()
+        self._notify(job)
+
+
+def current_job():
+    """Return the ``Job`` running in this thread, or ``None``."""
+    return getattr(_local, "job", None)
+
+
+def report_progress(percent=None, status=None) -> None:
+    """Report progress for the job running in this thread, if any."""
+    job = current_job()
+    if job is not None:
+        job.report(percent, status)
+
+
+def _configured_sizes() -> dict:
+    sizes = dict(POOL_SIZES)
+    for name in sizes:
+        value = os.getenv(f"JOBS_{name.upper()}")
+        if value:
+            try:
+                sizes[name] = max(1, int(value))
+            except ValueError:
+                logging.warning("Invalid JOBS_%s=%r ignored", name.upper(), value)
+    return sizes
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """Return the process wide scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler(_configured_sizes())
+        return _scheduler
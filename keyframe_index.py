@@ -0,0 +1,117 @@
+"""Keyframe index built once per source file.
+
+Stream-copy cuts (``cut_video``/``cut_many``) can only start on a
+keyframe. The keyframe timestamps of the first video stream are read once
+with ffprobe and stored as a compact ``float64`` array sidecar in
+``.cache/keyframes``, so later lookups never probe the file again.
+"""
+import bisect
+import os
+import subprocess
+import threading
+from array import array
+from typing import Optional
+
+from media_cache import cache_dir, file_key
+
+# Tolerance used when comparing user supplied times to keyframe timestamps.
+EPSILON = 0.001
+
+_memory = {}
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _probe_keyframes(path: str) -> array:
+    """Read keyframe timestamps from the packet flags of ``path``."""
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            times.append(float(pts))
+    return array("d", sorted(times))
+
+
+def _sidecar(key: str):
+    return cache_dir("keyframes") / f"{key}.f64"
+
+
+def load_keyframes(path: str, build: bool = True) -> Optional[array]:
+    """Return the sorted keyframe timestamps (seconds) of ``path``.
+
+    The index is looked up in memory, then in the sidecar file. When
+    neither exists it is built with ffprobe, unless ``build`` is false, in
+    which case ``None`` is returned. Use ``build=False`` from the UI thread.
+    """
+    key = file_key(path)
+    if key in _memory:
+        return _memory[key]
+
+    sidecar = _sidecar(key)
+    if sidecar.exists():
+        times = array("d")
+        with open(sidecar, "rb") as f:
+            times.frombytes(f.read())
+        _memory[key] = times
+        return times
+    if not build:
+        return None
+
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        if key in _memory:
+            return _memory[key]
+        times = _probe_keyframes(path)
+        tmp = sidecar.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            times.tofile(f)
+        os.replace(tmp, sidecar)
+        _memory[key] = times
+    return times
+
+
+def build_index_async(path: str, callback=None) -> threading.Thread:
+    """Build the index of ``path`` in a background thread.
+
+    ``callback`` is called from that thread with the timestamps, or with
+    ``None`` if probing failed.
+    """
+    def run():
+        try:
+            times = load_keyframes(path)
+        except Exception:
+            times = None
+        if callback is not None:
+            callback(times)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def keyframe_before(path: str, t: float, build: bool = True) -> Optional[float]:
+    """Return the last keyframe at or before ``t`` (where a copy cut starts)."""
+    times = load_keyframes(path, build)
+    if not times:
+        return None
+    idx = bisect.bisect_right(times, t + EPSILON)
+    return times[idx - 1] if idx else times[0]
+
+
+def keyframe_after(path: str, t: float, build: bool = True) -> Optional[float]:
+    """Return the first keyframe at or after ``t``, or ``None`` past the last one."""
+    times = load_keyframes(path, build)
+    if not times:
+        return None
+    idx = bisect.bisect_left(times, t - EPSILON)
+    return times[idx] if idx < len(times) else None
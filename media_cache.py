@@ -0,0 +1,45 @@
+"""Helpers shared by the on-disk caches kept under ``.cache``.
+
+Cache entries derived from a media file are keyed by the file's absolute
+path, size and modification time, so editing or replacing the file
+invalidates them automatically.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+CACHE_DIR = Path(os.getenv("VIDEO_CACHE_DIR", ".cache"))
+
+
+def cache_dir(name: str) -> Path:
+    """Return (and create) the cache sub-directory ``name``."""
+    path = CACHE_DIR / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def file_key(path: str) -> str:
+    """Return a cache key for ``path`` based on path, size and mtime."""
+    st = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+# Bytes read from each sample point by ``fast_file_hash``.
+HASH_CHUNK = 1 << 20
+
+
+def fast_file_hash(path: str) -> str:
+    """Return a content hash of ``path`` without reading the whole file.
+
+    Hashes the size plus 1 MiB from the start, middle and end, which is
+    enough to tell different videos apart while costing a few reads even
+    for multi-gigabyte files.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        for offset in sorted({0, max(0, size // 2 - HASH_CHUNK // 2), max(0, size - HASH_CHUNK)}):
+            f.seek(offset)
+            digest.update(f.read(HASH_CHUNK))
+    return digest.hexdigest()
@@ -0,0 +1,144 @@
+"""Cached media probing shared by the cut screens and ``video_cut_utils``.
+
+``probe(path)`` runs ffprobe once per file and returns a ``MediaInfo``.
+Results are kept in an in-memory LRU backed by JSON files in
+``.cache/probe``, keyed by path, size and mtime, so reading the duration
+or dimensions of a video never spawns a full decoder.
+"""
+import json
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from media_cache import cache_dir, file_key
+
+# Maximum number of entries kept in memory.
+LRU_SIZE = 128
+
+# Stream fields kept in ``MediaInfo.streams``.
+STREAM_FIELDS = (
+    "index",
+    "codec_type",
+    "codec_name",
+    "profile",
+    "level",
+    "width",
+    "height",
+    "pix_fmt",
+    "r_frame_rate",
+    "avg_frame_rate",
+    "time_base",
+    "sample_rate",
+    "channels",
+    "channel_layout",
+    "bit_rate",
+    "duration",
+)
+
+_lru = OrderedDict()
+_lock = threading.Lock()
+
+
+@dataclass
+class MediaInfo:
+    """Summary of a media file as reported by ffprobe."""
+
+    path: str
+    duration: float = 0.0
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    bit_rate: int = 0
+    streams: list = field(default_factory=list)
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    @property
+    def video(self) -> Optional[dict]:
+        """First video stream, or ``None``."""
+        return next((s for s in self.streams if s.get("codec_type") == "video"), None)
+
+    @property
+    def audio(self) -> Optional[dict]:
+        """First audio stream, or ``None``."""
+        return next((s for s in self.streams if s.get("codec_type") == "audio"), None)
+
+
+def _parse_rate(value) -> float:
+    """Convert an ffprobe rate such as ``30000/1001`` to a float."""
+    if not value:
+        return 0.0
+    num, _, den = str(value).partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _run_ffprobe(path: str) -> MediaInfo:
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_format",
+        "-show_streams",
+        "-of", "json",
+        path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout)
+    streams = [
+        {k: s[k] for k in STREAM_FIELDS if k in s} for s in data.get("streams", [])
+    ]
+    fmt = data.get("format", {})
+    info = MediaInfo(path=os.path.abspath(path), streams=streams)
+    video = info.video
+    audio = info.audio
+    if video:
+        info.width = int(video.get("width", 0))
+        info.height = int(video.get("height", 0))
+        info.fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+        info.video_codec = video.get("codec_name")
+    if audio:
+        info.audio_codec = audio.get("codec_name")
+    duration = fmt.get("duration") or (video or {}).get("duration") or 0
+    info.duration = float(duration)
+    info.bit_rate = int(fmt.get("bit_rate") or 0)
+    return info
+
+
+def probe(path: str) -> MediaInfo:
+    """Return the ``MediaInfo`` of ``path``, probing it only once."""
+    key = file_key(path)
+    with _lock:
+        if key in _lru:
+            _lru.move_to_end(key)
+            return _lru[key]
+
+    cache_file = cache_dir("probe") / f"{key}.json"
+    info = None
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                info = MediaInfo(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            info = None
+    if info is None:
+        info = _run_ffprobe(path)
+        tmp = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(info), f)
+        os.replace(tmp, cache_file)
+
+    with _lock:
+        _lru[key] = info
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+    return info
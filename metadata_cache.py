@@ -0,0 +1,117 @@
+"""TTL cache of yt-dlp extractor output.
+
+``get_info`` runs ``extract_info(download=False)`` once per video and
+keeps the (sanitized) info dict in memory and in ``.cache/metadata``.
+Entries are stored under both the canonical ID parsed from the URL
+(``download_index.canonical_id``) and the ID yt-dlp reports, so a short
+link and the full URL of the same video share one entry.
+
+The info dict can be handed back to ``YoutubeDL.process_ie_result`` to
+download without a second extraction. Format URLs signed by the site
+expire after a few hours, so entries only live ``METADATA_TTL`` seconds
+(default 1800).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from download_index import canonical_id
+from media_cache import cache_dir
+
+DEFAULT_TTL = 1800
+
+_memory = {}
+_lock = threading.Lock()
+
+
+def ttl() -> float:
+    try:
+        return float(os.getenv("METADATA_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def _keys(url: str, info: dict = None) -> list:
+    keys = [f"url:{url.strip()}"]
+    cid = canonical_id(url)
+    if cid:
+        keys.append(cid)
+    if info is not None and info.get("id") and info.get("extractor_key"):
+        keys.append(f"{info['extractor_key'].lower()}:{info['id']}")
+    return keys
+
+
+def _path(key: str):
+    return cache_dir("metadata") / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def _fresh(entry, max_age) -> bool:
+    return entry is not None and time.time() - entry["time"] < max_age
+
+
+def cached_info(url: str, max_age: float = None):
+    """Return the cached info dict for ``url`` if it is still fresh."""
+    max_age = ttl() if max_age is None else max_age
+    with _lock:
+        for key in _keys(url):
+            entry = _memory.get(key)
+            if entry is None:
+                try:
+                    with open(_path(key), "r", encoding="utf-8") as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                _memory[key] = entry
+            if _fresh(entry, max_age):
+                return entry["info"]
+    return None
+
+
+def store(url: str, info: dict) -> None:
+    """Cache ``info`` (already sanitized) for ``url`` and its video ID."""
+    entry = {"time": time.time(), "info": info}
+    with _lock:
+        for key in _keys(url, info):
+            _memory[key] = entry
+            path = _path(key)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+
+
+def get_info(url: str, opts: dict = None, refresh: bool = False) -> dict:
+    """Return the extractor output for ``url``, extracting only on a miss.
+
+    ``opts`` are the ``YoutubeDL`` options used for the extraction
+    (cookies, for instance).
+    """
+    if not refresh:
+        info = cached_info(url)
+        if info is not None:
+            return info
+    import yt_dlp
+
+    opts = dict(opts or {})
+    opts.setdefault("quiet", True)
+    opts.setdefault("no_warnings", True)
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+    store(url, info)
+    return info
+
+
+def summary(info: dict) -> dict:
+    """Return the fields shown before a download."""
+    formats = info.get("formats") or []
+    heights = sorted({f["height"] for f in formats if f.get("height")})
+    return {
+        "title": info.get("title") or info.get("id", ""),
+        "duration": info.get("duration"),
+        "thumbnail": info.get("thumbnail"),
+        "uploader": info.get("uploader") or info.get("channel"),
+        "heights": heights,
+        "formats": len(formats),
+    }
@@ -0,0 +1,39 @@
+"""Compatibility fixes for MoviePy 1.0.3 with current Pillow.
+
+Call ``apply_patches()`` before using MoviePy. The fixes used to run
+when ``video_menu`` was imported, which loaded MoviePy (and imageio,
+numpy...) at startup even though the app itself never uses it.
+"""
+import os
+
+_applied = False
+
+
+def apply_patches() -> None:
+    """Patch Pillow and MoviePy once; later calls do nothing."""
+    global _applied
+    if _applied:
+        return
+    from PIL import Image
+    from moviepy.audio.io.ffmpeg_audiowriter import FFMPEG_AudioWriter
+
+    # Pillow >=10 removed the Image.ANTIALIAS constant used by MoviePy.
+    # Provide a fallback for compatibility with older MoviePy versions.
+    if not hasattr(Image, "ANTIALIAS"):
+        Image.ANTIALIAS = Image.Resampling.LANCZOS
+
+    # Fix a bug in MoviePy 1.0.3 where ``FFMPEG_AudioWriter`` may not define
+    # the ``ext`` attribute before ``write_frames`` is called. This leads to an
+    # ``AttributeError`` when audio encoding fails (e.g. due to missing codecs).
+    # Ensure ``ext`` is always set so the error handling works correctly.
+    if not hasattr(FFMPEG_AudioWriter, "_ext_patch"):
+        _orig_init = FFMPEG_AudioWriter.__init__
+
+        def _init_with_ext(self, filename, *a, **k):
+            _orig_init(self, filename, *a, **k)
+            if not hasattr(self, "ext"):
+                self.ext = os.path.splitext(filename)[1]
+
+        FFMPEG_AudioWriter.__init__ = _init_with_ext
+        FFMPEG_AudioWriter._ext_patch = True
+    _applied = True
@@ -0,0 +1,51 @@
+"""Background import of the slow optional dependencies.
+
+``video_menu`` imports yt-dlp, OpenAI and Instaloader only when they are
+first used, so the window shows up quickly. Once the menu is on screen,
+``preload_in_background`` imports them in a daemon thread so the first
+download usually does not wait for them either.
+
+``PRELOAD_MODULES`` (comma separated) replaces the default list; set it
+empty to disable preloading. Whisper is left out by default because it
+loads torch, which takes several seconds and a lot of memory.
+"""
+import importlib
+import logging
+import os
+import threading
+import time
+
+DEFAULT_MODULES = ("yt_dlp", "openai", "instaloader")
+
+
+def configured_modules() -> tuple:
+    value = os.getenv("PRELOAD_MODULES")
+    if value is None:
+        return DEFAULT_MODULES
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+def preload(modules=None) -> dict:
+    """Import ``modules`` and return the seconds each one took.
+
+    Modules that fail to import are logged and skipped; the error shows
+    up again when the feature that needs them is used.
+    """
+    timings = {}
+    for name in configured_modules() if modules is None else modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            logging.warning("Preload of %s failed", name, exc_info=True)
+            continue
+        timings[name] = time.perf_counter() - started
+    logging.info("Preloaded modules: %s", timings)
+    return timings
+
+
+def preload_in_background(modules=None) -> threading.Thread:
+    """Run ``preload`` in a daemon thread and return the thread."""
+    thread = threading.Thread(target=preload, args=(modules,), name="preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,170 @@
+"""Combined progress of every running download.
+
+yt-dlp calls its progress hooks for every block it writes, and a merged
+download reports the video and the audio streams as separate files.
+Instead of forwarding each event to the UI, the download threads feed
+them to one ``ProgressAggregator``. The UI reads ``snapshot()`` on a
+fixed clock (``PROGRESS_FPS`` times per second) and gets the combined
+bytes, bytes/s and ETA of all active downloads in one go.
+
+Each download is identified by a key (its URL, or ``<url>#<n>`` for the
+clips of ``download_clips``) and may have several parts (the files
+yt-dlp reports). A key stays active until ``finish`` is called, so the
+``finished`` event of the video stream does not end a download whose
+audio stream is still to come.
+"""
+import threading
+import time
+from collections import deque
+
+# How often the UI refreshes the download progress.
+PROGRESS_FPS = 10
+
+# Seconds of transfer history used for the bytes/s average.
+SPEED_WINDOW = 3.0
+
+# Minimum spacing of the speed samples, in seconds.
+_SAMPLE_INTERVAL = 0.1
+
+
+class ProgressAggregator:
+    """Thread safe collector of download progress events."""
+
+    def __init__(self, window: float = SPEED_WINDOW):
+        self.window = window
+        # Incremented on every change, so readers can skip identical frames.
+        self.version = 0
+        self._lock = threading.Lock()
+        self._downloads = {}
+        self._transferred = 0
+        self._samples = deque()
+
+    def start(self, key: str) -> None:
+        """Mark ``key`` as active before it reports any bytes."""
+        with self._lock:
+            self._downloads.setdefault(key, {})
+            self.version += 1
+
+    def update(self, key: str, part: str, downloaded: int, total: int = None) -> None:
+        """Record that ``part`` of download ``key`` has ``downloaded`` bytes."""
+        now = time.monotonic()
+        with self._lock:
+            parts = self._downloads.setdefault(key, {})
+            previous, known_total = parts.get(part, (0, None))
+            parts[part] = (downloaded, total or known_total)
+            if downloaded > previous:
+                self._transferred += downloaded - previous
+            samples = self._samples
+            if len(samples) > 1 and now - samples[-2][0] < _SAMPLE_INTERVAL:
+                samples[-1] = (now, self._transferred)
+            else:
+                samples.append((now, self._transferred))
+            self.version += 1
+
+    def feed(self, key: str, d: dict) -> None:
+        """Record a yt-dlp progress hook dict for download ``key``."""
+        status = d.get("status")
+        if status not in ("downloading", "finished"):
+            return
+        part = d.get("filename") or ""
+        downloaded = d.get("downloaded_bytes") or 0
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        if status == "finished":
+            total = d.get("total_bytes") or downloaded or total
+            downloaded = total or downloaded
+        self.update(key, part, downloaded, total)
+
+    def finish(self, key: str) -> None:
+        """Drop download ``key`` from the active set."""
+        with self._lock:
+            if self._downloads.pop(key, None) is not None:
+                self.version += 1
+
+    def percent(self, key: str):
+        """Return the completion of ``key`` over all its parts, or ``None``."""
+        with self._lock:
+            return _percent(self._downloads.get(key))
+
+    def snapshot(self) -> dict:
+        """Return the combined state of the active downloads.
+
+        Keys: ``active`` (number of downloads), ``downloaded`` and
+        ``total`` (bytes; ``total`` only counts parts of known size),
+        ``percent``, ``speed`` (bytes/s over the last ``window`` seconds)
+        and ``eta`` (seconds, ``None`` when unknown).
+        """
+        now = time.monotonic()
+        with self._lock:
+            downloaded = total = remaining = 0
+            for parts in self._downloads.values():
+                for done, size in parts.values():
+                    downloaded += done
+                    if size:
+                        total += size
+                        remaining += max(size - done, 0)
+            speed = self._speed(now)
+            active = len(self._downloads)
+        return {
+            "active": active,
+            "downloaded": downloaded,
+            "total": total or None,
+            "percent": min(downloaded / total * 100, 100.0) if total else None,
+            "speed": speed,
+            "eta": remaining / speed if speed and total else None,
+        }
+
+    def _speed(self, now: float) -> float:
+        # Keep the newest sample older than the window as the baseline.
+        while len(self._samples) > 1 and self._samples[1][0] <= now - self.window:
+            self._samples.popleft()
+        if not self._samples:
+            return 0.0
+        start, transferred = self._samples[0]
+        if now - start <= 0:
+            return 0.0
+        return (self._transferred - transferred) / (now - start)
+
+
+def _percent(parts):
+    if not parts:
+        return None
+    sizes = [(done, size) for done, size in parts.values() if size]
+    if not sizes:
+        return None
+    return min(sum(d for d, _ in sizes) / sum(s for _, s in sizes) * 100, 100.0)
+
+
+def format_bytes(value: float) -> str:
+    """Return ``value`` bytes as ``"512 KB"``, ``"3.4 MB"``..."""
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB"
+
+
+def format_snapshot(snapshot: dict) -> str:
+    """Return a status line such as ``2 download(s) · 3.4 MB/s · ETA 00:01:12``."""
+    if not snapshot["active"]:
+        return ""
+    parts = [f"{snapshot['active']} download(s)"]
+    if snapshot["total"]:
+        parts.append(f"{format_bytes(snapshot['downloaded'])} de {format_bytes(snapshot['total'])}")
+    parts.append(f"{format_bytes(snapshot['speed'])}/s")
+    if snapshot["eta"] is not None:
+        eta = int(snapshot["eta"])
+        parts.append(f"ETA {eta // 3600:02d}:{eta % 3600 // 60:02d}:{eta % 60:02d}")
+    return " · ".join(parts)
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def get_aggregator() -> ProgressAggregator:
+    """Return the process wide aggregator, creating it on first use."""
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None:
+            _aggregator = ProgressAggregator()
+        return _aggregator
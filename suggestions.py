@@ -0,0 +1,325 @@
+"""Cut suggestions from a transcript, using ChatGPT.
+
+``suggest`` runs the whole flow used by the auto cut screen: transcribe
+the video, ask ChatGPT for cuts in the given niche, drop the ones
+outside the video and save them to
+``videos/<data>/gpt/suggestions.json``. ``openai`` is imported only when
+a request is made.
+
+``suggest_stream`` does the same while the video is still being
+transcribed: each time ``SUGGEST_WINDOW_MINUTES`` (default 3) of
+transcript are ready, the request for that window is queued in the
+``api`` pool of ``job_scheduler``, so the first cuts show up long
+before the transcription ends.
+"""
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+from keyframe_index import keyframe_before
+from media_probe import probe
+
+DEFAULT_CHAT_MODEL = "gpt-3.5-turbo"
+DEFAULT_WINDOW_MINUTES = 3.0
+
+
+def default_window_minutes() -> float:
+    """Return the transcript window of ``suggest_stream`` (``SUGGEST_WINDOW_MINUTES``)."""
+    try:
+        return float(os.getenv("SUGGEST_WINDOW_MINUTES", DEFAULT_WINDOW_MINUTES))
+    except ValueError:
+        return DEFAULT_WINDOW_MINUTES
+
+
+def hms_to_seconds(value: str) -> float:
+    """Convert HH:MM:SS string to seconds."""
+    parts = value.strip().split(":")
+    try:
+        parts = [float(p) for p in parts]
+    except ValueError:
+        raise ValueError("Tempo inválido")
+    if len(parts) == 3:
+        h, m, s = parts
+    elif len(parts) == 2:
+        h = 0
+        m, s = parts
+    elif len(parts) == 1:
+        h = 0
+        m = 0
+        s = parts[0]
+    else:
+        raise ValueError("Tempo inválido")
+    return h * 3600 + m * 60 + s
+
+
+def seconds_to_hms(value: float) -> str:
+    """Format seconds into a ``HH:MM:SS`` string."""
+    total = int(round(value))
+    h = total // 3600
+    m = (total % 3600) // 60
+    s = total % 60
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+def parse_suggestions(text):
+    """Parse ChatGPT response into a list of suggestions."""
+    try:
+        data = json.loads(text)
+    except Exception:
+        data = None
+
+    suggestions = []
+    if isinstance(data, list):
+        for item in data:
+            suggestions.append(
+                {
+                    "title": item.get("title", ""),
+                    "description": item.get("description", ""),
+                    "start": item.get("start", ""),
+                    "end": item.get("end", ""),
+                }
+            )
+        if suggestions:
+            return suggestions
+
+    for line in text.splitlines():
+        m = re.search(
+            r"(\d{2}:\d{2}:\d{2}).*?(\d{2}:\d{2}:\d{2})(?:\s*-?\s*(.*))?",
+            line,
+        )
+        if not m:
+            continue
+        start, end, title = m.group(1), m.group(2), (m.group(3) or "").strip()
+        if not title:
+            title = f"Corte {len(suggestions) + 1}"
+        suggestions.append({"start": start, "end": end, "title": title, "description": ""})
+    return suggestions
+
+
+def format_transcript(segments) -> str:
+    """Return the ``HH:MM:SS-HH:MM:SS text`` lines sent to ChatGPT."""
+    return "\n".join(
+        f"{seconds_to_hms(s['start'])}-{seconds_to_hms(s['end'])} {s['text'].strip()}"
+        for s in segments
+    )
+
+
+def build_prompt(niche: str, duration: str, transcript: str) -> str:
+    return (
+        "Sugira cortes interessantes no formato JSON com os campos "
+        "title, description, start e end, baseados no nicho '"
+        + niche
+        + "'. O vídeo tem duração "
+        + duration
+        + ". Use quantos cortes forem relevantes.\n"
+        + transcript
+        + "\nReturn a JSON array of objects with `title`, `description`, `start`, `end`."
+    )
+
+
+def request_suggestions(prompt: str, model: str = DEFAULT_CHAT_MODEL) -> list:
+    """Send ``prompt`` to ChatGPT and return the decoded JSON array.
+
+    Raises ``RuntimeError`` when ``OPENAI_API_KEY`` is missing or the
+    answer was cut short, and ``ValueError`` when it is not valid JSON.
+    """
+    import openai
+
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        raise RuntimeError("Configure a chave da API")
+    openai.api_key = key
+    completion = openai.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        # Allow a larger response so the JSON is not truncated
+        max_tokens=500,
+    )
+    text = completion.choices[0].message.content
+    finish_reason = completion.choices[0].finish_reason
+    usage = getattr(completion, "usage", None)
+    logging.info(
+        "Prompt:\n%s\nResponse preview:\n%s", prompt, text[:200]
+    )
+    logging.info(
+        "Prompt:\n%s\nResponse:\n%s\nUsage: %s", prompt, text, usage
+    )
+    if finish_reason and finish_reason != "stop":
+        raise RuntimeError(
+            f"Resposta do modelo incompleta (finish_reason={finish_reason})"
+        )
+    try:
+        return json.loads(text)
+    except ValueError:
+        logging.exception("JSON parsing failed")
+        raise
+
+
+def filter_suggestions(raw_suggestions, duration_sec: float, path: str = None) -> list:
+    """Drop suggestions outside ``0..duration_sec``.
+
+    With ``path`` each kept suggestion also gets ``keyframe_start``, the
+    keyframe where a stream copy cut of it begins.
+    """
+    suggestions = []
+    for item in raw_suggestions:
+        start_raw = item.get("start")
+        end_raw = item.get("end")
+        try:
+            start_sec = float(start_raw)
+            end_sec = float(end_raw)
+        except (TypeError, ValueError):
+            try:
+                start_sec = hms_to_seconds(str(start_raw))
+                end_sec = hms_to_seconds(str(end_raw))
+            except Exception:
+                continue
+        if 0 <= start_sec < end_sec <= duration_sec:
+            if path is not None:
+                try:
+                    keyframe = keyframe_before(path, start_sec)
+                except Exception:
+                    keyframe = None
+                if keyframe is not None:
+                    item["keyframe_start"] = keyframe
+            suggestions.append(item)
+    return suggestions
+
+
+def save_suggestions(path: str, suggestions) -> str:
+    """Write ``videos/<data>/gpt/suggestions.json`` and return its path."""
+    date_dir = Path("videos") / datetime.now().strftime("%Y-%m-%d") / "gpt"
+    date_dir.mkdir(parents=True, exist_ok=True)
+    out_file = date_dir / "suggestions.json"
+    with open(out_file, "w", encoding="utf-8") as f:
+        json.dump({"file": path, "suggestions": suggestions}, f, ensure_ascii=False, indent=2)
+    return str(out_file)
+
+
+def suggest(
+    path: str,
+    niche: str,
+    segments=None,
+    on_status=None,
+    chat_model: str = DEFAULT_CHAT_MODEL,
+    model_name: str = None,
+    use_cache: bool = True,
+) -> dict:
+    """Transcribe ``path`` (unless ``segments`` are given) and ask for cuts.
+
+    The transcript comes from ``transcript_cache`` when the video was
+    already transcribed with ``model_name``, so only the ChatGPT request
+    runs again for a new niche. ``on_status(percent, message)`` is called
+    between the steps. Returns ``suggestions``, ``segments`` and ``file``
+    (the saved JSON).
+    """
+    if segments is None:
+        from transcription import transcribe
+
+        on_progress = None
+        if on_status is not None:
+            on_status(0, "Transcrevendo")
+
+            def on_progress(percent):
+                on_status(percent // 2, "Transcrevendo")
+
+        segments = transcribe(path, model_name, use_cache=use_cache, on_progress=on_progress)
+    if on_status is not None:
+        on_status(50, "Consultando o ChatGPT")
+    duration_sec = probe(path).duration
+    prompt = build_prompt(niche, seconds_to_hms(duration_sec), format_transcript(segments))
+    suggestions = filter_suggestions(request_suggestions(prompt, chat_model), duration_sec, path)
+    return {
+        "suggestions": suggestions,
+        "segments": segments,
+        "file": save_suggestions(path, suggestions),
+    }
+
+
+def suggest_stream(
+    path: str,
+    niche: str,
+    on_segment=None,
+    on_suggestions=None,
+    on_status=None,
+    chat_model: str = DEFAULT_CHAT_MODEL,
+    model_name: str = None,
+    use_cache: bool = True,
+    window_minutes: float = None,
+    cancel_event=None,
+) -> dict:
+    """Like ``suggest``, but asks for cuts window by window while transcribing.
+
+    ``on_segment(segment)`` is called for every transcribed segment and
+    ``on_suggestions(items)`` with the cuts of each window as soon as its
+    request returns (from an ``api`` pool thread). The windows are
+    requested in parallel with the transcription; the result is the same
+    dict as ``suggest``, with the cuts in window order. Fails only when
+    every window request failed.
+    """
+    from job_scheduler import DONE, get_scheduler
+    from transcription import transcribe_stream
+
+    duration_sec = probe(path).duration
+    total = seconds_to_hms(duration_sec)
+    window = (window_minutes or default_window_minutes()) * 60
+    scheduler = get_scheduler()
+    jobs = []
+    segments = []
+    pending = []
+
+    def request(window_segments):
+        prompt = build_prompt(niche, total, format_transcript(window_segments))
+        items = filter_suggestions(request_suggestions(prompt, chat_model), duration_sec, path)
+        if on_suggestions is not None and items:
+            on_suggestions(items)
+        return items
+
+    def flush():
+        name = f"Sugestões {seconds_to_hms(pending[0]['start'])}-{seconds_to_hms(pending[-1]['end'])}"
+        jobs.append(scheduler.submit("api", request, list(pending), name=name))
+        pending.clear()
+
+    if on_status is not None:
+        on_status(0, "Transcrevendo")
+    boundary = window
+    try:
+        for segment in transcribe_stream(path, model_name, use_cache=use_cache, cancel_event=cancel_event):
+            segments.append(segment)
+            pending.append(segment)
+            if on_segment is not None:
+                on_segment(segment)
+            if on_status is not None and duration_sec:
+                on_status(min(99, int(segment["end"] * 100 / duration_sec)), "Transcrevendo")
+            if segment["end"] >= boundary:
+                flush()
+                boundary = segment["end"] + window
+        if pending:
+            flush()
+    except BaseException:
+        for job in jobs:
+            job.cancel()
+        raise
+
+    if on_status is not None:
+        on_status(99, "Consultando o ChatGPT")
+    suggestions = []
+    errors = []
+    for job in jobs:
+        job.wait()
+        if job.state == DONE:
+            suggestions.extend(job.result)
+        elif job.error:
+            errors.append(job.error)
+    if errors:
+        if not suggestions:
+            raise RuntimeError(errors[0])
+        logging.warning("%d of %d suggestion requests failed: %s", len(errors), len(jobs), errors[0])
+    return {
+        "suggestions": suggestions,
+        "segments": segments,
+        "file": save_suggestions(path, suggestions),
+    }
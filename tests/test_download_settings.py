@@ -0,0 +1,8 @@
+import download_settings
+
+
+def test_retry_sleep_is_called_by_keyword():
+    settings = dict(download_settings.DEFAULTS, backoff=1.5)
+    opts = download_settings.ytdlp_options(settings)
+    assert opts["retry_sleep_functions"]["http"](n=2) == 6.0
+    assert opts["retry_sleep_functions"]["fragment"](n=20) == download_settings.MAX_BACKOFF
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+import audio_pcm
+import media_cache
+import transcription
+
+
+class FakeModel:
+    def transcribe(self, audio, **options):
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": " olá "}]}
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(audio_pcm, "load_pcm", lambda path: np.zeros(audio_pcm.SAMPLE_RATE, dtype=np.float32))
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video")
+    return str(path)
+
+
+def test_transcribe_reuses_streamed_transcript(video, monkeypatch):
+    monkeypatch.setattr(transcription, "get_model", lambda name: FakeModel())
+    streamed = list(transcription.transcribe_stream(video, model_name="base"))
+
+    def no_model(name):
+        raise AssertionError("o modelo não deveria ser carregado")
+
+    monkeypatch.setattr(transcription, "get_model", no_model)
+    assert transcription.transcribe(video, model_name="base", workers=1) == streamed
+    assert transcription.transcribe(video, model_name="base", workers=4) == streamed
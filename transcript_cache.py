@@ -0,0 +1,86 @@
+"""Content addressed cache of Whisper transcripts.
+
+A transcript is stored under a key made of ``fast_file_hash`` of the
+media, the model name and the transcription options, so renaming or
+copying a video still hits the cache, while another model (or other
+options) transcribes again. Changing only the ChatGPT prompt or the
+niche therefore never re-runs Whisper.
+
+Entries are ``.cache/transcripts/<key>.npz`` files holding the segment
+times as float arrays and the texts as one UTF-8 blob with offsets,
+which is a fraction of the size of the equivalent JSON and loads
+without pickling.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from media_cache import cache_dir, fast_file_hash
+
+
+def cache_key(path: str, model_name: str, options: dict = None) -> str:
+    """Return the cache key of ``path`` transcribed with ``model_name``."""
+    raw = json.dumps(
+        {"media": fast_file_hash(path), "model": model_name, "options": options or {}},
+        sort_keys=True,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _path(key: str):
+    return cache_dir("transcripts") / f"{key}.npz"
+
+
+def _encode(segments) -> dict:
+    texts = [s["text"].encode("utf-8") for s in segments]
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    if texts:
+        offsets[1:] = np.cumsum([len(t) for t in texts])
+    return {
+        "start": np.array([s["start"] for s in segments], dtype=np.float64),
+        "end": np.array([s["end"] for s in segments], dtype=np.float64),
+        "offsets": offsets,
+        "text": np.frombuffer(b"".join(texts), dtype=np.uint8),
+    }
+
+
+def _decode(data) -> list:
+    blob = data["text"].tobytes()
+    offsets = data["offsets"]
+    return [
+        {
+            "start": float(start),
+            "end": float(end),
+            "text": blob[offsets[i]:offsets[i + 1]].decode("utf-8"),
+        }
+        for i, (start, end) in enumerate(zip(data["start"], data["end"]))
+    ]
+
+
+def load(path: str, model_name: str, options: dict = None):
+    """Return the cached segments of ``path``, or ``None`` on a miss."""
+    cached = _path(cache_key(path, model_name, options))
+    try:
+        with np.load(cached, allow_pickle=False) as data:
+            return _decode(data)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def store(path: str, model_name: str, segments, options: dict = None) -> None:
+    """Cache ``segments`` (dicts with ``start``, ``end`` and ``text``)."""
+    target = _path(cache_key(path, model_name, options))
+    tmp = target.with_name(f"{target.stem}.{threading.get_ident()}.tmp.npz")
+    np.savez_compressed(tmp, **_encode(segments))
+    os.replace(tmp, target)
+
+
+def forget(path: str, model_name: str, options: dict = None) -> None:
+    """Remove the cached transcript so the next run transcribes again."""
+    try:
+        os.remove(_path(cache_key(path, model_name, options)))
+    except OSError:
+        pass
@@ -0,0 +1,185 @@
+"""Speech transcription with Whisper.
+
+Shared by the auto cut screen and ``video_cli``. Models come from
+``whisper_models``, which keeps them loaded between transcriptions;
+Whisper (and the torch stack behind it) is imported only when the first
+model is loaded. Whisper reads the 16 kHz samples shared through
+``audio_pcm`` instead of decoding the video itself. Results are kept in
+``transcript_cache``, so the same video is transcribed once per model,
+whichever of the modes below produced the transcript.
+
+With ``TRANSCRIBE_WORKERS`` above 1 the audio is split at silences into
+chunks of about ``TRANSCRIBE_CHUNK_MINUTES`` (default 10) and the chunks
+are transcribed in a process pool, each worker with its own model and
+an even share of the CPU threads. This is meant for CPU-only machines,
+where a single ``model.transcribe`` call cannot use every core; each
+worker holds a full copy of the model in memory.
+
+``transcribe_stream`` yields the segments while the audio is being
+transcribed, for screens that show the transcript live.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import audio_pcm
+import transcript_cache
+from whisper_models import default_model_name, get_model
+
+# Options passed to ``model.transcribe``; they are the cache key options.
+# Chunking and streaming are left out on purpose: a transcript made either
+# way serves every later call for the same video and model.
+TRANSCRIBE_OPTIONS = {"fp16": False}
+
+DEFAULT_CHUNK_MINUTES = 10.0
+
+# Audio transcribed per step of ``transcribe_stream``.
+STREAM_CHUNK_SECONDS = 30.0
+
+
+class TranscriptionCancelled(Exception):
+    """Raised when ``cancel_event`` is set during ``transcribe_stream``."""
+
+
+def default_workers() -> int:
+    """Return the number of transcription processes (``TRANSCRIBE_WORKERS``)."""
+    try:
+        return max(1, int(os.getenv("TRANSCRIBE_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def default_chunk_minutes() -> float:
+    """Return the chunk length in minutes (``TRANSCRIBE_CHUNK_MINUTES``)."""
+    try:
+        return float(os.getenv("TRANSCRIBE_CHUNK_MINUTES", DEFAULT_CHUNK_MINUTES))
+    except ValueError:
+        return DEFAULT_CHUNK_MINUTES
+
+
+def _segments(result, offset: float = 0.0, limit: float = None) -> list:
+    segments = []
+    for s in result["segments"]:
+        end = s["end"] + offset
+        if limit is not None:
+            end = min(end, limit)
+        segments.append({"start": s["start"] + offset, "end": end, "text": s["text"].strip()})
+    return segments
+
+
+def transcribe(
+    path: str,
+    model_name: str = None,
+    use_cache: bool = True,
+    workers: int = None,
+    chunk_minutes: float = None,
+    on_progress=None,
+) -> list:
+    """Transcribe ``path`` and return its segments.
+
+    ``model_name`` defaults to ``WHISPER_MODEL``. Each segment is a dict
+    with ``start`` and ``end`` (seconds) and ``text``. With
+    ``use_cache=False`` the video is transcribed again and the cached
+    transcript replaced. ``workers`` and ``chunk_minutes`` default to the
+    environment; ``on_progress(percent)`` is called as chunks finish.
+    """
+    model_name = model_name or default_model_name()
+    workers = workers or default_workers()
+    if use_cache:
+        segments = transcript_cache.load(path, model_name, TRANSCRIBE_OPTIONS)
+        if segments is not None:
+            return segments
+    audio = audio_pcm.load_pcm(path)
+    if workers > 1:
+        chunk_minutes = chunk_minutes or default_chunk_minutes()
+        segments = _transcribe_chunked(path, audio, model_name, workers, chunk_minutes, on_progress)
+    else:
+        model = get_model(model_name)
+        segments = _segments(model.transcribe(audio, **TRANSCRIBE_OPTIONS))
+    transcript_cache.store(path, model_name, segments, TRANSCRIBE_OPTIONS)
+    return segments
+
+
+def transcribe_stream(
+    path: str,
+    model_name: str = None,
+    use_cache: bool = True,
+    chunk_seconds: float = STREAM_CHUNK_SECONDS,
+    cancel_event=None,
+):
+    """Yield the segments of ``path`` as they are transcribed.
+
+    The audio is transcribed with the resident model in chunks of about
+    ``chunk_seconds``, cut at silences, and the end of each chunk is
+    passed as the prompt of the next one. The first segments therefore
+    arrive after one chunk instead of after the whole video. A cached
+    transcript is yielded at once, and the streamed one is cached under
+    the same key ``transcribe`` uses. Raises
+    ``TranscriptionCancelled`` between chunks once ``cancel_event`` is set.
+    """
+    model_name = model_name or default_model_name()
+    if use_cache:
+        segments = transcript_cache.load(path, model_name, TRANSCRIBE_OPTIONS)
+        if segments is not None:
+            yield from segments
+            return
+    audio = audio_pcm.load_pcm(path)
+    model = get_model(model_name)
+    segments = []
+    for start, end in audio_pcm.chunk_bounds(audio, chunk_seconds):
+        if cancel_event is not None and cancel_event.is_set():
+            raise TranscriptionCancelled("Transcrição cancelada")
+        prompt = " ".join(s["text"] for s in segments[-3:])[-200:] or None
+        result = model.transcribe(audio[start:end], initial_prompt=prompt, **TRANSCRIBE_OPTIONS)
+        chunk = _segments(result, start / audio_pcm.SAMPLE_RATE, end / audio_pcm.SAMPLE_RATE)
+        segments.extend(chunk)
+        yield from chunk
+    transcript_cache.store(path, model_name, segments, TRANSCRIBE_OPTIONS)
+
+
+# Chunked mode -------------------------------------------------------------
+
+_worker_model = None
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    global _worker_model
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_model = get_model(model_name)
+
+
+def _transcribe_chunk(pcm: str, start: int, end: int) -> list:
+    audio = audio_pcm.open_pcm(pcm)[start:end]
+    result = _worker_model.transcribe(audio, **TRANSCRIBE_OPTIONS)
+    return _segments(result, start / audio_pcm.SAMPLE_RATE, end / audio_pcm.SAMPLE_RATE)
+
+
+def _transcribe_chunked(path, audio, model_name, workers, chunk_minutes, on_progress=None) -> list:
+    bounds = audio_pcm.chunk_bounds(audio, chunk_minutes * 60)
+    workers = min(workers, len(bounds))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    logging.info(
+        "Transcribing %s in %d chunks with %d workers (%d threads each)",
+        path, len(bounds), workers, threads,
+    )
+    pcm = audio_pcm.extract_pcm(path)
+    chunks = [None] * len(bounds)
+    # "spawn" keeps the workers clear of the GUI threads and locks of this process.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_name, threads),
+    ) as pool:
+        futures = {
+            pool.submit(_transcribe_chunk, pcm, start, end): index
+            for index, (start, end) in enumerate(bounds)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            chunks[futures[future]] = future.result()
+            if on_progress is not None:
+                on_progress(int(done * 100 / len(bounds)))
+    return [segment for chunk in chunks for segment in chunk]
@@ -0,0 +1,52 @@
+"""Upload helpers for each platform.
+
+The platform modules import their API clients, so ``upload_videos``
+loads only the modules of the platforms it posts to.
+"""
+import importlib
+
+PLATFORMS = ("youtube", "instagram", "tiktok", "facebook", "x")
+
+# Platforms whose ``upload_video`` works; the others raise NotImplementedError.
+SUPPORTED_PLATFORMS = ("youtube", "instagram")
+
+_NAMES = {
+    "youtube": "YouTube",
+    "instagram": "Instagram",
+    "tiktok": "TikTok",
+    "facebook": "Facebook",
+    "x": "X",
+}
+
+
+def _upload_kwargs(platform, description):
+    if platform == "youtube":
+        return {"title": "Corte", "description": description}
+    if platform == "instagram":
+        return {"caption": description}
+    if platform == "tiktok":
+        return {}
+    return {"description": description}
+
+
+def upload_videos(paths, descriptions=None):
+    """Upload video to available platforms using provided descriptions.
+
+    ``paths`` maps a platform name to the file posted there. Returns a
+    dict with ``None`` for each successful platform and the error message
+    for each failed one.
+    """
+    results = {}
+    for platform in PLATFORMS:
+        if platform not in paths:
+            continue
+        description = descriptions.get(platform, "") if descriptions else ""
+        try:
+            module = importlib.import_module(f"uploader.{platform}")
+            module.upload_video(paths[platform], **_upload_kwargs(platform, description))
+        except Exception as exc:
+            print(f"{_NAMES[platform]} upload failed:", exc)
+            results[platform] = str(exc)
+        else:
+            results[platform] = None
+    return results
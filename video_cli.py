@@ -0,0 +1,433 @@
+"""Headless command line for the video tools, for servers and job runners.
+
+    python -m video_cli <comando> [opções]
+
+Commands: ``download``, ``cut``, ``cut-many``, ``crop``, ``split``,
+``stack``, ``merge``, ``audio``, ``transcribe``, ``suggest`` and
+``upload``. Each one prints a single JSON object on stdout::
+
+    {"command": "cut", "ok": true, "seconds": 1.84,
+     "timings": {...}, "result": {...}}
+
+with ``"error"`` instead of ``"result"`` when it fails. The exit status
+is 0 on success and 1 otherwise. ``--progress`` also writes progress
+events to stderr, one JSON object per line.
+
+Kivy, Tk and MoviePy are never imported. yt-dlp, Whisper, OpenAI and
+the upload clients are loaded only by the commands that use them.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+from download_settings import add_arguments, settings_from_args
+from encoding_profiles import PROFILES
+from format_policies import POLICIES
+from suggestions import hms_to_seconds
+from uploader import PLATFORMS, SUPPORTED_PLATFORMS
+
+_stderr_lock = threading.Lock()
+
+
+def _emit_progress(event: dict) -> None:
+    with _stderr_lock:
+        sys.stderr.write(json.dumps(event, ensure_ascii=False) + "\n")
+        sys.stderr.flush()
+
+
+def _ffmpeg_progress(args):
+    """Return the ``on_progress`` callback for ``run_ffmpeg``, or ``None``."""
+    if not args.progress:
+        return None
+
+    def on_progress(info):
+        _emit_progress({"event": "progress", **info})
+
+    return on_progress
+
+
+@contextmanager
+def _step(timings: dict, name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - started, 3)
+
+
+def _time(value: str) -> float:
+    try:
+        return hms_to_seconds(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tempo inválido: {value}")
+
+
+def _range(value: str) -> tuple:
+    start, sep, end = value.partition("-")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"intervalo inválido: {value} (use INICIO-FIM)")
+    return _time(start), _time(end)
+
+
+# Commands -----------------------------------------------------------------
+
+def cmd_download(args, timings):
+    from downloader import download_batch, read_url_file
+
+    urls = list(args.urls)
+    if args.file:
+        urls.extend(u for u in read_url_file(args.file) if u not in urls)
+    if not urls:
+        raise ValueError("Informe URLs ou --file")
+
+    on_update = None
+    if args.progress:
+        def on_update(index, item):
+            _emit_progress({"event": "download", "index": index, **item})
+
+    with _step(timings, "download"):
+        items = download_batch(
+            urls,
+            on_update=on_update,
+            max_workers=args.jobs,
+            use_index=not args.force,
+            settings=settings_from_args(args),
+            policy=args.format_policy,
+        )
+    ok = all(item["status"] == "done" for item in items)
+    return ok, {"items": items}
+
+
+def cmd_cut(args, timings):
+    from video_cut_utils import cut_video, smart_cut
+
+    if args.start >= args.end:
+        raise ValueError("Intervalo inválido")
+    with _step(timings, "cut"):
+        if args.precise:
+            mode = smart_cut(
+                args.input, args.output, args.start, args.end, args.profile,
+                on_progress=_ffmpeg_progress(args),
+            )
+        else:
+            cut_video(args.input, args.output, args.start, args.end, on_progress=_ffmpeg_progress(args))
+            mode = "copy"
+    return True, {"output": args.output, "start": args.start, "end": args.end, "mode": mode}
+
+
+def _suggestion_segments(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("suggestions", [])
+    segments = []
+    for item in data:
+        segments.append((_time(str(item["start"])), _time(str(item["end"]))))
+    return segments
+
+
+def cmd_cut_many(args, timings):
+    from video_cut_utils import cut_many
+
+    segments = list(args.segment or [])
+    if args.suggestions:
+        segments.extend(_suggestion_segments(args.suggestions))
+    if not segments:
+        raise ValueError("Informe --segment ou --suggestions")
+    with _step(timings, "cut"):
+        results = cut_many(args.input, segments, args.output, on_progress=_ffmpeg_progress(args))
+    return all(r["ok"] for r in results), {"cuts": results}
+
+
+def cmd_crop(args, timings):
+    from video_cut_utils import crop_sides
+
+    with _step(timings, "encode"):
+        crop_sides(
+            args.input, args.output, args.left, args.right, args.profile,
+            on_progress=_ffmpeg_progress(args),
+        )
+    return True, {"output": args.output}
+
+
+def cmd_split(args, timings):
+    from video_cut_utils import split_grid
+
+    with _step(timings, "encode"):
+        split_grid(
+            args.input, args.outputs, args.rows, args.cols, args.profile,
+            on_progress=_ffmpeg_progress(args),
+        )
+    return True, {"outputs": args.outputs}
+
+
+def cmd_stack(args, timings):
+    from video_cut_utils import stack_videos
+
+    with _step(timings, "encode"):
+        stack_videos(
+            args.top,
+            args.bottom,
+            args.output,
+            audio_from_top=args.audio == "top",
+            width=args.width,
+            height=args.height,
+            profile=args.profile,
+            on_progress=_ffmpeg_progress(args),
+        )
+    return True, {"output": args.output}
+
+
+def cmd_merge(args, timings):
+    from video_cut_utils import merge_videos
+
+    with _step(timings, "merge"):
+        mode = merge_videos(args.inputs, args.output, args.profile, on_progress=_ffmpeg_progress(args))
+    return True, {"output": args.output, "mode": mode}
+
+
+def cmd_audio(args, timings):
+    import audio_pcm
+
+    with _step(timings, "extract"):
+        audio = audio_pcm.load_pcm(args.input, on_progress=_ffmpeg_progress(args))
+    with _step(timings, "analyse"):
+        silences = audio_pcm.detect_silences(audio, args.threshold, args.min_silence)
+        result = {
+            "pcm": audio_pcm.extract_pcm(args.input),
+            "sample_rate": audio_pcm.SAMPLE_RATE,
+            "duration": audio_pcm.duration(audio),
+            "loudness_db": round(audio_pcm.loudness(audio), 2),
+            "silences": [[round(start, 2), round(end, 2)] for start, end in silences],
+        }
+        if args.waveform:
+            result["waveform"] = [round(float(v), 4) for v in audio_pcm.waveform(audio, args.waveform)]
+    return True, result
+
+
+def cmd_transcribe(args, timings):
+    from suggestions import format_transcript
+    from transcription import transcribe
+
+    with _step(timings, "transcribe"):
+        segments = transcribe(
+            args.input, args.model, use_cache=not args.no_cache,
+            workers=args.workers, chunk_minutes=args.chunk_minutes,
+        )
+    result = {"segments": segments, "text": format_transcript(segments)}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        result["file"] = args.output
+    return True, result
+
+
+def cmd_suggest(args, timings):
+    from suggestions import suggest, suggest_stream
+    from transcription import transcribe
+
+    if args.stream and not args.transcript:
+        on_segment = on_suggestions = None
+        if args.progress:
+            def on_segment(segment):
+                _emit_progress({"event": "segment", **segment})
+
+            def on_suggestions(items):
+                _emit_progress({"event": "suggestions", "suggestions": items})
+
+        with _step(timings, "stream"):
+            result = suggest_stream(
+                args.input, args.niche, on_segment=on_segment, on_suggestions=on_suggestions,
+                model_name=args.model, use_cache=not args.no_cache, window_minutes=args.window_minutes,
+            )
+        result.pop("segments")
+        return True, result
+
+    segments = None
+    if args.transcript:
+        with open(args.transcript, "r", encoding="utf-8") as f:
+            segments = json.load(f)["segments"]
+    else:
+        with _step(timings, "transcribe"):
+            segments = transcribe(
+                args.input, args.model, use_cache=not args.no_cache,
+                workers=args.workers, chunk_minutes=args.chunk_minutes,
+            )
+    with _step(timings, "suggest"):
+        result = suggest(args.input, args.niche, segments=segments)
+    result.pop("segments")
+    return True, result
+
+
+def cmd_upload(args, timings):
+    from uploader import upload_videos
+
+    platforms = args.platforms or list(SUPPORTED_PLATFORMS)
+    descriptions = {p: args.description for p in platforms}
+    with _step(timings, "upload"):
+        results = upload_videos({p: args.input for p in platforms}, descriptions)
+    return all(error is None for error in results.values()), {"platforms": results}
+
+
+# Parser -------------------------------------------------------------------
+
+def _add_profile(parser) -> None:
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILES), default=None,
+        help="perfil de codificação (padrão: VIDEO_PROFILE ou social)",
+    )
+
+
+def _add_workers(parser) -> None:
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="processos de transcrição em paralelo (padrão: TRANSCRIBE_WORKERS ou 1)",
+    )
+    parser.add_argument(
+        "--chunk-minutes", type=float, default=None,
+        help="minutos por trecho com --workers > 1 (padrão: TRANSCRIBE_CHUNK_MINUTES ou 10)",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m video_cli",
+        description="Ferramentas de vídeo sem interface gráfica; o resultado sai em JSON.",
+    )
+    parser.add_argument("--progress", action="store_true", help="escreve o progresso em stderr (JSON)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("download", help="baixa vídeos do YouTube, TikTok e Instagram")
+    p.add_argument("urls", nargs="*", help="URLs dos vídeos")
+    p.add_argument("-f", "--file", help="arquivo com uma URL por linha")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="downloads simultâneos no total")
+    p.add_argument("--force", action="store_true", help="ignora o índice de downloads")
+    p.add_argument("--format-policy", choices=sorted(POLICIES), default=None)
+    add_arguments(p)
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("cut", help="corta um trecho")
+    p.add_argument("input")
+    p.add_argument("start", type=_time, help="início (HH:MM:SS ou segundos)")
+    p.add_argument("end", type=_time, help="fim (HH:MM:SS ou segundos)")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--precise", action="store_true", help="corte preciso (smart cut)")
+    _add_profile(p)
+    p.set_defaults(func=cmd_cut)
+
+    p = sub.add_parser("cut-many", help="corta vários trechos numa só leitura da fonte")
+    p.add_argument("input")
+    p.add_argument("-s", "--segment", type=_range, action="append", metavar="INICIO-FIM")
+    p.add_argument("--suggestions", help="JSON gerado por 'suggest' com os trechos")
+    p.add_argument("-o", "--output", required=True, help="pasta de saída")
+    p.set_defaults(func=cmd_cut_many)
+
+    p = sub.add_parser("crop", help="remove as laterais do vídeo")
+    p.add_argument("input")
+    p.add_argument("output")
+    p.add_argument("--left", type=int, required=True, help="pixels removidos à esquerda")
+    p.add_argument("--right", type=int, required=True, help="pixels removidos à direita")
+    _add_profile(p)
+    p.set_defaults(func=cmd_crop)
+
+    p = sub.add_parser("split", help="divide o vídeo numa grade (padrão: metades verticais)")
+    p.add_argument("input")
+    p.add_argument("outputs", nargs="+", help="uma saída por célula, linha a linha")
+    p.add_argument("--rows", type=int, default=1)
+    p.add_argument("--cols", type=int, default=2)
+    _add_profile(p)
+    p.set_defaults(func=cmd_split)
+
+    p = sub.add_parser("stack", help="empilha dois vídeos (um debaixo do outro)")
+    p.add_argument("top")
+    p.add_argument("bottom")
+    p.add_argument("output")
+    p.add_argument("--audio", choices=("top", "bottom"), default="top", help="vídeo que fornece o áudio")
+    p.add_argument("--width", type=int, default=720)
+    p.add_argument("--height", type=int, default=640)
+    _add_profile(p)
+    p.set_defaults(func=cmd_stack)
+
+    p = sub.add_parser("merge", help="junta vídeos em sequência")
+    p.add_argument("inputs", nargs="+")
+    p.add_argument("-o", "--output", required=True)
+    _add_profile(p)
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("audio", help="extrai o áudio (PCM 16 kHz) e analisa volume e silêncios")
+    p.add_argument("input")
+    p.add_argument("--threshold", type=float, default=-40.0, help="nível do silêncio em dBFS")
+    p.add_argument("--min-silence", type=float, default=0.5, help="duração mínima do silêncio (s)")
+    p.add_argument("--waveform", type=int, default=0, metavar="PONTOS", help="inclui a forma de onda")
+    p.set_defaults(func=cmd_audio)
+
+    p = sub.add_parser("transcribe", help="transcreve o áudio com o Whisper")
+    p.add_argument("input")
+    p.add_argument("--model", default=None, help="modelo do Whisper (padrão: WHISPER_MODEL ou base)")
+    p.add_argument("-o", "--output", help="também grava a transcrição neste JSON")
+    p.add_argument("--no-cache", action="store_true", help="transcreve de novo, ignorando o cache")
+    _add_workers(p)
+    p.set_defaults(func=cmd_transcribe)
+
+    p = sub.add_parser("suggest", help="sugere cortes com o ChatGPT")
+    p.add_argument("input")
+    p.add_argument("--niche", required=True, help="nicho/tema dos cortes")
+    p.add_argument("--model", default=None, help="modelo do Whisper (padrão: WHISPER_MODEL ou base)")
+    p.add_argument("--transcript", help="JSON gerado por 'transcribe' (pula a transcrição)")
+    p.add_argument(
+        "--stream", action="store_true",
+        help="pede os cortes por janela enquanto transcreve (com --progress, mostra os trechos; "
+        "não combina com --workers)",
+    )
+    p.add_argument(
+        "--window-minutes", type=float, default=None,
+        help="janela de cada pedido com --stream (padrão: SUGGEST_WINDOW_MINUTES ou 3)",
+    )
+    p.add_argument("--no-cache", action="store_true", help="transcreve de novo, ignorando o cache")
+    _add_workers(p)
+    p.set_defaults(func=cmd_suggest)
+
+    p = sub.add_parser("upload", help="publica o vídeo nas plataformas")
+    p.add_argument("input")
+    p.add_argument("-p", "--platforms", nargs="+", choices=PLATFORMS, help="padrão: " + " ".join(SUPPORTED_PLATFORMS))
+    p.add_argument("-d", "--description", default="", help="descrição/legenda")
+    p.set_defaults(func=cmd_upload)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # The streaming mode transcribes in order with the resident model.
+    if getattr(args, "stream", False) and (args.workers or args.chunk_minutes):
+        parser.error("--stream não pode ser usado com --workers ou --chunk-minutes")
+    timings = {}
+    started = time.perf_counter()
+    result = error = None
+    try:
+        # stdout carries only the JSON report; library prints go to stderr.
+        with redirect_stdout(sys.stderr):
+            ok, result = args.func(args, timings)
+    except KeyboardInterrupt:
+        ok, error = False, "Interrompido"
+    except Exception as exc:
+        ok, error = False, str(exc) or type(exc).__name__
+    report = {
+        "command": args.command,
+        "ok": ok,
+        "seconds": round(time.perf_counter() - started, 3),
+        "timings": timings,
+    }
+    if error is None:
+        report["result"] = result
+    else:
+        report["error"] = error
+    print(json.dumps(report, ensure_ascii=False, default=str))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,15 @@
 import os
 import datetime
+import tempfile
 import subprocess
 
-# Codec principal
-VIDEO_CODEC = "libx264"
+from keyframe_index import keyframe_after, keyframe_before
+from media_probe import probe
+from encoding_profiles import audio_args, video_args
+from ffmpeg_runner import run_ffmpeg
 
-# Configuração de qualidade
-CRF = "18"
-PRESET = "veryslow"
+# Codecs que o smart cut consegue reencodar no mesmo formato da fonte
+SMART_CUT_CODECS = ("h264", "hevc")
 
 def format_seconds(seconds: int) -> str:
     """Formata segundos em HH:MM:SS."""
@@ -21,31 +23,251 @@ def parse_time(hms: str) -> float:
     hours, minutes, seconds = parts
     return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
 
-def cut_video(input_path: str, output_path: str, start: float, end: float) -> None:
-    """Corta trecho de vídeo sem reencodar (quando possível)."""
+def cut_video(input_path: str, output_path: str, start: float, end: float, on_progress=None, cancel_event=None) -> None:
+    """Corta trecho de vídeo sem reencodar (quando possível).
+
+    Com cópia de stream o corte começa no keyframe anterior a ``start``;
+    use ``keyframe_index.keyframe_before`` para saber o ponto exato.
+    ``on_progress`` e ``cancel_event`` são repassados a ``run_ffmpeg``,
+    assim como nas demais funções deste módulo.
+    """
     cmd = [
         "ffmpeg",
+        "-y",
         "-ss", str(start),
         "-to", str(end),
         "-i", input_path,
         "-c", "copy",
         output_path
     ]
-    subprocess.run(cmd, check=True)
+    run_ffmpeg(cmd, end - start, on_progress, cancel_event)
 
-def crop_sides(input_path: str, output_path: str, left: int, right: int) -> None:
-    """Corta as laterais horizontalmente, mantendo máxima qualidade."""
-    # Pega dimensões originais
-    probe_cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-of", "csv=p=0:s=x",
-        input_path
+def _write_concat_list(paths: list, list_file: str) -> None:
+    """Escreve a lista de arquivos lida pelo demuxer concat do ffmpeg."""
+    with open(list_file, "w", encoding="utf-8") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+def _encode_segment(input_path: str, output_path: str, start: float, end: float, profile: str = None, on_progress=None, cancel_event=None) -> None:
+    """Reencoda o trecho inteiro com precisão de frame."""
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-ss", str(start),
+        "-i", input_path,
+        "-t", str(end - start),
+    ] + video_args(profile) + audio_args(profile) + [output_path]
+    run_ffmpeg(cmd, end - start, on_progress, cancel_event)
+
+def _head_encode_args(info, profile: str = None) -> list:
+    """Parâmetros para reencodar o início do corte compatível com a fonte."""
+    video = info.video
+    # Encoder de software: permite casar pix_fmt, perfil e nível da fonte.
+    args = video_args(profile, codec=video["codec_name"], hwaccel=False)
+    if video.get("pix_fmt"):
+        args += ["-pix_fmt", video["pix_fmt"]]
+    profile = (video.get("profile") or "").lower()
+    if video["codec_name"] == "h264" and profile in ("baseline", "constrained baseline", "main", "high"):
+        args += ["-profile:v", profile.replace("constrained ", "")]
+        if video.get("level"):
+            args += ["-level", str(int(video["level"]) / 10)]
+    audio = info.audio
+    if audio:
+        args += ["-c:a", "aac"]
+        if audio.get("sample_rate"):
+            args += ["-ar", str(audio["sample_rate"])]
+        if audio.get("channels"):
+            args += ["-ac", str(audio["channels"])]
+        if audio.get("bit_rate"):
+            args += ["-b:a", str(audio["bit_rate"])]
+    return args
+
+def smart_cut(input_path: str, output_path: str, start: float, end: float, profile: str = None, on_progress=None, cancel_event=None) -> str:
+    """Corta com precisão de frame reencodando só o GOP parcial do início.
+
+    O trecho entre ``start`` e o próximo keyframe é reencodado; o restante
+    é copiado sem reencodar e as duas partes são unidas com o demuxer
+    concat. Quando o codec da fonte não permite a junção (ou ela falha), o
+    trecho inteiro é reencodado. ``profile`` é o perfil de
+    ``encoding_profiles`` usado nas partes reencodadas.
+
+    Retorna o modo usado: ``"copy"``, ``"smart"`` ou ``"encode"``.
+    """
+    keyframe = keyframe_after(input_path, start)
+    if keyframe is not None and abs(keyframe - start) < 0.001:
+        cut_video(input_path, output_path, keyframe, end, on_progress, cancel_event)
+        return "copy"
+
+    info = probe(input_path)
+    audio = info.audio
+    joinable = (
+        keyframe is not None
+        and keyframe < end
+        and info.video_codec in SMART_CUT_CODECS
+        and (audio is None or info.audio_codec == "aac")
+    )
+    if joinable:
+        try:
+            head_args = _head_encode_args(info, profile)
+        except (RuntimeError, ValueError):
+            # Sem encoder para o codec da fonte (ex.: HEVC sem libx265).
+            joinable = False
+    if not joinable:
+        _encode_segment(input_path, output_path, start, end, profile, on_progress, cancel_event)
+        return "encode"
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmp:
+        # MPEG-TS mantém SPS/PPS em cada keyframe, permitindo a junção das
+        # partes mesmo com cabeçalhos de codec diferentes.
+        head = os.path.join(tmp, "head.ts")
+        tail = os.path.join(tmp, "tail.ts")
+        head_cmd = [
+            "ffmpeg",
+            "-y",
+            "-ss", str(start),
+            "-i", input_path,
+            "-t", str(keyframe - start),
+            "-map", "0:v:0",
+            "-map", "0:a:0?",
+        ] + head_args + [head]
+        tail_cmd = [
+            "ffmpeg",
+            "-y",
+            "-ss", str(keyframe),
+            "-i", input_path,
+            "-t", str(end - keyframe),
+            "-map", "0:v:0",
+            "-map", "0:a:0?",
+            "-c", "copy",
+            tail
+        ]
+        list_file = os.path.join(tmp, "list.txt")
+        _write_concat_list([head, tail], list_file)
+        concat_cmd = [
+            "ffmpeg",
+            "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", list_file,
+            "-c", "copy",
+        ]
+        if audio:
+            concat_cmd += ["-bsf:a", "aac_adtstoasc"]
+        concat_cmd.append(output_path)
+        try:
+            run_ffmpeg(head_cmd, keyframe - start, None, cancel_event)
+            run_ffmpeg(tail_cmd, end - keyframe, None, cancel_event)
+            run_ffmpeg(concat_cmd, end - start, on_progress, cancel_event)
+        except subprocess.CalledProcessError:
+            _encode_segment(input_path, output_path, start, end, profile, on_progress, cancel_event)
+            return "encode"
+    return "smart"
+
+def cut_many(input_path: str, segments, out_dir: str, on_progress=None, cancel_event=None) -> list:
+    """Corta vários trechos do mesmo vídeo com uma única execução do ffmpeg.
+
+    ``segments`` aceita tuplas ``(início, fim)`` em segundos ou dicts com
+    ``start``, ``end`` e, opcionalmente, ``output``. Sem ``output`` o arquivo
+    é salvo em ``out_dir`` como ``corte_<n>.mp4``. A fonte é lida uma única
+    vez e cada trecho vira uma saída separada do mesmo comando. Se esse
+    comando falhar, cada trecho é refeito sozinho com ``cut_video``, então o
+    resultado de cada um é independente dos outros.
+
+    Retorna uma lista de dicts (``output``, ``start``, ``end``, ``ok`` e
+    ``error``), na mesma ordem de ``segments``. Trechos cortados trazem
+    também ``cut_start``, o keyframe onde o corte realmente começa.
+    """
+    results = []
+    for index, segment in enumerate(segments, start=1):
+        if isinstance(segment, dict):
+            start = segment.get("start")
+            end = segment.get("end")
+            output = segment.get("output")
+        else:
+            start, end = segment[0], segment[1]
+            output = None
+        if not output:
+            output = os.path.join(out_dir, f"corte_{index}.mp4")
+        result = {"output": output, "start": start, "end": end, "ok": False, "error": None}
+        try:
+            result["start"] = float(start)
+            result["end"] = float(end)
+        except (TypeError, ValueError):
+            result["error"] = "Tempo inválido"
+        else:
+            if result["start"] < 0 or result["start"] >= result["end"]:
+                result["error"] = "Intervalo inválido"
+        results.append(result)
+
+    valid = [r for r in results if r["error"] is None]
+    if not valid:
+        return results
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Com cópia de stream a saída só pode começar num keyframe. Alinhar o
+    # início ao keyframe anterior deixa o resultado igual ao de cut_video.
+    for r in valid:
+        try:
+            keyframe = keyframe_before(input_path, r["start"])
+        except Exception:
+            keyframe = None
+        r["cut_start"] = r["start"] if keyframe is None else min(keyframe, r["start"])
+
+    # Busca rápida até o primeiro trecho; os demais são relativos a esse ponto.
+    base = min(r["cut_start"] for r in valid)
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-ss", str(base),
+        "-i", input_path,
     ]
-    result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-    width, height = map(int, result.stdout.strip().split("x"))
+    for r in valid:
+        cmd += [
+            "-ss", str(max(0.0, r["cut_start"] - base - 0.001)),
+            "-t", str(r["end"] - r["cut_start"]),
+            "-c", "copy",
+            r["output"],
+        ]
+    span = max(r["end"] for r in valid) - base
+    try:
+        run_ffmpeg(cmd, span, on_progress, cancel_event)
+        returncode = 0
+    except subprocess.CalledProcessError as exc:
+        returncode = exc.returncode
+
+    for r in valid:
+        if returncode == 0 and os.path.exists(r["output"]) and os.path.getsize(r["output"]) > 0:
+            r["ok"] = True
+            continue
+        # Se a execução conjunta falhou, qualquer saída pode estar truncada:
+        # cada trecho é refeito sozinho, e um intervalo ruim não derruba os demais.
+        try:
+            cut_video(input_path, r["output"], r["cut_start"], r["end"], cancel_event=cancel_event)
+        except subprocess.CalledProcessError as exc:
+            r["error"] = _ffmpeg_error(exc.returncode, exc.stderr)
+            # Não deixa para trás a saída parcial da execução conjunta.
+            if os.path.exists(r["output"]):
+                os.remove(r["output"])
+        else:
+            if os.path.exists(r["output"]) and os.path.getsize(r["output"]) > 0:
+                r["ok"] = True
+            else:
+                r["error"] = "Arquivo de saída não gerado"
+    return results
+
+def _ffmpeg_error(returncode: int, stderr: str) -> str:
+    """Última linha do stderr do ffmpeg, usada como mensagem de erro."""
+    lines = (stderr or "").strip().splitlines()
+    return lines[-1] if lines else f"ffmpeg retornou {returncode}"
+
+def crop_sides(input_path: str, output_path: str, left: int, right: int, profile: str = None, on_progress=None, cancel_event=None) -> None:
+    """Corta as laterais horizontalmente usando o perfil de codificação ``profile``."""
+    # Pega dimensões originais
+    info = probe(input_path)
+    width, height = info.size
 
     # Calcula nova largura e garante múltiplo de 2
     new_width = width - left - right
@@ -67,60 +289,203 @@ def crop_sides(input_path: str, output_path: str, left: int, right: int) -> None
 
     cmd = [
         "ffmpeg",
+        "-y",
         "-i", input_path,
         "-filter:v", f"crop={new_width}:{height}:{x}:{y}",
-        "-c:v", VIDEO_CODEC,
-        "-crf", CRF,
-        "-preset", PRESET,
+    ] + video_args(profile) + [
         "-c:a", "copy",
         output_path
     ]
-    subprocess.run(cmd, check=True)
+    run_ffmpeg(cmd, info.duration, on_progress, cancel_event)
+
+def split_grid(input_path: str, outputs: list, rows: int = 1, cols: int = 2, profile: str = None, on_progress=None, cancel_event=None) -> None:
+    """Divide o vídeo numa grade ``rows`` x ``cols`` com uma só decodificação.
+
+    Um único ffmpeg decodifica a fonte uma vez, replica os frames com
+    ``split`` e recorta cada célula com ``crop``; as células são codificadas
+    em paralelo no mesmo processo. ``outputs`` segue a ordem de leitura da
+    grade (linha a linha, da esquerda para a direita), ex.: quadrantes de
+    gravações multicâmera com ``rows=2, cols=2``.
+    """
+    count = rows * cols
+    if count < 1 or len(outputs) != count:
+        raise ValueError("Número de saídas não corresponde à grade.")
 
-def cut_vertical_halves(input_path: str, left_output: str, right_output: str) -> None:
-    """Divide vídeo em metades verticais com máxima qualidade."""
     # Pega dimensões originais
-    probe_cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-of", "csv=p=0:s=x",
-        input_path
-    ]
-    result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-    width, height = map(int, result.stdout.strip().split("x"))
+    info = probe(input_path)
+    width, height = info.size
 
-    # Calcula metade e garante múltiplo de 2
-    half_width = width // 2
-    if half_width % 2 != 0:
-        half_width -= 1
+    # Calcula o tamanho das células e garante múltiplos de 2
+    tile_width = width // cols
+    if tile_width % 2 != 0:
+        tile_width -= 1
+    tile_height = height // rows
+    if tile_height % 2 != 0:
+        tile_height -= 1
+    if tile_width <= 0 or tile_height <= 0:
+        raise ValueError("Grade maior que o vídeo.")
 
-    if height % 2 != 0:
-        height -= 1
+    filters = ["[0:v]split=" + str(count) + "".join(f"[s{i}]" for i in range(count))]
+    for i in range(count):
+        row, col = divmod(i, cols)
+        x = col * tile_width
+        y = row * tile_height
+        filters.append(f"[s{i}]crop={tile_width}:{tile_height}:{x}:{y}[v{i}]")
 
-    # Metade esquerda
-    left_cmd = [
+    cmd = [
         "ffmpeg",
+        "-y",
         "-i", input_path,
-        "-filter:v", f"crop={half_width}:{height}:0:0",
-        "-c:v", VIDEO_CODEC,
-        "-crf", CRF,
-        "-preset", PRESET,
-        "-c:a", "copy",
-        left_output
+        "-filter_complex", ";".join(filters),
     ]
-    subprocess.run(left_cmd, check=True)
+    for i, output in enumerate(outputs):
+        cmd += [
+            "-map", f"[v{i}]",
+            "-map", "0:a:0?",
+        ] + video_args(profile) + [
+            "-c:a", "copy",
+            output
+        ]
+    run_ffmpeg(cmd, info.duration, on_progress, cancel_event)
 
-    # Metade direita
-    right_cmd = [
-        "ffmpeg",
-        "-i", input_path,
-        "-filter:v", f"crop={half_width}:{height}:{half_width}:0",
-        "-c:v", VIDEO_CODEC,
-        "-crf", CRF,
-        "-preset", PRESET,
-        "-c:a", "copy",
-        right_output
-    ]
-    subprocess.run(right_cmd, check=True)
+def cut_vertical_halves(input_path: str, left_output: str, right_output: str, profile: str = None, on_progress=None, cancel_event=None) -> None:
+    """Divide vídeo em metades verticais."""
+    split_grid(
+        input_path,
+        [left_output, right_output],
+        rows=1,
+        cols=2,
+        profile=profile,
+        on_progress=on_progress,
+        cancel_event=cancel_event,
+    )
+
+# Parâmetros que precisam coincidir para juntar arquivos sem reencodar
+CONCAT_VIDEO_KEYS = ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate", "time_base")
+CONCAT_AUDIO_KEYS = ("codec_name", "sample_rate", "channels")
+
+def _concat_signature(info) -> tuple:
+    video = info.video or {}
+    audio = info.audio
+    return (
+        tuple(video.get(k) for k in CONCAT_VIDEO_KEYS),
+        None if audio is None else tuple(audio.get(k) for k in CONCAT_AUDIO_KEYS),
+    )
+
+def can_concat_copy(paths: list) -> bool:
+    """Indica se os arquivos têm streams compatíveis para juntar sem reencodar."""
+    infos = [probe(p) for p in paths]
+    if any(info.video is None for info in infos):
+        return False
+    return len({_concat_signature(info) for info in infos}) == 1
+
+def _merge_copy(paths: list, output_path: str, duration: float, on_progress=None, cancel_event=None) -> None:
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmp:
+        list_file = os.path.join(tmp, "list.txt")
+        _write_concat_list(paths, list_file)
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", list_file,
+            "-c", "copy",
+            output_path
+        ]
+        run_ffmpeg(cmd, duration, on_progress, cancel_event)
+
+def _merge_encode(paths: list, output_path: str, profile: str = None, on_progress=None, cancel_event=None) -> None:
+    infos = [probe(p) for p in paths]
+    first = infos[0]
+    width = first.width - first.width % 2
+    height = first.height - first.height % 2
+    fps = round(first.fps, 3) if first.fps else 30
+    has_audio = any(info.audio for info in infos)
+
+    cmd = ["ffmpeg", "-y"]
+    for path in paths:
+        cmd += ["-i", path]
+    filters = []
+    labels = ""
+    for i, info in enumerate(infos):
+        # Ajusta cada vídeo ao tamanho e fps do primeiro, com barras se preciso.
+        filters.append(
+            f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p[v{i}]"
+        )
+        labels += f"[v{i}]"
+        if has_audio:
+            if info.audio:
+                filters.append(
+                    f"[{i}:a]aresample=48000,aformat=sample_fmts=fltp:channel_layouts=stereo[a{i}]"
+                )
+            else:
+                filters.append(
+                    f"anullsrc=r=48000:cl=stereo,atrim=duration={info.duration}[a{i}]"
+                )
+            labels += f"[a{i}]"
+    filters.append(f"{labels}concat=n={len(paths)}:v=1:a={1 if has_audio else 0}[v]" + ("[a]" if has_audio else ""))
+    cmd += ["-filter_complex", ";".join(filters), "-map", "[v]"]
+    if has_audio:
+        cmd += ["-map", "[a]"] + audio_args(profile)
+    cmd += video_args(profile) + [output_path]
+    run_ffmpeg(cmd, sum(info.duration for info in infos), on_progress, cancel_event)
+
+def merge_videos(paths: list, output_path: str, profile: str = None, on_progress=None, cancel_event=None) -> str:
+    """Junta vídeos em sequência, sem reencodar sempre que possível.
+
+    Arquivos com streams compatíveis (mesmo codec, resolução, formato de
+    pixel, taxa de quadros e áudio) são unidos pelo demuxer concat com
+    cópia de stream. Caso contrário, ou se a cópia falhar, tudo é
+    reencodado num único filter graph com o perfil ``profile``.
+
+    Retorna o modo usado: ``"copy"`` ou ``"encode"``.
+    """
+    if not paths:
+        raise ValueError("Nenhum vídeo para mesclar.")
+    if can_concat_copy(paths):
+        duration = sum(probe(p).duration for p in paths)
+        try:
+            _merge_copy(paths, output_path, duration, on_progress, cancel_event)
+            return "copy"
+        except subprocess.CalledProcessError:
+            pass
+    _merge_encode(paths, output_path, profile, on_progress, cancel_event)
+    return "encode"
+
+def stack_videos(
+    top_path: str,
+    bottom_path: str,
+    output_path: str,
+    audio_from_top: bool = True,
+    width: int = 720,
+    height: int = 640,
+    profile: str = None,
+    on_progress=None,
+    cancel_event=None,
+) -> None:
+    """Empilha dois vídeos verticalmente num único filter graph do ffmpeg.
+
+    Cada vídeo é redimensionado para ``width`` x ``height`` com Lanczos e
+    os dois são unidos com ``vstack``. O vídeo que fornece o áudio define a
+    duração; o outro é repetido com ``-stream_loop`` até completá-la.
+    """
+    duration = probe(top_path if audio_from_top else bottom_path).duration
+    cmd = ["ffmpeg", "-y"]
+    if audio_from_top:
+        cmd += ["-i", top_path, "-stream_loop", "-1", "-i", bottom_path]
+    else:
+        cmd += ["-stream_loop", "-1", "-i", top_path, "-i", bottom_path]
+    graph = (
+        f"[0:v]scale={width}:{height}:flags=lanczos,setsar=1[top];"
+        f"[1:v]scale={width}:{height}:flags=lanczos,setsar=1[bottom];"
+        "[top][bottom]vstack=inputs=2,format=yuv420p[v]"
+    )
+    cmd += [
+        "-filter_complex", graph,
+        "-map", "[v]",
+        "-map", f"{0 if audio_from_top else 1}:a:0?",
+        "-t", str(duration),
+    ] + video_args(profile) + audio_args(profile) + [output_path]
+    run_ffmpeg(cmd, duration, on_progress, cancel_event)
@@ -6,6 +6,11 @@ organized in ``videos/<data>/<plataforma>``.
 The cut screen allows selecting a local file and saving the same
 cut in each platform directory. This is a basic example that can
 be extended with ChatGPT integration for automatic clipping.
+
+Slow dependencies (yt-dlp, OpenAI, Whisper, Instaloader, the video
+player) are imported where they are used and preloaded in the
+background after the menu appears (see ``preload``). Keep them out of
+the module level imports; ``benchmarks/import_time.py`` checks this.
 """
 from datetime import datetime
 import os
@@ -13,8 +18,7 @@ import threading
 import logging
 from pathlib import Path
 import json
-
-VIDEO_CODEC = "h264_nvenc" if os.getenv("VIDEO_HWACCEL") else "libx264"
+import math
 
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
@@ -29,14 +33,10 @@ from kivy.uix.modalview import ModalView
 from kivy.clock import Clock, mainthread
 from kivy.utils import platform
 import webbrowser
-from kivy.uix.videoplayer import VideoPlayer
+from kivy.uix.image import AsyncImage
 from kivy.uix.checkbox import CheckBox
 from kivy.uix.gridlayout import GridLayout
-from urllib.parse import urlparse
-import re
-import openai
 from dotenv import load_dotenv
-import whisper
 
 load_dotenv()
 
@@ -48,32 +48,44 @@ logging.basicConfig(
     format="%(asctime)s %(levelname)s %(message)s",
 )
 
-import yt_dlp
-import instaloader
-from moviepy.editor import VideoFileClip, concatenate_videoclips
-from video_cut_utils import cut_video
-from PIL import Image
-from moviepy.audio.io.ffmpeg_audiowriter import FFMPEG_AudioWriter
-
-# Pillow >=10 removed the Image.ANTIALIAS constant used by MoviePy.
-# Provide a fallback for compatibility with older MoviePy versions.
-if not hasattr(Image, "ANTIALIAS"):
-    Image.ANTIALIAS = Image.Resampling.LANCZOS
-
-# Fix a bug in MoviePy 1.0.3 where ``FFMPEG_AudioWriter`` may not define
-# the ``ext`` attribute before ``write_frames`` is called. This leads to an
-# ``AttributeError`` when audio encoding fails (e.g. due to missing codecs).
-# Ensure ``ext`` is always set so the error handling works correctly.
-if not hasattr(FFMPEG_AudioWriter, "_ext_patch"):
-    _orig_init = FFMPEG_AudioWriter.__init__
-
-    def _init_with_ext(self, filename, *a, **k):
-        _orig_init(self, filename, *a, **k)
-        if not hasattr(self, "ext"):
-            self.ext = os.path.splitext(filename)[1]
-
-    FFMPEG_AudioWriter.__init__ = _init_with_ext
-    FFMPEG_AudioWriter._ext_patch = True
+from downloader import (
+    _get_platform_dir,
+    batch_percent,
+    detect_platform,
+    download,
+    download_batch,
+    download_clips,
+    fetch_info,
+    format_summary,
+    parse_ranges,
+    parse_urls,
+    read_url_file,
+)
+from video_cut_utils import cut_video, cut_many, merge_videos, smart_cut
+from suggestions import hms_to_seconds, seconds_to_hms, suggest, suggest_stream
+from uploader import upload_videos
+from keyframe_index import build_index_async, keyframe_before
+from media_probe import probe
+from encoding_profiles import PROFILES
+from download_settings import format_size, load_settings
+from format_policies import POLICIES, default_policy, select_format
+from metadata_cache import summary as info_summary
+from ffmpeg_runner import FFmpegCancelled, format_progress
+from progress_aggregator import PROGRESS_FPS, format_snapshot, get_aggregator
+from preload import preload_in_background
+from whisper_models import WHISPER_MODELS, default_model_name, get_model
+from job_scheduler import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    FINISHED_STATES,
+    PRIORITY_LOW,
+    QUEUED,
+    RUNNING,
+    current_job,
+    get_scheduler,
+    report_progress,
+)
 
 try:
     from tkinter import filedialog, Tk
@@ -84,107 +96,25 @@ except Exception:
 
 # Helper functions ---------------------------------------------------------
 
-def _get_platform_dir(platform: str) -> str:
-    """Return directory for the current date and platform."""
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    path = os.path.join("videos", date_str, platform)
-    os.makedirs(path, exist_ok=True)
-    return path
-
-
-def hms_to_seconds(value: str) -> float:
-    """Convert HH:MM:SS string to seconds."""
-    parts = value.strip().split(":")
-    try:
-        parts = [float(p) for p in parts]
-    except ValueError:
-        raise ValueError("Tempo inválido")
-    if len(parts) == 3:
-        h, m, s = parts
-    elif len(parts) == 2:
-        h = 0
-        m, s = parts
-    elif len(parts) == 1:
-        h = 0
-        m = 0
-        s = parts[0]
-    else:
-        raise ValueError("Tempo inválido")
-    return h * 3600 + m * 60 + s
-
-
-def seconds_to_hms(value: float) -> str:
-    """Format seconds into a ``HH:MM:SS`` string."""
-    total = int(round(value))
-    h = total // 3600
-    m = (total % 3600) // 60
-    s = total % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
-
-
-def parse_suggestions(text):
-    """Parse ChatGPT response into a list of suggestions."""
+def _remove_file(path: str) -> None:
+    """Delete a partially written output, ignoring missing files."""
     try:
-        data = json.loads(text)
-    except Exception:
-        data = None
-
-    suggestions = []
-    if isinstance(data, list):
-        for item in data:
-            suggestions.append(
-                {
-                    "title": item.get("title", ""),
-                    "description": item.get("description", ""),
-                    "start": item.get("start", ""),
-                    "end": item.get("end", ""),
-                }
-            )
-        if suggestions:
-            return suggestions
-
-    for line in text.splitlines():
-        m = re.search(
-            r"(\d{2}:\d{2}:\d{2}).*?(\d{2}:\d{2}:\d{2})(?:\s*-?\s*(.*))?",
-            line,
-        )
-        if not m:
-            continue
-        start, end, title = m.group(1), m.group(2), (m.group(3) or "").strip()
-        if not title:
-            title = f"Corte {len(suggestions) + 1}"
-        suggestions.append({"start": start, "end": end, "title": title, "description": ""})
-    return suggestions
+        os.remove(path)
+    except OSError:
+        pass
 
 
-def extract_instagram_shortcode(url: str) -> str:
-    """Return the shortcode from an Instagram URL.
+def seconds_to_hms_ms(value: float) -> str:
+    """Format seconds into ``HH:MM:SS.mmm``, rounding up to the millisecond.
 
-    Raises ``ValueError`` if no shortcode can be determined.
+    Rounding up keeps a keyframe timestamp from being written slightly
+    before the keyframe, which would make the cut start one GOP earlier.
     """
-    parsed = urlparse(url)
-    path = parsed.path.strip("/")
-    if not path:
-        raise ValueError("URL inválida")
-    shortcode = path.split("/")[-1]
-    if not shortcode or shortcode.startswith("?"):
-        raise ValueError("URL inválida")
-    # remove any possible trailing parameters
-    shortcode = re.split(r"[/?#]", shortcode)[0]
-    if not shortcode:
-        raise ValueError("URL inválida")
-    return shortcode
-
-
-class MyLogger:
-    def debug(self, msg):
-        pass
-
-    def warning(self, msg):
-        pass
-
-    def error(self, msg):
-        print(msg)
+    total_ms = int(math.ceil(round(value * 1000, 6)))
+    h = total_ms // 3600000
+    m = (total_ms % 3600000) // 60000
+    s = (total_ms % 60000) / 1000
+    return f"{h:02d}:{m:02d}:{s:06.3f}"
 
 
 def open_post_screen(path):
@@ -207,37 +137,6 @@ def ask_upload(paths):
     open_post_screen(path)
 
 
-def upload_videos(paths, descriptions=None):
-    """Upload video to available platforms using provided descriptions."""
-    from uploader import youtube, instagram, tiktok, facebook, x
-    if "youtube" in paths:
-        try:
-            youtube.upload_video(paths["youtube"], title="Corte")
-        except Exception as exc:
-            print("YouTube upload failed:", exc)
-    if "instagram" in paths:
-        try:
-            caption = "" if descriptions is None else descriptions.get("instagram", "")
-            instagram.upload_video(paths["instagram"], caption=caption)
-        except Exception as exc:
-            print("Instagram upload failed:", exc)
-    if "tiktok" in paths:
-        try:
-            tiktok.upload_video(paths["tiktok"])
-        except Exception as exc:
-            print("TikTok upload failed:", exc)
-    if "facebook" in paths:
-        try:
-            facebook.upload_video(paths["facebook"], description=descriptions.get("facebook", "") if descriptions else "")
-        except Exception as exc:
-            print("Facebook upload failed:", exc)
-    if "x" in paths:
-        try:
-            x.upload_video(paths["x"], description=descriptions.get("x", "") if descriptions else "")
-        except Exception as exc:
-            print("X upload failed:", exc)
-
-
 # Screens -----------------------------------------------------------------
 
 class MenuScreen(Screen):
@@ -257,6 +156,9 @@ class MenuScreen(Screen):
         btn_saved = Button(text="Sugestões Salvas")
         btn_saved.bind(on_press=lambda *_: setattr(self.manager, "current", "suggestions"))
         layout.add_widget(btn_saved)
+        btn_jobs = Button(text="Tarefas")
+        btn_jobs.bind(on_press=lambda *_: setattr(self.manager, "current", "jobs"))
+        layout.add_widget(btn_jobs)
         btn_conf = Button(text="Configurar API")
         btn_conf.bind(on_press=lambda *_: setattr(self.manager, "current", "config"))
         layout.add_widget(btn_conf)
@@ -268,6 +170,23 @@ class DownloadScreen(Screen):
         super().__init__(**kwargs)
         self.url_input = TextInput(hint_text="URL", size_hint_y=None, height=40)
         self.progress = ProgressBar(max=100, size_hint_y=None, height=30)
+        self.rate_label = Label(size_hint_y=None, height=30)
+        self._single_url = None
+        self._progress_version = None
+        self._progress_event = None
+        self.info_thumb = AsyncImage(size_hint=(None, None), size=(160, 90))
+        self.info_label = Label(text="", halign="left", valign="middle")
+        self.info_label.bind(size=lambda lbl, size: setattr(lbl, "text_size", size))
+        # Fetch title/duration/formats shortly after the URL stops changing.
+        self._info_trigger = Clock.create_trigger(self.fetch_info, 0.8)
+        self.url_input.bind(text=lambda *_: self._info_trigger())
+        self.batch_input = TextInput(hint_text="Uma URL por linha", size_hint_y=None, height=100)
+        self.batch_progress = ProgressBar(max=100, size_hint_y=None, height=30)
+        self.batch_status = Label(size_hint_y=None, height=30)
+        self.batch_box = GridLayout(cols=1, size_hint_y=None)
+        self.batch_box.bind(minimum_height=self.batch_box.setter("height"))
+        self._batch_items = []
+        self._batch_trigger = Clock.create_trigger(self._refresh_batch, 0.25)
         self._loading = None
 
         layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
@@ -289,10 +208,28 @@ class DownloadScreen(Screen):
         layout.add_widget(icons)
         layout.add_widget(Label(text="URL do vídeo:"))
         layout.add_widget(self.url_input)
+        info_row = BoxLayout(size_hint_y=None, height=90, spacing=10)
+        info_row.add_widget(self.info_thumb)
+        info_row.add_widget(self.info_label)
+        layout.add_widget(info_row)
         btn = Button(text="Baixar", size_hint_y=None, height=40)
         btn.bind(on_press=self.start_download)
         layout.add_widget(btn)
         layout.add_widget(self.progress)
+        layout.add_widget(self.rate_label)
+        layout.add_widget(Label(text="Download em lote:"))
+        layout.add_widget(self.batch_input)
+        batch_buttons = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        btn_file = Button(text="Carregar Arquivo")
+        btn_file.bind(on_press=self.choose_url_file)
+        batch_buttons.add_widget(btn_file)
+        btn_batch = Button(text="Baixar Lista")
+        btn_batch.bind(on_press=self.start_batch)
+        batch_buttons.add_widget(btn_batch)
+        layout.add_widget(batch_buttons)
+        layout.add_widget(self.batch_progress)
+        layout.add_widget(self.batch_status)
+        layout.add_widget(self.batch_box)
         back = Button(text="Voltar", size_hint_y=None, height=40)
         back.bind(on_press=lambda *_: setattr(self.manager, "current", "menu"))
         layout.add_widget(back)
@@ -302,6 +239,28 @@ class DownloadScreen(Screen):
     def update_progress(self, value):
         self.progress.value = value
 
+    # Download threads only feed the aggregator; the screen reads it
+    # PROGRESS_FPS times per second while visible.
+    def on_pre_enter(self, *_):
+        if self._progress_event is None:
+            self._progress_event = Clock.schedule_interval(self._tick_progress, 1 / PROGRESS_FPS)
+
+    def on_leave(self, *_):
+        if self._progress_event is not None:
+            self._progress_event.cancel()
+            self._progress_event = None
+
+    def _tick_progress(self, *_):
+        aggregator = get_aggregator()
+        if aggregator.version == self._progress_version:
+            return
+        self._progress_version = aggregator.version
+        self.rate_label.text = format_snapshot(aggregator.snapshot())
+        if self._single_url is not None:
+            percent = aggregator.percent(self._single_url)
+            if percent is not None:
+                self.progress.value = percent
+
     # Loading helpers -----------------------------------------------------
     def show_loading(self):
         if self._loading is None:
@@ -325,12 +284,6 @@ class DownloadScreen(Screen):
         btn.bind(on_press=popup.dismiss)
         popup.open()
 
-
-
-
-
-
-
     def open_site(self, url):
         # Use different behavior depending on the current platform
         if platform in ("android", "ios"):
@@ -338,104 +291,141 @@ class DownloadScreen(Screen):
         else:
             webbrowser.open(url, new=1)
 
-    # Download helpers -----------------------------------------------------
-    def _hook(self, d):
-        if d.get("status") == "downloading":
-            percent_str = d.get("_percent_str", "0").replace("%", "").strip()
-            try:
-                self.update_progress(float(percent_str))
-            except ValueError:
-                pass
-        elif d.get("status") == "finished":
-            self.update_progress(100)
-            Clock.schedule_once(self.hide_loading)
-
-    def _download_youtube(self, url):
-        path = _get_platform_dir("youtube")
-        opts = {
-            "format": "bestvideo+bestaudio/best",
-            "outtmpl": os.path.join(path, "%(title)s.%(ext)s"),
-            "quiet": True,
-            "no_warnings": True,
-            "logger": MyLogger(),
-            "progress_hooks": [self._hook],
-        }
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            ydl.download([url])
-        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", "Download concluído"))
-
-    def _download_tiktok(self, url):
-        path = _get_platform_dir("tiktok")
-        opts = {
-            "format": "bestvideo+bestaudio/best",
-            "outtmpl": os.path.join(path, "%(title)s.%(ext)s"),
-            "merge_output_format": "mp4",
-            "quiet": True,
-            "no_warnings": True,
-            "logger": MyLogger(),
-            "progress_hooks": [self._hook],
-        }
-        cookie_file = os.getenv("TIKTOK_COOKIES_FILE")
-        cookie_browser = os.getenv("TIKTOK_COOKIES_BROWSER")
-        if not cookie_file and not cookie_browser:
-            Clock.schedule_once(
-                lambda *_: self.show_popup(
-                    "Erro",
-                    "TikTok requer autenticação. Defina TIKTOK_COOKIES_FILE ou TIKTOK_COOKIES_BROWSER no .env",
-                )
-            )
+    # Metadata preview ----------------------------------------------------
+    def fetch_info(self, *_):
+        url = self.url_input.text.strip()
+        self.info_thumb.source = ""
+        if detect_platform(url) not in ("youtube", "tiktok"):
+            self.info_label.text = ""
             return
-        if cookie_file:
-            if not os.path.exists(cookie_file):
-                Clock.schedule_once(
-                    lambda *_: self.show_popup(
-                        "Erro", f"Arquivo de cookies não encontrado: {cookie_file}"
-                    )
-                )
-                return
-            opts["cookiefile"] = cookie_file
-        elif cookie_browser:
-            opts["cookiesfrombrowser"] = cookie_browser
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            try:
-                ydl.download([url])
-            except yt_dlp.utils.DownloadError as exc:
-                msg = str(exc)
-                if "login" in msg.lower():
-                    msg += "\nDefina TIKTOK_COOKIES_FILE ou TIKTOK_COOKIES_BROWSER no .env"
-                Clock.schedule_once(lambda *_: self.show_popup("Erro", msg))
-                return
-        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", "Download concluído"))
+        self.info_label.text = "Buscando informações..."
+        get_scheduler().submit("metadata", self._fetch_info, url, name=f"Informações {url}")
 
-    def _download_instagram(self, url):
-        path = _get_platform_dir("instagram")
-        loader = instaloader.Instaloader(dirname_pattern=path, filename_pattern="{shortcode}")
+    def _fetch_info(self, url):
         try:
-            shortcode = extract_instagram_shortcode(url)
-        except ValueError as exc:
-            Clock.schedule_once(lambda *_: self.show_popup("Erro", str(exc)))
+            info = fetch_info(url)
+        except Exception as exc:
+            self._show_info(url, None, str(exc))
+            raise
+        self._show_info(url, info)
+
+    @mainthread
+    def _show_info(self, url, info, error=None):
+        if url != self.url_input.text.strip():
+            return  # the URL changed while the request was running
+        if info is None:
+            self.info_label.text = f"Não foi possível obter informações: {error}"
             return
+        meta = info_summary(info)
+        lines = [meta["title"]]
+        if meta["duration"]:
+            lines.append(f"Duração: {seconds_to_hms(meta['duration'])}")
+        if meta["heights"]:
+            lines.append("Resoluções: " + ", ".join(f"{h}p" for h in meta["heights"]))
+        policy = default_policy()
+        lines.append(f"Formato ({policy}): {select_format(info.get('formats') or [], policy)}")
+        self.info_label.text = "\n".join(lines)
+        self.info_thumb.source = meta["thumbnail"] or ""
+
+    # Download helpers -----------------------------------------------------
+    def _download(self, url):
+        aggregator = get_aggregator()
         try:
-            post = instaloader.Post.from_shortcode(loader.context, shortcode)
-            loader.download_post(post, target="post")
+            # The percent of a single stream restarts at 0 for the audio of a
+            # merged download; the aggregator combines both.
+            path = download(url, on_progress=lambda p: report_progress(aggregator.percent(url) or p))
         except Exception as exc:
-            Clock.schedule_once(lambda *_: self.show_popup("Erro", f"Falha no download: {exc}"))
-            return
-        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", "Download concluído"))
+            Clock.schedule_once(self.hide_loading)
+            Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
+            raise
+        self.update_progress(100)
+        Clock.schedule_once(self.hide_loading)
+        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", f"Download concluído\n{path}"))
 
     def start_download(self, *_):
+        url = self.url_input.text.strip()
+        if detect_platform(url) is None:
+            self.show_popup("Erro", "Plataforma não reconhecida")
+            return
         self.progress.value = 0
+        self._single_url = url
         self.show_loading()
-        url = self.url_input.text
-        if "youtube" in url:
-            threading.Thread(target=self._download_youtube, args=(url,), daemon=True).start()
-        elif "tiktok" in url:
-            threading.Thread(target=self._download_tiktok, args=(url,), daemon=True).start()
-        elif "instagram" in url:
-            threading.Thread(target=self._download_instagram, args=(url,), daemon=True).start()
-        else:
-            self.hide_loading()
-            self.show_popup("Erro", "Plataforma não reconhecida")
+        get_scheduler().submit("download", self._download, url, name=f"Download {url}")
+
+    # Batch downloads ------------------------------------------------------
+    def choose_url_file(self, *_):
+        if filedialog is None:
+            return
+        root = Tk(); root.withdraw()
+        path = filedialog.askopenfilename(title="Selecione o arquivo de URLs")
+        root.destroy()
+        if path:
+            try:
+                urls = read_url_file(path)
+            except OSError as exc:
+                self.show_popup("Erro", str(exc))
+                return
+            self.batch_input.text = "\n".join(urls)
+
+    def start_batch(self, *_):
+        urls = parse_urls(self.batch_input.text)
+        if not urls:
+            self.show_popup("Aviso", "Nenhuma URL informada")
+            return
+        unknown = [u for u in urls if detect_platform(u) is None]
+        if unknown:
+            self.show_popup("Erro", "Plataforma não reconhecida:\n" + "\n".join(unknown))
+            return
+        self._batch_items = [
+            {"url": u, "status": "pending", "percent": 0.0, "error": None} for u in urls
+        ]
+        self._refresh_batch()
+        cancel_event = threading.Event()
+        get_scheduler().submit(
+            "download",
+            self._download_batch,
+            urls,
+            cancel_event,
+            name=f"Lote de {len(urls)} downloads",
+            cancel_event=cancel_event,
+        )
+
+    def _download_batch(self, urls, cancel_event):
+        items = download_batch(urls, on_update=self._on_batch_update, cancel_event=cancel_event)
+        summary = format_summary(items)
+        failed = any(item["status"] == "failed" for item in items)
+        Clock.schedule_once(lambda *_: self.show_popup("Aviso" if failed else "Sucesso", summary))
+        return items
+
+    def _on_batch_update(self, index, item):
+        # Called from the download threads; the trigger refreshes the
+        # widgets on the Kivy thread at most every 0.25 s.
+        self._batch_items[index] = dict(item)
+        report_progress(batch_percent(self._batch_items))
+        self._batch_trigger()
+
+    BATCH_LABELS = {
+        "pending": "Aguardando",
+        "downloading": "Baixando",
+        "done": "Concluído",
+        "failed": "Falhou",
+        "cancelled": "Cancelado",
+    }
+
+    def _refresh_batch(self, *_):
+        items = list(self._batch_items)
+        self.batch_progress.value = batch_percent(items)
+        done = sum(1 for item in items if item["status"] == "done")
+        failed = sum(1 for item in items if item["status"] == "failed")
+        self.batch_status.text = f"{done}/{len(items)} concluídos, {failed} falha(s)"
+        self.batch_box.clear_widgets()
+        for item in items:
+            text = f"{self.BATCH_LABELS[item['status']]}: {item['url']}"
+            if item["status"] == "downloading":
+                text = f"{item['percent']:.0f}% {text}"
+            elif item["status"] == "failed":
+                text += f" ({item['error']})"
+            self.batch_box.add_widget(Label(text=text, size_hint_y=None, height=30))
 
 
 
@@ -492,6 +482,8 @@ class PostScreen(Screen):
         if not self.niche_input.text.strip():
             self.show_popup("Erro", "Informe o nicho/tema")
             return
+        import openai
+
         openai.api_key = key
         prompt = (
             "Crie descrições curtas e engajantes para um vídeo sobre '"
@@ -535,8 +527,21 @@ class PostScreen(Screen):
         if not paths:
             self.show_popup("Aviso", "Nenhuma plataforma selecionada")
             return
-        threading.Thread(target=upload_videos, args=(paths, descriptions), daemon=True).start()
-        self.show_popup("Info", "Upload iniciado")
+        get_scheduler().submit(
+            "upload", self._upload_thread, paths, descriptions, name=f"Upload {os.path.basename(path)}"
+        )
+        self.show_popup("Info", "Upload adicionado à fila")
+
+    def _upload_thread(self, paths, descriptions):
+        results = upload_videos(paths, descriptions)
+        failed = {platform: error for platform, error in results.items() if error}
+        if not failed:
+            Clock.schedule_once(lambda *_: self.show_popup("Sucesso", "Upload concluído"))
+            return results
+        message = "\n".join(f"{platform}: {error}" for platform, error in failed.items())
+        Clock.schedule_once(lambda *_: self.show_popup("Erro", f"Falha no upload:\n{message}"))
+        # Raising marks the job as failed on the jobs screen.
+        raise RuntimeError(f"Falha no upload: {', '.join(failed)}")
 
     def show_popup(self, title, message):
         popup_layout = BoxLayout(orientation="vertical", padding=10)
@@ -556,9 +561,13 @@ class CutScreen(Screen):
         self.start_input = TextInput(hint_text="Início (HH:MM:SS)", size_hint_y=None, height=40)
         self.end_input = TextInput(hint_text="Fim (HH:MM:SS)", size_hint_y=None, height=40)
         self.progress = ProgressBar(max=100, size_hint_y=None, height=30)
+        self.keyframe_label = Label(text="", size_hint_y=None, height=30)
         self.start_slider = None
         self.end_slider = None
         self._loading = None
+        self._loading_status = None
+        self._cancel_event = threading.Event()
+        self._job = None
 
         layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
         btn_choose = Button(text="Selecionar Vídeo")
@@ -567,6 +576,17 @@ class CutScreen(Screen):
         layout.add_widget(self.file_path)
         layout.add_widget(self.start_input)
         layout.add_widget(self.end_input)
+        kf_row = BoxLayout(size_hint_y=None, height=30)
+        kf_row.add_widget(self.keyframe_label)
+        btn_snap = Button(text="Ajustar ao keyframe", size_hint_x=None, width=180)
+        btn_snap.bind(on_press=self.snap_to_keyframe)
+        kf_row.add_widget(btn_snap)
+        layout.add_widget(kf_row)
+        precise_row = BoxLayout(size_hint_y=None, height=30)
+        self.precise_check = CheckBox(active=False, size_hint_x=None, width=40)
+        precise_row.add_widget(self.precise_check)
+        precise_row.add_widget(Label(text="Corte preciso (reencoda só o início)"))
+        layout.add_widget(precise_row)
         self.slider_box = BoxLayout(orientation="vertical")
         layout.add_widget(self.slider_box)
         btn_cut = Button(text="Cortar", size_hint_y=None, height=40)
@@ -591,7 +611,7 @@ class CutScreen(Screen):
         if path:
             self.file_path.text = path
             try:
-                duration = VideoFileClip(path).duration
+                duration = probe(path).duration
             except Exception as exc:
                 self.show_popup("Erro", str(exc))
                 return
@@ -604,17 +624,45 @@ class CutScreen(Screen):
             self.slider_box.add_widget(self.end_slider)
             self.start_input.text = "00:00:00"
             self.end_input.text = seconds_to_hms(duration)
+            self.keyframe_label.text = "Lendo keyframes..."
+            build_index_async(
+                path, lambda *_: Clock.schedule_once(self._update_keyframe_label)
+            )
 
     @mainthread
     def update_progress(self, value):
         self.progress.value = value
 
+    def _start_keyframe(self):
+        """Return the keyframe where a copy cut at the current start begins."""
+        path = self.file_path.text
+        if not path:
+            return None
+        try:
+            start = hms_to_seconds(self.start_input.text)
+            return keyframe_before(path, start, build=False)
+        except (OSError, ValueError):
+            return None
+
+    def _update_keyframe_label(self, *_):
+        keyframe = self._start_keyframe()
+        if keyframe is None:
+            self.keyframe_label.text = ""
+        else:
+            self.keyframe_label.text = f"Corte começa em {seconds_to_hms_ms(keyframe)} (keyframe)"
+
+    def snap_to_keyframe(self, *_):
+        keyframe = self._start_keyframe()
+        if keyframe is not None:
+            self.start_input.text = seconds_to_hms_ms(keyframe)
+
     def _on_start_slider(self, instance, value):
         if getattr(self, "_sync", False):
             return
         self._sync = True
         self.start_input.text = seconds_to_hms(value)
         self._sync = False
+        self._update_keyframe_label()
 
     def _on_end_slider(self, instance, value):
         if getattr(self, "_sync", False):
@@ -634,6 +682,7 @@ class CutScreen(Screen):
             self._sync = True
             self.start_slider.value = sec
             self._sync = False
+        self._update_keyframe_label()
 
     def _on_end_text(self, instance, value):
         if getattr(self, "_sync", False):
@@ -647,29 +696,75 @@ class CutScreen(Screen):
             self.end_slider.value = sec
             self._sync = False
     # Loading helpers -----------------------------------------------------
-    def show_loading(self):
+    def show_loading(self, cancellable=False):
+        """Open the busy popup; ``cancellable`` adds a button that cancels
+        ``self._job`` (or sets ``self._cancel_event``) so ffmpeg stops."""
         if self._loading is None:
+            self._cancel_event = threading.Event()
+            self._job = None
             layout = BoxLayout(orientation="vertical", padding=10)
             layout.add_widget(Label(text="Aguarde..."))
+            self._loading_status = Label(text="")
+            layout.add_widget(self._loading_status)
+            if cancellable:
+                btn = Button(text="Cancelar", size_hint_y=None, height=40)
+                btn.bind(on_press=self._cancel_job)
+                layout.add_widget(btn)
             self._loading = ModalView(size_hint=(0.5, 0.3), auto_dismiss=False)
             self._loading.add_widget(layout)
         self._loading.open()
+
     def hide_loading(self, *_):
         if self._loading is not None:
             self._loading.dismiss()
             self._loading = None
+            self._loading_status = None
+
+    def _submit(self, fn, *args, name, priority=0, pool="encode"):
+        """Queue ``fn`` in ``pool`` tied to the loading popup."""
+        self._job = get_scheduler().submit(
+            pool,
+            fn,
+            *args,
+            name=name,
+            priority=priority,
+            cancel_event=self._cancel_event,
+            on_cancelled=self._job_cancelled,
+        )
+        if self._loading_status is not None:
+            self._loading_status.text = self._job.status
+
+    def _cancel_job(self, *_):
+        if self._job is not None:
+            self._job.cancel()
+        else:
+            self._cancel_event.set()
+
+    @mainthread
+    def _job_cancelled(self, job):
+        self.hide_loading()
+        self.show_popup("Aviso", "Operação cancelada")
 
-    def _cut_video(self, path, start, end):
+    def _on_ffmpeg_progress(self, info):
+        report_progress(info["percent"], format_progress(info))
+        self._show_ffmpeg_progress(info)
+
+    @mainthread
+    def _show_ffmpeg_progress(self, info):
+        if info["percent"] is not None:
+            self.progress.value = info["percent"]
+        if self._loading_status is not None:
+            self._loading_status.text = format_progress(info)
+
+    def _cut_video(self, path, start, end, precise=False, cancel_event=None):
         try:
-            clip = VideoFileClip(path)
+            duration = probe(path).duration
         except Exception as exc:
             Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
             Clock.schedule_once(self.hide_loading)
             return
 
-        duration = clip.duration
         if start >= end or start < 0 or end > duration:
-            clip.close()
             Clock.schedule_once(
                 lambda *_: self.show_popup(
                     "Erro", "Tempos fora da duração do vídeo"
@@ -678,7 +773,6 @@ class CutScreen(Screen):
             Clock.schedule_once(self.hide_loading)
             return
 
-        clip.close()
 
         # Keep the original resolution and store the cut alongside the source
         # video. The output file name includes the selected time span and the
@@ -691,11 +785,33 @@ class CutScreen(Screen):
             os.path.join(base_dir, f"corte_{start_str}_{end_str}_{original_name}")
         )
         try:
-            cut_video(path, out_file, start, end)
+            if precise:
+                smart_cut(
+                    path,
+                    out_file,
+                    start,
+                    end,
+                    on_progress=self._on_ffmpeg_progress,
+                    cancel_event=cancel_event,
+                )
+            else:
+                cut_video(
+                    path,
+                    out_file,
+                    start,
+                    end,
+                    on_progress=self._on_ffmpeg_progress,
+                    cancel_event=cancel_event,
+                )
+        except FFmpegCancelled:
+            _remove_file(out_file)
+            Clock.schedule_once(lambda *_: self.show_popup("Aviso", "Corte cancelado"))
+            Clock.schedule_once(self.hide_loading)
+            return
         except Exception as exc:
             Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
             Clock.schedule_once(self.hide_loading)
-            return
+            raise
 
         Clock.schedule_once(lambda *_: self.update_progress(100))
         Clock.schedule_once(
@@ -712,8 +828,16 @@ class CutScreen(Screen):
             self.show_popup("Erro", "Tempos inválidos")
             return
         self.progress.value = 0
-        self.show_loading()
-        threading.Thread(target=self._cut_video, args=(path, start, end), daemon=True).start()
+        self.show_loading(cancellable=True)
+        self._submit(
+            self._cut_video,
+            path,
+            start,
+            end,
+            self.precise_check.active,
+            self._cancel_event,
+            name=f"Corte {os.path.basename(path)} {seconds_to_hms(start)}-{seconds_to_hms(end)}",
+        )
 
     def show_popup(self, title, message):
         popup_layout = BoxLayout(orientation="vertical", padding=10)
@@ -734,6 +858,17 @@ class ConfigScreen(Screen):
         self.insta_pass_input = TextInput(text=os.getenv("INSTAGRAM_PASSWORD", ""), size_hint_y=None, height=40, password=True)
         self.tiktok_user_input = TextInput(text=os.getenv("TIKTOK_USER", ""), size_hint_y=None, height=40)
         self.tiktok_pass_input = TextInput(text=os.getenv("TIKTOK_PASSWORD", ""), size_hint_y=None, height=40, password=True)
+        self.profile_input = TextInput(text=os.getenv("VIDEO_PROFILE", "social"), size_hint_y=None, height=40)
+        self.policy_input = TextInput(text=default_policy(), size_hint_y=None, height=40)
+        self.whisper_input = TextInput(text=default_model_name(), size_hint_y=None, height=40)
+        self.workers_input = TextInput(text=os.getenv("TRANSCRIBE_WORKERS", "1"), size_hint_y=None, height=40)
+        self.chunk_minutes_input = TextInput(text=os.getenv("TRANSCRIBE_CHUNK_MINUTES", "10"), size_hint_y=None, height=40)
+        dl_settings = load_settings()
+        self.fragments_input = TextInput(text=str(dl_settings["fragments"]), size_hint_y=None, height=40)
+        self.chunk_input = TextInput(text=format_size(dl_settings["chunk_size"]), size_hint_y=None, height=40)
+        self.retries_input = TextInput(text=str(dl_settings["retries"]), size_hint_y=None, height=40)
+        self.backoff_input = TextInput(text=str(dl_settings["backoff"]), size_hint_y=None, height=40)
+        self.resume_check = CheckBox(active=dl_settings["resume"], size_hint_x=None, width=40)
 
         layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
         layout.add_widget(Label(text="Chave da API ChatGPT", font_size="20sp"))
@@ -748,6 +883,28 @@ class ConfigScreen(Screen):
         layout.add_widget(self.tiktok_user_input)
         layout.add_widget(Label(text="Senha do TikTok"))
         layout.add_widget(self.tiktok_pass_input)
+        layout.add_widget(Label(text="Perfil de codificação (draft, social, archive)"))
+        layout.add_widget(self.profile_input)
+        layout.add_widget(Label(text="Formato do download (vertical-short, stories, archive)"))
+        layout.add_widget(self.policy_input)
+        layout.add_widget(Label(text="Modelo do Whisper (tiny, base, small, medium, large-v3...)"))
+        layout.add_widget(self.whisper_input)
+        layout.add_widget(Label(text="Transcrição: processos paralelos / minutos por trecho"))
+        row = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        row.add_widget(self.workers_input)
+        row.add_widget(self.chunk_minutes_input)
+        layout.add_widget(row)
+        layout.add_widget(Label(text="Download: fragmentos paralelos / tamanho do bloco HTTP"))
+        row = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        row.add_widget(self.fragments_input)
+        row.add_widget(self.chunk_input)
+        layout.add_widget(row)
+        layout.add_widget(Label(text="Download: tentativas / espera inicial (s) / continuar .part"))
+        row = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        row.add_widget(self.retries_input)
+        row.add_widget(self.backoff_input)
+        row.add_widget(self.resume_check)
+        layout.add_widget(row)
         btn_save = Button(text="Salvar", size_hint_y=None, height=40)
         btn_save.bind(on_press=self.save_key)
         layout.add_widget(btn_save)
@@ -764,7 +921,42 @@ class ConfigScreen(Screen):
             "INSTAGRAM_PASSWORD": self.insta_pass_input.text.strip(),
             "TIKTOK_USER": self.tiktok_user_input.text.strip(),
             "TIKTOK_PASSWORD": self.tiktok_pass_input.text.strip(),
+            "VIDEO_PROFILE": self.profile_input.text.strip(),
+            "DOWNLOAD_FRAGMENTS": self.fragments_input.text.strip(),
+            "DOWNLOAD_CHUNK_SIZE": self.chunk_input.text.strip(),
+            "DOWNLOAD_RETRIES": self.retries_input.text.strip(),
+            "DOWNLOAD_BACKOFF": self.backoff_input.text.strip(),
+            "DOWNLOAD_RESUME": "1" if self.resume_check.active else "0",
+            "DOWNLOAD_FORMAT_POLICY": self.policy_input.text.strip(),
+            "WHISPER_MODEL": self.whisper_input.text.strip(),
+            "TRANSCRIBE_WORKERS": self.workers_input.text.strip(),
+            "TRANSCRIBE_CHUNK_MINUTES": self.chunk_minutes_input.text.strip(),
         }
+        if data["VIDEO_PROFILE"] not in PROFILES:
+            self.show_popup("Erro", "Perfil de codificação inválido")
+            return
+        if data["DOWNLOAD_FORMAT_POLICY"] not in POLICIES:
+            self.show_popup("Erro", "Política de formato inválida")
+            return
+        if data["WHISPER_MODEL"] not in WHISPER_MODELS and not os.path.isfile(data["WHISPER_MODEL"]):
+            self.show_popup("Erro", "Modelo do Whisper inválido")
+            return
+        try:
+            if int(data["TRANSCRIBE_WORKERS"]) < 1 or float(data["TRANSCRIBE_CHUNK_MINUTES"]) <= 0:
+                raise ValueError
+        except ValueError:
+            self.show_popup("Erro", "Configuração de transcrição inválida")
+            return
+        try:
+            load_settings(
+                fragments=data["DOWNLOAD_FRAGMENTS"],
+                chunk_size=data["DOWNLOAD_CHUNK_SIZE"],
+                retries=data["DOWNLOAD_RETRIES"],
+                backoff=data["DOWNLOAD_BACKOFF"],
+            )
+        except ValueError:
+            self.show_popup("Erro", "Configuração de download inválida")
+            return
         os.environ.update(data)
         with open(".env", "w") as f:
             for k, v in data.items():
@@ -794,9 +986,19 @@ class AutoCutScreen(Screen):
         self.suggestions_box = BoxLayout(orientation="vertical", size_hint_y=None)
         self.progress = ProgressBar(max=100, size_hint_y=None, height=30)
         self._loading = None
+        self._loading_status = None
+        self._cancel_event = threading.Event()
+        self._job = None
         self.cut_counter = 1
+        self._counter_lock = threading.Lock()
         self.generated_cuts = []
         self.current_suggestions = []
+        self._clip_percent = 0.0
+        self._clip_trigger = Clock.create_trigger(self._show_clip_progress, 1 / PROGRESS_FPS)
+        self.transcript_view = TextInput(readonly=True, size_hint_y=None, height=120)
+        self._generate_job = None
+        self._new_segments = []
+        self._segment_trigger = Clock.create_trigger(self._show_segments, 1 / PROGRESS_FPS)
 
         layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
         btn_video = Button(text="Selecionar Vídeo")
@@ -808,11 +1010,18 @@ class AutoCutScreen(Screen):
         btn_analyze = Button(text="Gerar Sugestões", size_hint_y=None, height=40)
         btn_analyze.bind(on_press=self.generate)
         layout.add_widget(btn_analyze)
+        layout.add_widget(self.transcript_view)
         layout.add_widget(Label(text="Sugestões:"))
         layout.add_widget(self.suggestions_box)
+        btn_cut_all = Button(text="Cortar Todas", size_hint_y=None, height=40)
+        btn_cut_all.bind(on_press=self.cut_all)
+        layout.add_widget(btn_cut_all)
         btn_merge = Button(text="Mesclar Cortes", size_hint_y=None, height=40)
         btn_merge.bind(on_press=self.merge_cuts)
         layout.add_widget(btn_merge)
+        btn_url = Button(text="Corte por URL", size_hint_y=None, height=40)
+        btn_url.bind(on_press=self.clip_from_url)
+        layout.add_widget(btn_url)
         back = Button(text="Voltar", size_hint_y=None, height=40)
         back.bind(on_press=lambda *_: setattr(self.manager, "current", "menu"))
         layout.add_widget(back)
@@ -826,16 +1035,27 @@ class AutoCutScreen(Screen):
         root.destroy()
         if path:
             self.file_path.text = path
+            build_index_async(path)
 
     @mainthread
     def update_progress(self, value):
         self.progress.value = value
 
     # Loading helpers -----------------------------------------------------
-    def show_loading(self):
+    def show_loading(self, cancellable=False):
+        """Open the busy popup; ``cancellable`` adds a button that cancels
+        ``self._job`` (or sets ``self._cancel_event``) so ffmpeg stops."""
         if self._loading is None:
+            self._cancel_event = threading.Event()
+            self._job = None
             layout = BoxLayout(orientation="vertical", padding=10)
             layout.add_widget(Label(text="Aguarde..."))
+            self._loading_status = Label(text="")
+            layout.add_widget(self._loading_status)
+            if cancellable:
+                btn = Button(text="Cancelar", size_hint_y=None, height=40)
+                btn.bind(on_press=self._cancel_job)
+                layout.add_widget(btn)
             self._loading = ModalView(size_hint=(0.5, 0.3), auto_dismiss=False)
             self._loading.add_widget(layout)
         self._loading.open()
@@ -844,6 +1064,43 @@ class AutoCutScreen(Screen):
         if self._loading is not None:
             self._loading.dismiss()
             self._loading = None
+            self._loading_status = None
+
+    def _submit(self, fn, *args, name, priority=0, pool="encode"):
+        """Queue ``fn`` in ``pool`` tied to the loading popup."""
+        self._job = get_scheduler().submit(
+            pool,
+            fn,
+            *args,
+            name=name,
+            priority=priority,
+            cancel_event=self._cancel_event,
+            on_cancelled=self._job_cancelled,
+        )
+        if self._loading_status is not None:
+            self._loading_status.text = self._job.status
+
+    def _cancel_job(self, *_):
+        if self._job is not None:
+            self._job.cancel()
+        else:
+            self._cancel_event.set()
+
+    @mainthread
+    def _job_cancelled(self, job):
+        self.hide_loading()
+        self.show_popup("Aviso", "Operação cancelada")
+
+    def _on_ffmpeg_progress(self, info):
+        report_progress(info["percent"], format_progress(info))
+        self._show_ffmpeg_progress(info)
+
+    @mainthread
+    def _show_ffmpeg_progress(self, info):
+        if info["percent"] is not None:
+            self.progress.value = info["percent"]
+        if self._loading_status is not None:
+            self._loading_status.text = format_progress(info)
 
     def generate(self, *_):
         key = os.getenv("OPENAI_API_KEY")
@@ -854,88 +1111,71 @@ class AutoCutScreen(Screen):
         if not path:
             self.show_popup("Erro", "Selecione o vídeo")
             return
-        self.show_loading()
-        openai.api_key = key
-        threading.Thread(target=self._generate_thread, args=(path,), daemon=True).start()
+        if self._generate_job is not None and self._generate_job.active:
+            self.show_popup("Aviso", "As sugestões ainda estão sendo geradas")
+            return
+        # The transcript and the cuts appear on the screen as they arrive,
+        # so no loading popup; the job can be cancelled in "Tarefas".
+        self.show_suggestions([])
+        self.transcript_view.text = ""
+        self.progress.value = 0
+        self._generate_job = get_scheduler().submit(
+            "transcribe",
+            self._generate_thread,
+            path,
+            self.niche_input.text,
+            name=f"Sugestões {os.path.basename(path)}",
+        )
 
-    def _generate_thread(self, path: str):
-        try:
-            model = whisper.load_model("base")
-            result = model.transcribe(path, fp16=False)
-            segments = result["segments"]
-            transcript = "\n".join(
-                f"{seconds_to_hms(s['start'])}-{seconds_to_hms(s['end'])} {s['text'].strip()}"
-                for s in segments
-            )
-            Clock.schedule_once(lambda *_: self.update_progress(50))
-
-            clip = VideoFileClip(path)
-            duration_sec = clip.duration
-            duration = seconds_to_hms(duration_sec)
-            clip.close()
-
-            prompt = (
-                "Sugira cortes interessantes no formato JSON com os campos "
-                "title, description, start e end, baseados no nicho '"
-                + self.niche_input.text
-                + "'. O vídeo tem duração "
-                + duration
-                + ". Use quantos cortes forem relevantes.\n"
-                + transcript
-                + "\nReturn a JSON array of objects with `title`, `description`, `start`, `end`."
-            )
+    def _generate_thread(self, path: str, niche: str):
+        def on_status(percent, message):
+            if percent:
+                Clock.schedule_once(lambda *_: self.update_progress(percent))
+            report_progress(percent, message)
 
-            completion = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                # Allow a larger response so the JSON is not truncated
-                max_tokens=500,
-            )
-            text = completion.choices[0].message.content
-            finish_reason = completion.choices[0].finish_reason
-            usage = getattr(completion, "usage", None)
-            logging.info(
-                "Prompt:\n%s\nResponse preview:\n%s", prompt, text[:200]
-            )
-            logging.info(
-                "Prompt:\n%s\nResponse:\n%s\nUsage: %s", prompt, text, usage
-            )
-            if finish_reason and finish_reason != "stop":
-                raise RuntimeError(
-                    f"Resposta do modelo incompleta (finish_reason={finish_reason})"
-                )
-            try:
-                raw_suggestions = json.loads(text)
-            except Exception as exc:
-                logging.exception("JSON parsing failed")
-                Clock.schedule_once(lambda *_, exc=exc: self._generate_failed(exc))
-                return
+        def on_suggestions(items):
+            Clock.schedule_once(lambda *_: self.add_suggestions(items))
+
+        from transcription import default_workers
 
-            # Filter out suggestions that fall outside the clip duration
-            suggestions = []
-            for item in raw_suggestions:
-                start_raw = item.get("start")
-                end_raw = item.get("end")
-                try:
-                    start_sec = float(start_raw)
-                    end_sec = float(end_raw)
-                except (TypeError, ValueError):
-                    try:
-                        start_sec = hms_to_seconds(str(start_raw))
-                        end_sec = hms_to_seconds(str(end_raw))
-                    except Exception:
-                        continue
-                if 0 <= start_sec < end_sec <= duration_sec:
-                    suggestions.append(item)
-            date_dir = Path("videos") / datetime.now().strftime("%Y-%m-%d") / "gpt"
-            date_dir.mkdir(parents=True, exist_ok=True)
-            with open(date_dir / "suggestions.json", "w", encoding="utf-8") as f:
-                json.dump({"file": path, "suggestions": suggestions}, f, ensure_ascii=False, indent=2)
+        try:
+            if default_workers() > 1:
+                # Streaming uses the one resident model; with several
+                # workers the chunked transcription is faster, so the
+                # transcript and the cuts show up only at the end.
+                result = suggest(path, niche, on_status=on_status)
+                self._new_segments.extend(result["segments"])
+                self._segment_trigger()
+            else:
+                result = suggest_stream(
+                    path,
+                    niche,
+                    on_segment=self._on_segment,
+                    on_suggestions=on_suggestions,
+                    on_status=on_status,
+                    cancel_event=current_job().cancel_event,
+                )
         except Exception as exc:
             logging.exception("OpenAI request failed")
             Clock.schedule_once(lambda *_, exc=exc: self._generate_failed(exc))
-            return
-        Clock.schedule_once(lambda *_: self._generate_done(suggestions))
+            raise
+        Clock.schedule_once(lambda *_: self._generate_done(result["suggestions"]))
+
+    def _on_segment(self, segment):
+        self._new_segments.append(segment)
+        self._segment_trigger()
+
+    def _show_segments(self, *_):
+        count = len(self._new_segments)
+        segments = self._new_segments[:count]
+        del self._new_segments[:count]
+        if segments:
+            lines = "\n".join(f"[{seconds_to_hms(s['start'])}] {s['text']}" for s in segments)
+            text = self.transcript_view.text
+            self.transcript_view.text = f"{text}\n{lines}" if text else lines
+            self.transcript_view.cursor = self.transcript_view.get_cursor_from_index(
+                len(self.transcript_view.text)
+            )
 
     def _generate_failed(self, exc):
         self.hide_loading()
@@ -950,7 +1190,11 @@ class AutoCutScreen(Screen):
         """Display buttons for each suggestion and store their metadata."""
         self.suggestions_box.clear_widgets()
         self.current_suggestions = []
-        for idx, item in enumerate(suggestions, start=1):
+        self.add_suggestions(suggestions)
+
+    def add_suggestions(self, suggestions):
+        """Append buttons for ``suggestions`` after the ones already shown."""
+        for idx, item in enumerate(suggestions, start=len(self.current_suggestions) + 1):
             start_raw = item.get("start")
             end_raw = item.get("end")
             try:
@@ -991,14 +1235,11 @@ class AutoCutScreen(Screen):
 
     def show_preview(self, path, start, end):
         try:
-            clip = VideoFileClip(path)
+            duration = probe(path).duration
         except Exception as exc:
             self.show_popup("Erro", str(exc))
             return
 
-        duration = clip.duration
-        clip.close()
-
         if start >= end or start < 0 or end > duration:
             self.show_popup("Erro", "Tempos fora da duração do vídeo")
             return
@@ -1008,7 +1249,13 @@ class AutoCutScreen(Screen):
         self.slider_end = Slider(min=0, max=duration, value=end)
         self.slider_start.bind(value=lambda _, v: setattr(self.preview_start, 'text', seconds_to_hms(v)))
         self.slider_end.bind(value=lambda _, v: setattr(self.preview_end, 'text', seconds_to_hms(v)))
+        self.preview_keyframe = Label(text='')
+        self.preview_start.bind(text=lambda *_: self._update_preview_keyframe(path))
         # Use an absolute URI to improve cross-platform compatibility
+        # Importing the video widget selects the core video provider, which
+        # is slow; only the preview needs it.
+        from kivy.uix.videoplayer import VideoPlayer
+
         video = VideoPlayer(source=Path(path).absolute().as_uri(), state='play')
         video.position = start
         video.bind(position=lambda inst, val: self._stop_at_end(inst, val, end))
@@ -1024,6 +1271,12 @@ class AutoCutScreen(Screen):
         row2.add_widget(self.slider_end)
         layout.add_widget(row1)
         layout.add_widget(row2)
+        row3 = BoxLayout(size_hint_y=None, height=40)
+        row3.add_widget(self.preview_keyframe)
+        btn_snap = Button(text='Ajustar ao keyframe', size_hint_x=None, width=180)
+        btn_snap.bind(on_press=lambda *_: self._snap_preview_start(path))
+        row3.add_widget(btn_snap)
+        layout.add_widget(row3)
         btn_save = Button(text='Salvar corte', size_hint_y=None, height=40)
         btn_cancel = Button(text='Cancelar', size_hint_y=None, height=40)
         btn_box = BoxLayout(size_hint_y=None, height=40)
@@ -1035,8 +1288,31 @@ class AutoCutScreen(Screen):
         btn_cancel.bind(on_press=popup.dismiss)
         btn_save.bind(on_press=lambda *_: self.save_preview_cut(path))
         popup.open()
+        self._update_preview_keyframe(path)
+        if keyframe_before(path, start, build=False) is None:
+            build_index_async(
+                path,
+                lambda *_: Clock.schedule_once(lambda *_: self._update_preview_keyframe(path)),
+            )
 
+    def _preview_keyframe(self, path):
+        try:
+            start = hms_to_seconds(self.preview_start.text)
+            return keyframe_before(path, start, build=False)
+        except (OSError, ValueError):
+            return None
+
+    def _update_preview_keyframe(self, path):
+        keyframe = self._preview_keyframe(path)
+        if keyframe is None:
+            self.preview_keyframe.text = 'Lendo keyframes...'
+        else:
+            self.preview_keyframe.text = f'Corte começa em {seconds_to_hms_ms(keyframe)}'
 
+    def _snap_preview_start(self, path):
+        keyframe = self._preview_keyframe(path)
+        if keyframe is not None:
+            self.preview_start.text = seconds_to_hms_ms(keyframe)
 
     def _stop_at_end(self, player, position, end):
         if position >= end:
@@ -1050,22 +1326,28 @@ class AutoCutScreen(Screen):
             self.show_popup("Erro", "Tempos inválidos")
             return
         self.preview_popup.dismiss()
-        threading.Thread(target=self._cut_video, args=(path, start, end), daemon=True).start()
+        self.show_loading(cancellable=True)
+        self._submit(
+            self._cut_video,
+            path,
+            start,
+            end,
+            self._cancel_event,
+            name=f"Corte {os.path.basename(path)} {seconds_to_hms(start)}-{seconds_to_hms(end)}",
+        )
 
     def cut_segment(self, start, end):
         self.preview_segment(start, end)
 
-    def _cut_video(self, path, start, end):
+    def _cut_video(self, path, start, end, cancel_event=None):
         try:
-            clip = VideoFileClip(path)
+            duration = probe(path).duration
         except Exception as exc:
             Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
             Clock.schedule_once(self.hide_loading)
             return
 
-        duration = clip.duration
         if start >= end or start < 0 or end > duration:
-            clip.close()
             Clock.schedule_once(
                 lambda *_: self.show_popup(
                     "Erro", "Tempos fora da duração do vídeo"
@@ -1074,30 +1356,211 @@ class AutoCutScreen(Screen):
             Clock.schedule_once(self.hide_loading)
             return
 
-        clip.close()
-        start_str = seconds_to_hms(start)
-        end_str = seconds_to_hms(end)
-        out_dir = _get_platform_dir("gpt")
+        out_file = self._output_file(path, start, end, self._next_counter())
+        try:
+            cut_video(
+                path,
+                out_file,
+                start,
+                end,
+                on_progress=self._on_ffmpeg_progress,
+                cancel_event=cancel_event,
+            )
+        except FFmpegCancelled:
+            _remove_file(out_file)
+            Clock.schedule_once(lambda *_: self.show_popup("Aviso", "Corte cancelado"))
+            Clock.schedule_once(self.hide_loading)
+            return
+        except Exception as exc:
+            Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
+            Clock.schedule_once(self.hide_loading)
+            raise
+        self.generated_cuts.append(out_file)
+        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", "Corte gerado"))
+        Clock.schedule_once(self.hide_loading)
+        Clock.schedule_once(lambda *_: open_post_screen(out_file))
+
+    def _next_counter(self) -> int:
+        """Reserve the number of the next GPT cut; safe from worker threads."""
+        with self._counter_lock:
+            counter = self.cut_counter
+            self.cut_counter += 1
+        return counter
+
+    def _output_file(self, path, start, end, counter):
+        """Return the output path used for the ``counter``-th GPT cut."""
+        start_str = seconds_to_hms(start).replace(":", "-")
+        end_str = seconds_to_hms(end).replace(":", "-")
         original_name = os.path.basename(path)
-        out_file = os.path.abspath(
+        return os.path.abspath(
             os.path.join(
-                out_dir,
-                f"corte_{self.cut_counter}_gpt_{start_str.replace(':', '-')}_{end_str.replace(':', '-')}_{original_name}",
+                _get_platform_dir("gpt"),
+                f"corte_{counter}_gpt_{start_str}_{end_str}_{original_name}",
             )
         )
+
+    def cut_all(self, *_):
+        """Cut every current suggestion with a single ffmpeg run."""
+        path = self.file_path.text
+        if not path:
+            self.show_popup("Erro", "Selecione o vídeo")
+            return
+        if not self.current_suggestions:
+            self.show_popup("Aviso", "Nenhuma sugestão para cortar")
+            return
+        self.show_loading(cancellable=True)
+        segments = [(s["start"], s["end"]) for s in self.current_suggestions]
+        self._submit(
+            self._cut_all,
+            path,
+            segments,
+            self._cancel_event,
+            name=f"Cortar todas ({len(segments)}) {os.path.basename(path)}",
+            priority=PRIORITY_LOW,
+        )
+
+    def _cut_all(self, path, segments, cancel_event=None):
         try:
-            cut_video(path, out_file, start, end)
+            duration = probe(path).duration
         except Exception as exc:
             Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
             Clock.schedule_once(self.hide_loading)
             return
-        self.cut_counter += 1
-        self.generated_cuts.append(out_file)
-        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", "Corte gerado"))
+
+        jobs = []
+        for start, end in segments:
+            jobs.append(
+                {
+                    "start": start,
+                    "end": min(end, duration),
+                    "output": self._output_file(path, start, end, self._next_counter()),
+                }
+            )
+        try:
+            results = cut_many(
+                path,
+                jobs,
+                _get_platform_dir("gpt"),
+                on_progress=self._on_ffmpeg_progress,
+                cancel_event=cancel_event,
+            )
+        except FFmpegCancelled:
+            for job in jobs:
+                _remove_file(job["output"])
+            Clock.schedule_once(lambda *_: self.show_popup("Aviso", "Cortes cancelados"))
+            Clock.schedule_once(self.hide_loading)
+            return
+        except Exception as exc:
+            Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
+            Clock.schedule_once(self.hide_loading)
+            raise
+
+        done = [r["output"] for r in results if r["ok"]]
+        failed = [r for r in results if not r["ok"]]
+        self.generated_cuts.extend(done)
+        message = f"{len(done)} corte(s) gerados"
+        if failed:
+            message += "\n" + "\n".join(
+                f"{seconds_to_hms(r['start'])}-{seconds_to_hms(r['end'])}: {r['error']}"
+                for r in failed
+            )
+        Clock.schedule_once(lambda *_: self.show_popup("Aviso" if failed else "Sucesso", message))
         Clock.schedule_once(self.hide_loading)
-        Clock.schedule_once(lambda *_: open_post_screen(out_file))
 
 
+    def clip_from_url(self, *_):
+        """Ask for a URL and time ranges and download only those ranges."""
+        url_input = TextInput(hint_text="URL do vídeo", size_hint_y=None, height=40)
+        ranges_input = TextInput(hint_text="HH:MM:SS-HH:MM:SS (um por linha)")
+        precise = CheckBox(active=False, size_hint_x=None, width=40)
+        layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
+        layout.add_widget(url_input)
+        layout.add_widget(ranges_input)
+        row = BoxLayout(size_hint_y=None, height=40)
+        row.add_widget(precise)
+        row.add_widget(Label(text="Corte preciso (reencoda as bordas)"))
+        layout.add_widget(row)
+        btn_ok = Button(text="Baixar trechos", size_hint_y=None, height=40)
+        btn_cancel = Button(text="Cancelar", size_hint_y=None, height=40)
+        row_btn = BoxLayout(size_hint_y=None, height=40)
+        row_btn.add_widget(btn_ok)
+        row_btn.add_widget(btn_cancel)
+        layout.add_widget(row_btn)
+        popup = Popup(title="Corte por URL", content=layout, size_hint=(0.8, 0.7))
+
+        def start(_):
+            url = url_input.text.strip()
+            try:
+                ranges = parse_ranges(ranges_input.text)
+            except ValueError as exc:
+                self.show_popup("Erro", str(exc))
+                return
+            if detect_platform(url) not in ("youtube", "tiktok"):
+                self.show_popup("Erro", "Corte por URL disponível apenas para YouTube e TikTok")
+                return
+            if not ranges:
+                self.show_popup("Aviso", "Informe ao menos um intervalo")
+                return
+            popup.dismiss()
+            self.progress.value = 0
+            self.show_loading(cancellable=True)
+            self._submit(
+                self._clip_from_url,
+                url,
+                ranges,
+                precise.active,
+                self._cancel_event,
+                name=f"Trechos ({len(ranges)}) {url}",
+                pool="download",
+            )
+
+        btn_ok.bind(on_press=start)
+        btn_cancel.bind(on_press=popup.dismiss)
+        popup.open()
+
+    def _clip_from_url(self, url, ranges, precise=False, cancel_event=None):
+        percents = [0.0] * len(ranges)
+
+        def name_fn(source_name, start, end):
+            return self._output_file(source_name, start, end, self._next_counter())
+
+        def on_update(index, item):
+            percents[index] = item["percent"] or 0.0
+            self._clip_percent = sum(percents) / len(percents)
+            report_progress(self._clip_percent)
+            self._clip_trigger()
+
+        try:
+            results = download_clips(
+                url,
+                ranges,
+                name_fn=name_fn,
+                on_update=on_update,
+                cancel_event=cancel_event,
+                precise=precise,
+            )
+        except Exception as exc:
+            Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
+            Clock.schedule_once(self.hide_loading)
+            raise
+
+        done = [r["output"] for r in results if r["ok"]]
+        failed = [r for r in results if not r["ok"]]
+        self.generated_cuts.extend(done)
+        message = f"{len(done)} trecho(s) baixados"
+        if failed:
+            message += "\n" + "\n".join(
+                f"{seconds_to_hms(r['start'])}-{seconds_to_hms(r['end'])}: {r['error']}"
+                for r in failed
+            )
+        Clock.schedule_once(lambda *_: self.show_popup("Aviso" if failed else "Sucesso", message))
+        Clock.schedule_once(self.hide_loading)
+
+    def _show_clip_progress(self, *_):
+        self.progress.value = self._clip_percent
+        if self._loading_status is not None:
+            self._loading_status.text = format_snapshot(get_aggregator().snapshot())
+
     def merge_cuts(self, *_):
         if not self.generated_cuts:
             self.show_popup("Aviso", "Nenhum corte para mesclar")
@@ -1127,32 +1590,39 @@ class AutoCutScreen(Screen):
             popup.dismiss()
             selected = [p for c, p in checks if c.active]
             if selected:
-                threading.Thread(target=self._merge_files, args=(selected,), daemon=True).start()
+                self.show_loading(cancellable=True)
+                self._submit(
+                    self._merge_files,
+                    selected,
+                    self._cancel_event,
+                    name=f"Mesclar {len(selected)} cortes",
+                )
 
         btn_merge.bind(on_press=do_merge)
         btn_cancel.bind(on_press=popup.dismiss)
         popup.open()
 
-    def _merge_files(self, paths):
+    def _merge_files(self, paths, cancel_event=None):
+        out_dir = os.path.dirname(paths[0])
+        out_file = os.path.join(out_dir, f"merged_{datetime.now().strftime('%H-%M-%S')}.mp4")
         try:
-            clips = [VideoFileClip(p) for p in paths]
-            final = concatenate_videoclips(clips)
-            out_dir = os.path.dirname(paths[0])
-            out_file = os.path.join(out_dir, f"merged_{datetime.now().strftime('%H-%M-%S')}.mp4")
-            try:
-                final.write_videofile(out_file, codec=VIDEO_CODEC, audio_codec="aac")
-            except Exception as exc:
-                for clip in clips:
-                    clip.close()
-                final.close()
-                self.show_popup("Erro", str(exc))
-                return
-            for clip in clips:
-                clip.close()
-            final.close()
-            Clock.schedule_once(lambda *_: self.show_popup("Sucesso", f"Mesclado em {out_file}"))
+            merge_videos(
+                paths,
+                out_file,
+                on_progress=self._on_ffmpeg_progress,
+                cancel_event=cancel_event,
+            )
+        except FFmpegCancelled:
+            _remove_file(out_file)
+            Clock.schedule_once(lambda *_: self.show_popup("Aviso", "Mesclagem cancelada"))
+            Clock.schedule_once(self.hide_loading)
+            return
         except Exception as exc:
             Clock.schedule_once(lambda *_, exc=exc: self.show_popup("Erro", str(exc)))
+            Clock.schedule_once(self.hide_loading)
+            raise
+        Clock.schedule_once(lambda *_: self.show_popup("Sucesso", f"Mesclado em {out_file}"))
+        Clock.schedule_once(self.hide_loading)
 
     def show_popup(self, title, message):
         popup_layout = BoxLayout(orientation="vertical", padding=10)
@@ -1198,6 +1668,12 @@ class SuggestionsScreen(Screen):
                 print("Erro ao ler", sug_file, exc)
                 continue
             video_path = data.get("file", "")
+            header = BoxLayout(size_hint_y=None, height=40)
+            header.add_widget(Label(text=os.path.basename(video_path)))
+            btn_again = Button(text="Novas Sugestões", size_hint_x=None, width=160)
+            btn_again.bind(on_press=lambda _, p=video_path: self.ask_niche(p))
+            header.add_widget(btn_again)
+            self.suggestions_box.add_widget(header)
             for item in data.get("suggestions", []):
                 title = item.get("title", f"{item['start']} - {item['end']}")
                 desc = item.get("description", "")
@@ -1214,6 +1690,52 @@ class SuggestionsScreen(Screen):
                 row.add_widget(btn_cut)
                 self.suggestions_box.add_widget(row)
 
+    def ask_niche(self, path):
+        """Ask for another niche and suggest again from the cached transcript."""
+        auto = self.manager.get_screen("auto")
+        layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
+        niche_input = TextInput(text=auto.niche_input.text, size_hint_y=None, height=40)
+        layout.add_widget(Label(text="Nicho/tema"))
+        layout.add_widget(niche_input)
+        buttons = BoxLayout(size_hint_y=None, height=40, spacing=10)
+        btn_ok = Button(text="Gerar")
+        btn_cancel = Button(text="Cancelar")
+        buttons.add_widget(btn_ok)
+        buttons.add_widget(btn_cancel)
+        layout.add_widget(buttons)
+        popup = Popup(title="Novas sugestões", content=layout, size_hint=(0.75, 0.5))
+
+        def start(_):
+            niche = niche_input.text.strip()
+            if not niche:
+                auto.show_popup("Erro", "Informe o nicho/tema")
+                return
+            popup.dismiss()
+            get_scheduler().submit(
+                "transcribe",
+                self._resuggest,
+                path,
+                niche,
+                name=f"Sugestões {os.path.basename(path)} ({niche})",
+            )
+            auto.show_popup("Info", "Sugestões adicionadas à fila")
+
+        btn_ok.bind(on_press=start)
+        btn_cancel.bind(on_press=popup.dismiss)
+        popup.open()
+
+    def _resuggest(self, path, niche):
+        # The transcript comes from transcript_cache; only ChatGPT runs again.
+        auto = self.manager.get_screen("auto")
+        try:
+            result = suggest(path, niche, on_status=report_progress)
+        except Exception as exc:
+            Clock.schedule_once(lambda *_, exc=exc: auto.show_popup("Erro", str(exc)))
+            raise
+        Clock.schedule_once(self.load_suggestions)
+        count = len(result["suggestions"])
+        Clock.schedule_once(lambda *_: auto.show_popup("Sucesso", f"{count} sugestão(ões) geradas"))
+
     def preview(self, path, start, end):
         auto = self.manager.get_screen("auto")
         auto.file_path.text = path
@@ -1226,15 +1748,96 @@ class SuggestionsScreen(Screen):
         auto.preview_segment(s, e)
 
     def cut(self, path, start, end):
+        """Queue the cut; progress and cancellation live in the jobs screen."""
         auto = self.manager.get_screen("auto")
-        auto.show_loading()
         try:
             s = float(start)
             e = float(end)
         except (TypeError, ValueError):
             s = hms_to_seconds(str(start))
             e = hms_to_seconds(str(end))
-        threading.Thread(target=auto._cut_video, args=(path, s, e), daemon=True).start()
+        cancel_event = threading.Event()
+        job = get_scheduler().submit(
+            "encode",
+            auto._cut_video,
+            path,
+            s,
+            e,
+            cancel_event,
+            name=f"Corte {os.path.basename(path)} {seconds_to_hms(s)}-{seconds_to_hms(e)}",
+            cancel_event=cancel_event,
+        )
+        auto.show_popup("Info", f"Corte adicionado à fila\n{job.status}")
+
+
+class JobsScreen(Screen):
+    """List queued, running and finished background jobs."""
+
+    STATE_LABELS = {
+        QUEUED: "Na fila",
+        RUNNING: "Executando",
+        DONE: "Concluído",
+        FAILED: "Falhou",
+        CANCELLED: "Cancelado",
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.jobs_box = GridLayout(cols=1, size_hint_y=None, spacing=5)
+        self.jobs_box.bind(minimum_height=self.jobs_box.setter("height"))
+        self.summary = Label(size_hint_y=None, height=30)
+        layout = BoxLayout(orientation="vertical", padding=10, spacing=10)
+        layout.add_widget(Label(text="Tarefas", font_size="20sp", size_hint_y=None, height=40))
+        layout.add_widget(self.summary)
+        layout.add_widget(self.jobs_box)
+        btn_clear = Button(text="Limpar concluídas", size_hint_y=None, height=40)
+        btn_clear.bind(on_press=lambda *_: get_scheduler().clear_finished())
+        layout.add_widget(btn_clear)
+        back = Button(text="Voltar", size_hint_y=None, height=40)
+        back.bind(on_press=lambda *_: setattr(self.manager, "current", "menu"))
+        layout.add_widget(back)
+        self.add_widget(layout)
+        # Job updates arrive from worker threads; the trigger coalesces them
+        # into at most one rebuild per interval on the Kivy thread.
+        self._refresh_trigger = Clock.create_trigger(self.refresh, 0.25)
+        get_scheduler().subscribe(lambda *_: self._refresh_trigger())
+
+    def on_pre_enter(self, *_):
+        self.refresh()
+
+    def refresh(self, *_):
+        if self.manager is not None and self.manager.current != self.name:
+            return
+        scheduler = get_scheduler()
+        jobs = scheduler.jobs()
+        running = {}
+        queued = {}
+        for job in jobs:
+            if job.state == RUNNING:
+                running[job.pool] = running.get(job.pool, 0) + 1
+            elif job.state == QUEUED:
+                queued[job.pool] = queued.get(job.pool, 0) + 1
+        self.summary.text = "  ".join(
+            f"{pool}: {running.get(pool, 0)}/{size} ({queued.get(pool, 0)} na fila)"
+            for pool, size in scheduler.pool_sizes().items()
+        )
+        self.jobs_box.clear_widgets()
+        for job in reversed(jobs):
+            row = BoxLayout(size_hint_y=None, height=40, spacing=5)
+            state = self.STATE_LABELS.get(job.state, job.state)
+            if job.progress is not None and job.state == RUNNING:
+                state += f" {job.progress:.0f}%"
+            text = f"{job.name} - {state}"
+            if job.status and job.state in (RUNNING, FAILED):
+                text += f" - {job.status}"
+            row.add_widget(Label(text=text))
+            if job.state not in FINISHED_STATES:
+                btn = Button(text="Cancelar", size_hint_x=None, width=100)
+                btn.bind(on_press=lambda _, j=job: j.cancel())
+                row.add_widget(btn)
+            self.jobs_box.add_widget(row)
+
+
 # App ---------------------------------------------------------------------
 
 class VideoApp(App):
@@ -1246,9 +1849,28 @@ class VideoApp(App):
         sm.add_widget(AutoCutScreen(name="auto"))
         sm.add_widget(SuggestionsScreen(name="suggestions"))
         sm.add_widget(PostScreen(name="post"))
+        sm.add_widget(JobsScreen(name="jobs"))
         sm.add_widget(ConfigScreen(name="config"))
         return sm
 
+    def on_start(self):
+        # Heavy modules are imported on first use; warm them up once the
+        # menu is on screen.
+        Clock.schedule_once(lambda *_: preload_in_background(), 1)
+        Clock.schedule_once(self.preload_whisper, 3)
+
+    def preload_whisper(self, *_):
+        # Runs in the transcribe pool, so a "Gerar Sugestões" clicked
+        # meanwhile waits for this load instead of starting a second one.
+        if os.getenv("WHISPER_PRELOAD", "1") == "0":
+            return
+        get_scheduler().submit(
+            "transcribe",
+            get_model,
+            name=f"Carregar Whisper ({default_model_name()})",
+            priority=PRIORITY_LOW,
+        )
+
 
 if __name__ == "__main__":
     VideoApp().run()
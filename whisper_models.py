@@ -0,0 +1,132 @@
+"""Resident Whisper models shared by every transcription.
+
+``whisper.load_model`` reads the weights from disk and builds the torch
+model, which takes seconds for ``base`` and much longer for the larger
+models. ``ModelManager`` keeps loaded models in memory and hands the
+same instance to later transcriptions. When the models together exceed
+``WHISPER_CACHE_MB`` (default 4096) the least recently used ones are
+dropped; the model just requested is always kept.
+
+The default model comes from ``WHISPER_MODEL`` (``base`` if unset).
+``VideoApp`` loads it in the background once the menu is idle, so the
+first suggestion run does not wait for it either.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MODEL = "base"
+DEFAULT_CACHE_MB = 4096
+
+# Names accepted by ``whisper.load_model`` (a path to a checkpoint also works).
+WHISPER_MODELS = (
+    "tiny", "tiny.en", "base", "base.en", "small", "small.en", "medium", "medium.en",
+    "large-v1", "large-v2", "large-v3", "large", "large-v3-turbo", "turbo",
+)
+
+
+def default_model_name() -> str:
+    """Return the model configured in ``WHISPER_MODEL``."""
+    return os.getenv("WHISPER_MODEL") or DEFAULT_MODEL
+
+
+def cache_limit() -> int:
+    """Return the resident size limit in bytes (``WHISPER_CACHE_MB``)."""
+    try:
+        return int(float(os.getenv("WHISPER_CACHE_MB", DEFAULT_CACHE_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_CACHE_MB * 1024 * 1024
+
+
+def model_size(model) -> int:
+    """Return the bytes held by the parameters and buffers of ``model``."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class ModelManager:
+    """LRU cache of loaded Whisper models, bounded by their size."""
+
+    def __init__(self, limit: int = None):
+        self.limit = cache_limit() if limit is None else limit
+        self._models = OrderedDict()  # name -> (model, size)
+        self._lock = threading.Lock()
+        self._loading = {}  # name -> Lock held while that model loads
+
+    def get(self, name: str = None):
+        """Return model ``name`` (default model if ``None``), loading it once.
+
+        Concurrent calls for the same model wait for a single load.
+        """
+        name = name or default_model_name()
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                return self._models[name][0]
+            load_lock = self._loading.setdefault(name, threading.Lock())
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    return self._models[name][0]
+            model = self._load(name)
+            with self._lock:
+                self._models[name] = (model, model_size(model))
+                self._loading.pop(name, None)
+                self._evict(keep=name)
+        return model
+
+    def _load(self, name: str):
+        import whisper
+
+        started = time.perf_counter()
+        model = whisper.load_model(name)
+        logging.info("Whisper model %s loaded in %.1fs", name, time.perf_counter() - started)
+        return model
+
+    def _evict(self, keep: str) -> None:
+        evicted = False
+        while sum(size for _, size in self._models.values()) > self.limit:
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            del self._models[oldest]
+            logging.info("Whisper model %s evicted", oldest)
+            evicted = True
+        if evicted:
+            gc.collect()
+
+    def loaded(self) -> dict:
+        """Return ``{name: size in bytes}`` of the resident models, oldest first."""
+        with self._lock:
+            return {name: size for name, (_, size) in self._models.items()}
+
+    def unload(self, name: str = None) -> None:
+        """Drop model ``name``, or every model when ``None``."""
+        with self._lock:
+            if name is None:
+                self._models.clear()
+            else:
+                self._models.pop(name, None)
+        gc.collect()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> ModelManager:
+    """Return the process wide model manager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ModelManager()
+        return _manager
+
+
+def get_model(name: str = None):
+    """Return the resident Whisper model ``name`` (default model if ``None``)."""
+    return get_manager().get(name)